@@ -7,13 +7,20 @@ from litestar.channels.backends.memory import MemoryChannelsBackend
 from litestar.openapi import OpenAPIConfig
 from litestar.plugins import PluginProtocol
 
-from gecko.api.lifespans import SuppressHTTPXLoggingLifespan, TestLifespan
+from gecko.api.lifespans import (
+    BeaverLifespan,
+    EmeraldLifespan,
+    IndexLifespan,
+    SuppressHTTPXLoggingLifespan,
+    TestLifespan,
+)
 from gecko.api.openapi import OpenAPIConfigBuilder
 from gecko.api.plugins.pydantic import PydanticPlugin
 from gecko.api.routes.router import router
 from gecko.config.models import Config
 from gecko.services.apis.beaver.service import BeaverService
 from gecko.services.data.emerald.service import EmeraldService
+from gecko.services.data.index.service import IndexService
 from gecko.state import State
 
 
@@ -34,6 +41,9 @@ class AppBuilder:
         return [
             TestLifespan,
             SuppressHTTPXLoggingLifespan,
+            BeaverLifespan,
+            EmeraldLifespan,
+            IndexLifespan,
         ]
 
     def _build_openapi_config(self) -> OpenAPIConfig:
@@ -51,6 +61,7 @@ class AppBuilder:
                 "beaver": BeaverService(config=self._config.beaver),
                 "config": self._config,
                 "emerald": EmeraldService(config=self._config.emerald),
+                "index": IndexService(config=self._config.index),
             }
         )
 
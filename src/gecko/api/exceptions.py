@@ -17,6 +17,13 @@ class ConflictException(le.ClientException):
     detail = "Conflict"
 
 
+class RangeNotSatisfiableException(le.ClientException):
+    """Range not satisfiable."""
+
+    status_code = c.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+    detail = "Range Not Satisfiable"
+
+
 InternalServerErrorException = le.InternalServerException
 
 ServiceUnavailableException = le.ServiceUnavailableException
@@ -1,12 +1,17 @@
+import asyncio
 import logging
-from contextlib import AbstractAsyncContextManager
+from contextlib import AbstractAsyncContextManager, suppress
 from types import TracebackType
 from typing import cast, override
 
 from litestar import Litestar
 
+from gecko.services.entities.recordings import errors as re
+from gecko.services.entities.recordings.service import RecordingsService
 from gecko.state import State
 
+logger = logging.getLogger(__name__)
+
 
 class Lifespan(AbstractAsyncContextManager):
     """Base class for lifespans."""
@@ -58,3 +63,100 @@ class SuppressHTTPXLoggingLifespan(Lifespan):
         traceback: TracebackType | None,
     ) -> None:
         self.logger.disabled = self.previously_disabled
+
+
+class BeaverLifespan(Lifespan):
+    """Lifespan that manages the connections to the beaver service."""
+
+    @override
+    async def __aenter__(self) -> None:
+        await self.state.beaver.open()
+
+    @override
+    async def __aexit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.state.beaver.close()
+
+
+class EmeraldLifespan(Lifespan):
+    """Lifespan that manages the connections to the emerald database."""
+
+    @override
+    async def __aenter__(self) -> None:
+        await self.state.emerald.open()
+
+    @override
+    async def __aexit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.state.emerald.close()
+
+
+class IndexLifespan(Lifespan):
+    """Lifespan that manages the local index of recordings."""
+
+    async def _reindex(self) -> None:
+        recordings = RecordingsService(
+            config=self.state.config.recordings,
+            beaver=self.state.beaver,
+            emerald=self.state.emerald,
+            index=self.state.index,
+        )
+
+        if self.state.config.index.watch:
+            await recordings.watch(self.state.config.index.retry)
+            return
+
+        # Until the scan succeeds, listings are answered from the emerald database
+        while True:
+            try:
+                await recordings.reindex()
+            except re.ServiceError:
+                logger.warning("Failed to scan recordings for the index", exc_info=True)
+            else:
+                return
+
+            await asyncio.sleep(self.state.config.index.retry)
+
+    async def _maintain(self) -> None:
+        while True:
+            task = asyncio.create_task(self._reindex())
+
+            try:
+                # Updates of the index can fail, so it is scanned again when out of date
+                await self.state.index.invalidated()
+            finally:
+                task.cancel()
+
+                with suppress(asyncio.CancelledError):
+                    await task
+
+    @override
+    async def __aenter__(self) -> None:
+        await self.state.index.open()
+
+        self.task = (
+            asyncio.create_task(self._maintain()) if self.state.index.enabled else None
+        )
+
+    @override
+    async def __aexit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self.task is not None:
+            self.task.cancel()
+
+            with suppress(asyncio.CancelledError):
+                await self.task
+
+        await self.state.index.close()
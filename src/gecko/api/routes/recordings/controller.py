@@ -17,9 +17,17 @@ from litestar.openapi.spec import (
 )
 from litestar.params import Parameter
 from litestar.response import Response, Stream
-from litestar.status_codes import HTTP_200_OK, HTTP_204_NO_CONTENT
+from litestar.status_codes import (
+    HTTP_200_OK,
+    HTTP_204_NO_CONTENT,
+    HTTP_206_PARTIAL_CONTENT,
+)
 
-from gecko.api.exceptions import BadRequestException, NotFoundException
+from gecko.api.exceptions import (
+    BadRequestException,
+    NotFoundException,
+    RangeNotSatisfiableException,
+)
 from gecko.api.routes.recordings import errors as e
 from gecko.api.routes.recordings import models as m
 from gecko.api.routes.recordings.service import Service
@@ -67,7 +75,12 @@ class DependenciesBuilder:
 
     async def _build_service(self, state: State) -> Service:
         return Service(
-            recordings=RecordingsService(beaver=state.beaver, emerald=state.emerald)
+            recordings=RecordingsService(
+                config=state.config.recordings,
+                beaver=state.beaver,
+                emerald=state.emerald,
+                index=state.index,
+            )
         )
 
     def build(self) -> Mapping[str, Provide]:
@@ -126,6 +139,25 @@ class Controller(BaseController):
                 description="Order to apply to the results.",
             ),
         ] = None,
+        count: Annotated[
+            Jsonable[m.ListRequestCount] | None,
+            Parameter(
+                description=(
+                    "Way to count recordings that match the request: "
+                    "exact, estimated (an upper bound that is cheaper to compute) "
+                    "or none (fastest). Default is exact."
+                ),
+            ),
+        ] = None,
+        cursor: Annotated[
+            Serializable[m.ListRequestCursor] | None,
+            Parameter(
+                description=(
+                    "Cursor from the next field of a previous page to continue from. "
+                    "Overrides after, before and order."
+                ),
+            ),
+        ] = None,
     ) -> Response[Serializable[m.ListResponseResults]]:
         """List recordings."""
         request = m.ListRequest(
@@ -135,6 +167,8 @@ class Controller(BaseController):
             limit=limit.root if limit else 10,
             offset=offset.root if offset else None,
             order=order.root if order else None,
+            count=count.root if count else None,
+            cursor=cursor.root if cursor else None,
         )
 
         try:
@@ -169,9 +203,19 @@ class Controller(BaseController):
                 required=True,
                 documentation_only=True,
             ),
+            ResponseHeader(
+                name="Accept-Ranges",
+                required=True,
+                documentation_only=True,
+            ),
+            ResponseHeader(
+                name="Content-Range",
+                required=False,
+                documentation_only=True,
+            ),
         ],
         media_type="*/*",
-        raises=[BadRequestException, NotFoundException],
+        raises=[BadRequestException, NotFoundException, RangeNotSatisfiableException],
         operation_class=DownloadOperation,
     )
     async def download(
@@ -189,9 +233,28 @@ class Controller(BaseController):
                 description="Start datetime of the event instance in event timezone.",
             ),
         ],
+        byterange: Annotated[
+            Serializable[m.DownloadRequestRange] | None,
+            Parameter(
+                header="Range",
+                description="Range of bytes to download.",
+            ),
+        ] = None,
+        ifrange: Annotated[
+            Serializable[m.DownloadRequestIfRange] | None,
+            Parameter(
+                header="If-Range",
+                description="Only download the range if the recording has this ETag or modification datetime.",
+            ),
+        ] = None,
     ) -> Stream:
         """Download a recording."""
-        request = m.DownloadRequest(event=event.root, start=start.root)
+        request = m.DownloadRequest(
+            event=event.root,
+            start=start.root,
+            range=byterange.root if byterange else None,
+            ifrange=ifrange.root if ifrange else None,
+        )
 
         try:
             response = await service.download(request)
@@ -199,6 +262,11 @@ class Controller(BaseController):
             raise BadRequestException from ex
         except e.NotFoundError as ex:
             raise NotFoundException from ex
+        except e.RangeNotSatisfiableError as ex:
+            headers = (
+                {"Content-Range": f"bytes */{ex.size}"} if ex.size is not None else None
+            )
+            raise RangeNotSatisfiableException(headers=headers) from ex
 
         def dump(value: Serializable) -> str:
             return str(value.model_dump(mode="json", round_trip=True))
@@ -217,9 +285,19 @@ class Controller(BaseController):
                 "Last-Modified": dump(
                     Serializable[m.DownloadResponseModified](response.modified),
                 ),
+                "Accept-Ranges": "bytes",
             }
 
-            return Stream(response.data, headers=headers)
+            if response.range is None:
+                return Stream(response.data, headers=headers)
+
+            headers["Content-Range"] = dump(
+                Serializable[m.DownloadResponseRange](response.range),
+            )
+
+            return Stream(
+                response.data, headers=headers, status_code=HTTP_206_PARTIAL_CONTENT
+            )
         except:
             await response.data.aclose()
             raise
@@ -249,6 +327,11 @@ class Controller(BaseController):
                 required=True,
                 documentation_only=True,
             ),
+            ResponseHeader(
+                name="Accept-Ranges",
+                required=True,
+                documentation_only=True,
+            ),
         ],
         raises=[BadRequestException, NotFoundException],
     )
@@ -294,6 +377,7 @@ class Controller(BaseController):
             "Last-Modified": dump(
                 Serializable[m.HeadDownloadResponseModified](response.modified),
             ),
+            "Accept-Ranges": "bytes",
         }
 
         return cast("None", Response(None, headers=headers))
@@ -6,5 +6,17 @@ class ValidationError(ServiceError):
     """Raised when a validation error occurs."""
 
 
+class InvalidCursorError(ValidationError):
+    """Raised when a cursor can't be decoded."""
+
+
 class NotFoundError(ServiceError):
     """Raised when a recording is not found."""
+
+
+class RangeNotSatisfiableError(ServiceError):
+    """Raised when a requested range is outside of a recording."""
+
+    def __init__(self, size: int | None) -> None:
+        super().__init__()
+        self.size = size
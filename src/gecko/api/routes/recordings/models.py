@@ -5,6 +5,7 @@ from uuid import UUID
 from gecko.models.base import SerializableModel, datamodel
 from gecko.services.entities.recordings import models as rm
 from gecko.utils.mime import MimeType
+from gecko.utils.ranges import ContentRange
 from gecko.utils.time import HTTPDatetime, NaiveDatetime
 
 
@@ -26,8 +27,8 @@ class Recording(SerializableModel):
 class RecordingList(SerializableModel):
     """List of recordings."""
 
-    count: int
-    """Total number of recordings that match the request."""
+    count: int | None
+    """Total number of recordings that match the request, if counted."""
 
     limit: int | None
     """Maximum number of returned recordings."""
@@ -38,6 +39,39 @@ class RecordingList(SerializableModel):
     recordings: Sequence[Recording]
     """List of recordings."""
 
+    next: str | None
+    """Cursor to get the next page, if there may be more recordings."""
+
+
+class Cursor(SerializableModel):
+    """Contents of an opaque cursor."""
+
+    event: UUID
+    """Identifier of the listed event."""
+
+    start: NaiveDatetime
+    """Start datetime of the last listed recording (in event timezone)."""
+
+    after: NaiveDatetime | None
+    """Only list recordings after this datetime (in event timezone)."""
+
+    before: NaiveDatetime | None
+    """Only list recordings before this datetime (in event timezone)."""
+
+    order: rm.ListOrder
+    """Order of the listing."""
+
+    @classmethod
+    def map(cls, cursor: rm.ListCursor) -> Self:
+        """Map from internal representation."""
+        return cls(
+            event=cursor.event,
+            start=cursor.start,
+            after=cursor.after,
+            before=cursor.before,
+            order=cursor.order,
+        )
+
 
 type ListRequestEvent = UUID
 
@@ -51,12 +85,20 @@ type ListRequestOffset = int | None
 
 type ListRequestOrder = rm.ListOrder | None
 
+type ListRequestCount = rm.ListCount | None
+
+type ListRequestCursor = str | None
+
 type ListResponseResults = RecordingList
 
 type DownloadRequestEvent = UUID
 
 type DownloadRequestStart = NaiveDatetime
 
+type DownloadRequestRange = str | None
+
+type DownloadRequestIfRange = str | None
+
 type DownloadResponseType = MimeType
 
 type DownloadResponseSize = int
@@ -65,6 +107,8 @@ type DownloadResponseTag = str
 
 type DownloadResponseModified = HTTPDatetime
 
+type DownloadResponseRange = ContentRange | None
+
 type DownloadResponseData = AsyncGenerator[bytes]
 
 type HeadDownloadRequestEvent = UUID
@@ -114,6 +158,12 @@ class ListRequest:
     order: ListRequestOrder
     """Order to apply to the results."""
 
+    count: ListRequestCount
+    """Way to count recordings that match the request."""
+
+    cursor: ListRequestCursor
+    """Cursor from a previous page to continue from."""
+
 
 @datamodel
 class ListResponse:
@@ -133,6 +183,12 @@ class DownloadRequest:
     start: DownloadRequestStart
     """Start datetime of the event instance in event timezone."""
 
+    range: DownloadRequestRange
+    """Value of the Range header."""
+
+    ifrange: DownloadRequestIfRange
+    """Value of the If-Range header."""
+
 
 @datamodel
 class DownloadResponse:
@@ -142,7 +198,7 @@ class DownloadResponse:
     """Type of the recording data."""
 
     size: DownloadResponseSize
-    """Size of the recording in bytes."""
+    """Size of the returned recording data in bytes."""
 
     tag: DownloadResponseTag
     """ETag of the recording data."""
@@ -150,6 +206,9 @@ class DownloadResponse:
     modified: DownloadResponseModified
     """Datetime when the recording was last modified."""
 
+    range: DownloadResponseRange
+    """Range of the returned data within the recording, if only a part is returned."""
+
     data: DownloadResponseData
     """Data of the recording."""
 
@@ -1,11 +1,16 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from collections.abc import Generator
 from contextlib import contextmanager
+from datetime import datetime
+from uuid import UUID
 
 from gecko.api.routes.recordings import errors as e
 from gecko.api.routes.recordings import models as m
 from gecko.services.entities.recordings import errors as re
 from gecko.services.entities.recordings import models as rm
 from gecko.services.entities.recordings.service import RecordingsService
+from gecko.utils.ranges import ByteRange, ByteRangeValidationError
+from gecko.utils.time import httpparse
 
 
 class Service:
@@ -22,9 +27,35 @@ class Service:
             raise e.ValidationError from ex
         except re.NotFoundError as ex:
             raise e.NotFoundError from ex
+        except re.RangeNotSatisfiableError as ex:
+            raise e.RangeNotSatisfiableError(ex.size) from ex
         except re.ServiceError as ex:
             raise e.ServiceError from ex
 
+    def _encode_cursor(self, cursor: rm.ListCursor) -> str:
+        data = m.Cursor.map(cursor).model_dump_json()
+        return urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+    def _decode_cursor(self, value: str, event: UUID) -> rm.ListCursor:
+        try:
+            # Padding is stripped when encoding to keep cursors URL-friendly
+            data = urlsafe_b64decode(value + "=" * (-len(value) % 4))
+            cursor = m.Cursor.model_validate_json(data)
+        except ValueError as ex:
+            raise e.InvalidCursorError from ex
+
+        # A cursor only makes sense for the listing of the event it came from
+        if cursor.event != event:
+            raise e.InvalidCursorError
+
+        return rm.ListCursor(
+            event=cursor.event,
+            start=cursor.start,
+            after=cursor.after,
+            before=cursor.before,
+            order=cursor.order,
+        )
+
     async def list(self, request: m.ListRequest) -> m.ListResponse:
         """List recordings."""
         list_request = rm.ListRequest(
@@ -34,6 +65,10 @@ class Service:
             limit=request.limit,
             offset=request.offset,
             order=request.order,
+            count=request.count or rm.ListCount.EXACT,
+            cursor=self._decode_cursor(request.cursor, request.event)
+            if request.cursor is not None
+            else None,
         )
 
         with self._handle_errors():
@@ -47,12 +82,47 @@ class Service:
                 recordings=[
                     m.Recording.map(recording) for recording in list_response.recordings
                 ],
+                next=self._encode_cursor(list_response.next)
+                if list_response.next is not None
+                else None,
             )
         )
 
+    def _parse_range(self, value: str | None) -> ByteRange | None:
+        if value is None:
+            return None
+
+        # Ranges that can't be parsed are ignored and the whole recording is sent
+        try:
+            return ByteRange.parse(value)
+        except ByteRangeValidationError:
+            return None
+
+    def _parse_ifrange(self, value: str | None) -> str | datetime | None:
+        if value is None:
+            return None
+
+        value = value.strip()
+
+        # Weak tags are kept, so they never match as If-Range needs strong ones
+        if value.startswith(('"', "W/")):
+            return value
+
+        return httpparse(value)
+
     async def download(self, request: m.DownloadRequest) -> m.DownloadResponse:
         """Download a recording."""
-        download_request = rm.DownloadRequest(event=request.event, start=request.start)
+        byterange = self._parse_range(request.range)
+
+        try:
+            ifrange = self._parse_ifrange(request.ifrange)
+        except ValueError:
+            # Validators that can't be parsed never match, so the whole recording is sent
+            byterange, ifrange = None, None
+
+        download_request = rm.DownloadRequest(
+            event=request.event, start=request.start, range=byterange, ifrange=ifrange
+        )
 
         with self._handle_errors():
             download_response = await self._recordings.download(download_request)
@@ -63,6 +133,7 @@ class Service:
                 size=download_response.content.size,
                 tag=download_response.content.tag,
                 modified=download_response.content.modified,
+                range=download_response.content.range,
                 data=download_response.content.data,
             )
         except:
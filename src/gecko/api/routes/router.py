@@ -3,6 +3,7 @@ from litestar import Router
 from gecko.api.routes.ping.router import router as ping
 from gecko.api.routes.recordings.router import router as recordings
 from gecko.api.routes.sse.router import router as sse
+from gecko.api.routes.stats.router import router as stats
 from gecko.api.routes.test.router import router as test
 
 router = Router(
@@ -11,6 +12,7 @@ router = Router(
         ping,
         recordings,
         sse,
+        stats,
         test,
     ],
 )
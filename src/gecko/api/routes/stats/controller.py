@@ -0,0 +1,50 @@
+from collections.abc import Mapping
+
+from litestar import Controller as BaseController
+from litestar import handlers
+from litestar.datastructures import ResponseHeader
+from litestar.di import Provide
+from litestar.response import Response
+
+from gecko.api.routes.stats import models as m
+from gecko.api.routes.stats.service import Service
+from gecko.models.base import Serializable
+from gecko.services.stats.service import StatsService
+from gecko.state import State
+
+
+class DependenciesBuilder:
+    """Builder for the dependencies of the controller."""
+
+    async def _build_service(self, state: State) -> Service:
+        return Service(stats=StatsService(beaver=state.beaver, emerald=state.emerald))
+
+    def build(self) -> Mapping[str, Provide]:
+        """Build the dependencies."""
+        return {
+            "service": Provide(self._build_service),
+        }
+
+
+class Controller(BaseController):
+    """Controller for the stats endpoint."""
+
+    dependencies = DependenciesBuilder().build()
+
+    @handlers.get(
+        summary="Get statistics",
+        response_headers=[
+            ResponseHeader(
+                name="Cache-Control",
+                value="no-store",
+                required=True,
+            ),
+        ],
+    )
+    async def get(self, service: Service) -> Response[Serializable[m.GetResponseStats]]:
+        """Get statistics."""
+        request = m.GetRequest()
+
+        response = await service.get(request)
+
+        return Response(Serializable(response.stats))
@@ -0,0 +1,228 @@
+from typing import Self
+
+from gecko.models.base import SerializableModel, datamodel
+from gecko.services.stats import models as sm
+
+
+class PoolStats(SerializableModel):
+    """Connection pool statistics."""
+
+    size: int
+    """Maximum number of connections."""
+
+    inuse: int
+    """Number of connections in use."""
+
+    idle: int
+    """Number of idle connections kept open."""
+
+    waited: int
+    """Number of requests that had to wait for a free connection."""
+
+    @classmethod
+    def map(cls, stats: sm.PoolStats) -> Self:
+        """Map from internal representation."""
+        return cls(
+            size=stats.size, inuse=stats.inuse, idle=stats.idle, waited=stats.waited
+        )
+
+
+class ExecutorStats(SerializableModel):
+    """Worker threads statistics."""
+
+    size: int
+    """Maximum number of threads."""
+
+    active: int
+    """Number of threads running a task."""
+
+    queued: int
+    """Number of tasks waiting for a free thread."""
+
+    tasks: int
+    """Number of tasks started so far."""
+
+    wait: float
+    """Total time in seconds that started tasks spent waiting for a free thread."""
+
+    @classmethod
+    def map(cls, stats: sm.ExecutorStats) -> Self:
+        """Map from internal representation."""
+        return cls(
+            size=stats.size,
+            active=stats.active,
+            queued=stats.queued,
+            tasks=stats.tasks,
+            wait=stats.wait,
+        )
+
+
+class LimiterStats(SerializableModel):
+    """Adaptive concurrency limiter statistics."""
+
+    limit: float
+    """Current limit of concurrent requests."""
+
+    active: int
+    """Number of requests running."""
+
+    queued: int
+    """Number of requests waiting for a free slot."""
+
+    tasks: int
+    """Number of requests started so far."""
+
+    wait: float
+    """Total time in seconds that requests spent waiting for a free slot."""
+
+    decreases: int
+    """Number of times the limit was decreased after slow or failed requests."""
+
+    @classmethod
+    def map(cls, stats: sm.LimiterStats) -> Self:
+        """Map from internal representation."""
+        return cls(
+            limit=stats.limit,
+            active=stats.active,
+            queued=stats.queued,
+            tasks=stats.tasks,
+            wait=stats.wait,
+            decreases=stats.decreases,
+        )
+
+
+class EmeraldStats(SerializableModel):
+    """Statistics of the emerald database."""
+
+    pool: PoolStats
+    """Statistics of the connection pool."""
+
+    executors: dict[str, ExecutorStats]
+    """Statistics of the worker threads by purpose."""
+
+    limiter: LimiterStats | None
+    """Statistics of the metadata requests limiter, if there is one."""
+
+    @classmethod
+    def map(cls, stats: sm.EmeraldStats) -> Self:
+        """Map from internal representation."""
+        return cls(
+            pool=PoolStats.map(stats.pool),
+            executors={
+                name: ExecutorStats.map(executor)
+                for name, executor in stats.executors.items()
+            },
+            limiter=LimiterStats.map(stats.limiter) if stats.limiter else None,
+        )
+
+
+class CacheStats(SerializableModel):
+    """Cache of responses statistics."""
+
+    entries: int
+    """Number of cached responses."""
+
+    size: int
+    """Total size of cached responses in bytes."""
+
+    hits: int
+    """Number of requests answered from the cache."""
+
+    misses: int
+    """Number of requests not answered from the cache."""
+
+    evictions: int
+    """Number of responses evicted to make room for others."""
+
+    revalidations: int
+    """Number of expired responses confirmed as unchanged."""
+
+    @classmethod
+    def map(cls, stats: sm.CacheStats) -> Self:
+        """Map from internal representation."""
+        return cls(
+            entries=stats.entries,
+            size=stats.size,
+            hits=stats.hits,
+            misses=stats.misses,
+            evictions=stats.evictions,
+            revalidations=stats.revalidations,
+        )
+
+
+class ResilienceStats(SerializableModel):
+    """Resilience of requests statistics."""
+
+    breaker: str
+    """State of the circuit breaker."""
+
+    rejected: int
+    """Number of requests rejected while the circuit was open."""
+
+    retries: int
+    """Number of retried requests."""
+
+    hedges: int
+    """Number of hedged requests sent after a slow response."""
+
+    budget: float
+    """Number of retries and hedges currently allowed by the budget."""
+
+    @classmethod
+    def map(cls, stats: sm.ResilienceStats) -> Self:
+        """Map from internal representation."""
+        return cls(
+            breaker=stats.breaker,
+            rejected=stats.rejected,
+            retries=stats.retries,
+            hedges=stats.hedges,
+            budget=stats.budget,
+        )
+
+
+class BeaverStats(SerializableModel):
+    """Statistics of the beaver service."""
+
+    coalesced: int
+    """Number of requests that joined an identical request in flight."""
+
+    cache: CacheStats
+    """Statistics of the cache of responses."""
+
+    resilience: ResilienceStats
+    """Statistics of the resilience of requests."""
+
+    @classmethod
+    def map(cls, stats: sm.BeaverStats) -> Self:
+        """Map from internal representation."""
+        return cls(
+            coalesced=stats.coalesced,
+            cache=CacheStats.map(stats.cache),
+            resilience=ResilienceStats.map(stats.resilience),
+        )
+
+
+class Stats(SerializableModel):
+    """Runtime statistics of the service."""
+
+    beaver: BeaverStats
+    """Statistics of the beaver service."""
+
+    emerald: EmeraldStats
+    """Statistics of the emerald database."""
+
+
+type GetResponseStats = Stats
+
+
+@datamodel
+class GetRequest:
+    """Request to get statistics."""
+
+
+@datamodel
+class GetResponse:
+    """Response for getting statistics."""
+
+    stats: GetResponseStats
+    """Runtime statistics of the service."""
@@ -0,0 +1,36 @@
+from collections.abc import Generator
+from contextlib import contextmanager
+
+from gecko.api.routes.stats import errors as e
+from gecko.api.routes.stats import models as m
+from gecko.services.stats import errors as se
+from gecko.services.stats import models as sm
+from gecko.services.stats.service import StatsService
+
+
+class Service:
+    """Service for the stats endpoint."""
+
+    def __init__(self, stats: StatsService) -> None:
+        self._stats = stats
+
+    @contextmanager
+    def _handle_errors(self) -> Generator[None]:
+        try:
+            yield
+        except se.ServiceError as ex:
+            raise e.ServiceError from ex
+
+    async def get(self, request: m.GetRequest) -> m.GetResponse:
+        """Get statistics."""
+        get_request = sm.GetRequest()
+
+        with self._handle_errors():
+            get_response = await self._stats.get(get_request)
+
+        return m.GetResponse(
+            stats=m.Stats(
+                beaver=m.BeaverStats.map(get_response.beaver),
+                emerald=m.EmeraldStats.map(get_response.emerald),
+            )
+        )
@@ -1,13 +1,89 @@
 from collections.abc import Sequence
+from enum import StrEnum
+from typing import Self
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from gecko.config.base import BaseConfig
 
 
+class BeaverHTTPLimitsConfig(BaseModel):
+    """Configuration for the connection pool limits of the HTTP API of the beaver service."""
+
+    connections: int | None = Field(default=100, ge=1)
+    """Maximum number of concurrent connections."""
+
+    keepalive: int | None = Field(default=20, ge=0)
+    """Maximum number of idle connections kept alive."""
+
+    expiry: float | None = Field(default=5.0, ge=0)
+    """Time in seconds after which idle connections are closed."""
+
+
+class BeaverHTTPTimeoutsConfig(BaseModel):
+    """Configuration for the timeouts of the HTTP API of the beaver service."""
+
+    connect: float | None = Field(default=5.0, ge=0)
+    """Timeout in seconds for establishing a connection."""
+
+    read: float | None = Field(default=5.0, ge=0)
+    """Timeout in seconds for receiving a chunk of data."""
+
+    write: float | None = Field(default=5.0, ge=0)
+    """Timeout in seconds for sending a chunk of data."""
+
+    pool: float | None = Field(default=5.0, ge=0)
+    """Timeout in seconds for acquiring a connection from the pool."""
+
+
+class BeaverHTTPRetriesConfig(BaseModel):
+    """Configuration for the retries of requests to the HTTP API of the beaver service."""
+
+    attempts: int = Field(default=2, ge=0)
+    """Maximum number of retries of a request."""
+
+    backoff: float = Field(default=0.1, ge=0)
+    """Base time in seconds to wait before retrying, doubled and jittered each time."""
+
+    budget: float = Field(default=0.1, ge=0)
+    """Number of retries allowed per request, averaged over all requests."""
+
+    reserve: int = Field(default=10, ge=0)
+    """Number of retries that can be saved up for a burst of failures."""
+
+
+class BeaverHTTPBreakerConfig(BaseModel):
+    """Configuration for the circuit breaker of the HTTP API of the beaver service."""
+
+    threshold: int | None = Field(default=5, ge=1)
+    """Number of consecutive failures after which requests fail fast."""
+
+    cooldown: float = Field(default=10.0, ge=0)
+    """Time in seconds between probes while requests fail fast."""
+
+
+class BeaverHTTPHedgingConfig(BaseModel):
+    """Configuration for the hedging of requests to the HTTP API of the beaver service."""
+
+    enabled: bool = False
+    """Whether to send a second request when the first one is slow."""
+
+    percentile: float = Field(default=95.0, gt=0, le=100)
+    """Percentile of recent latencies after which a second request is sent."""
+
+    window: int = Field(default=1000, ge=1)
+    """Number of recent requests to compute the latency percentile from."""
+
+    minimum: int = Field(default=100, ge=1)
+    """Number of requests to observe before any second request is sent."""
+
+
 class BeaverHTTPConfig(BaseModel):
     """Configuration for the HTTP API of the beaver service."""
 
+    http2: bool = False
+    """Whether to use HTTP/2."""
+
     host: str = "localhost"
     """Host of the HTTP API."""
 
@@ -20,6 +96,24 @@ class BeaverHTTPConfig(BaseModel):
     scheme: str = "http"
     """Scheme of the HTTP API."""
 
+    limits: BeaverHTTPLimitsConfig = BeaverHTTPLimitsConfig()
+    """Configuration for the connection pool limits."""
+
+    timeouts: BeaverHTTPTimeoutsConfig = BeaverHTTPTimeoutsConfig()
+    """Configuration for the timeouts."""
+
+    deadline: float | None = Field(default=15.0, ge=0)
+    """Time limit in seconds for a request, including all retries."""
+
+    retries: BeaverHTTPRetriesConfig = BeaverHTTPRetriesConfig()
+    """Configuration for the retries."""
+
+    breaker: BeaverHTTPBreakerConfig = BeaverHTTPBreakerConfig()
+    """Configuration for the circuit breaker."""
+
+    hedging: BeaverHTTPHedgingConfig = BeaverHTTPHedgingConfig()
+    """Configuration for the hedging."""
+
     @property
     def url(self) -> str:
         """URL of the HTTP API."""
@@ -33,16 +127,136 @@ class BeaverHTTPConfig(BaseModel):
         return url
 
 
+class BeaverCacheTTLConfig(BaseModel):
+    """Configuration for the times to live of cached responses."""
+
+    events: float = Field(default=60.0, ge=0)
+    """Time in seconds to cache events for."""
+
+    instances: float = Field(default=30.0, ge=0)
+    """Time in seconds to cache instances that might still change for."""
+
+    finished: float = Field(default=600.0, ge=0)
+    """Time in seconds to cache instances that are over or listed for a finished period for."""
+
+    missing: float = Field(default=5.0, ge=0)
+    """Time in seconds to cache responses for resources that were not found for."""
+
+
+class BeaverCacheConfig(BaseModel):
+    """Configuration for the cache of responses."""
+
+    entries: int = Field(default=10000, ge=0)
+    """Maximum number of cached responses."""
+
+    size: int = Field(default=16777216, ge=0)
+    """Maximum total size of cached responses in bytes."""
+
+    ttl: BeaverCacheTTLConfig = BeaverCacheTTLConfig()
+    """Configuration for the times to live."""
+
+    revalidate: bool = False
+    """Whether to revalidate expired responses with their ETags."""
+
+
 class BeaverConfig(BaseModel):
     """Configuration for the beaver service."""
 
     http: BeaverHTTPConfig = BeaverHTTPConfig()
     """Configuration for the HTTP API of the beaver service."""
 
+    cache: BeaverCacheConfig = BeaverCacheConfig()
+    """Configuration for the cache of responses."""
+
+
+class EmeraldS3Engine(StrEnum):
+    """Engines for communicating with the S3 API of the emerald database."""
+
+    MINIO = "minio"
+    """Blocking MinIO client running in worker threads."""
+
+    NATIVE = "native"
+    """Asynchronous client running on the event loop."""
+
+
+class EmeraldS3PoolConfig(BaseModel):
+    """Configuration for the connection pool of the S3 API of the emerald database."""
+
+    connections: int = Field(default=10, ge=1)
+    """Maximum number of concurrent connections."""
+
+    prewarm: int = Field(default=0, ge=0)
+    """Number of connections to open at startup, at most the maximum number of them."""
+
+    timeout: float | None = Field(default=30.0, ge=0)
+    """Timeout in seconds for acquiring a connection."""
+
+
+class EmeraldS3RetriesConfig(BaseModel):
+    """Configuration for the retries of the S3 API of the emerald database."""
+
+    attempts: int = Field(default=5, ge=0)
+    """Maximum number of retries of a failed request."""
+
+    backoff: float = Field(default=0.2, ge=0)
+    """Backoff factor in seconds for the delay between retries."""
+
+
+class EmeraldS3TimeoutsConfig(BaseModel):
+    """Configuration for the timeouts of the S3 API of the emerald database."""
+
+    connect: float | None = Field(default=5.0, ge=0)
+    """Timeout in seconds for establishing a connection."""
+
+    read: float | None = Field(default=300.0, ge=0)
+    """Timeout in seconds for receiving a chunk of data."""
+
+
+class EmeraldS3DownloadConfig(BaseModel):
+    """Configuration for downloads from the S3 API of the emerald database."""
+
+    concurrency: int = Field(default=1, ge=1)
+    """Maximum number of parts downloaded concurrently (1 downloads over a single connection)."""
+
+    buffers: int = Field(default=8, ge=1)
+    """Maximum number of parts held in memory while waiting to be sent in order."""
+
+    readahead: int = Field(default=1, ge=1)
+    """Number of chunks read ahead of the one being sent by the minio engine."""
+
+
+class EmeraldS3UploadConfig(BaseModel):
+    """Configuration for uploads to the S3 API of the emerald database."""
+
+    concurrency: int = Field(default=4, ge=1)
+    """Maximum number of parts uploaded concurrently."""
+
+    buffers: int = Field(default=8, ge=1)
+    """Maximum number of parts held in memory while waiting for upload."""
+
+
+class EmeraldS3ExecutorsConfig(BaseModel):
+    """Configuration for the worker threads used by the minio engine."""
+
+    metadata: int = Field(default=8, ge=1)
+    """Number of threads for listing, getting, copying and deleting objects."""
+
+    download: int = Field(default=32, ge=1)
+    """Number of threads for downloads, each busy for the whole download."""
+
+    upload: int = Field(default=16, ge=1)
+    """Number of threads for uploads, each busy for the whole upload."""
+
+    listen: int = Field(default=1, ge=1)
+    """Number of threads for reading notification streams."""
+
 
 class EmeraldS3Config(BaseModel):
     """Configuration for the S3 API of the emerald database."""
 
+    engine: EmeraldS3Engine = EmeraldS3Engine.MINIO
+    """Engine to use for communicating with the S3 API."""
+
     host: str = "localhost"
     """Host of the S3 API."""
 
@@ -52,12 +266,33 @@ class EmeraldS3Config(BaseModel):
     port: int | None = Field(default=10710, ge=1, le=65535)
     """Port of the S3 API."""
 
+    region: str = "us-east-1"
+    """Region of the S3 API."""
+
     secure: bool = False
     """Whether to use a secure connection."""
 
     user: str = "readwrite"
     """Username to authenticate with the S3 API."""
 
+    pool: EmeraldS3PoolConfig = EmeraldS3PoolConfig()
+    """Configuration for the connection pool."""
+
+    retries: EmeraldS3RetriesConfig = EmeraldS3RetriesConfig()
+    """Configuration for the retries."""
+
+    timeouts: EmeraldS3TimeoutsConfig = EmeraldS3TimeoutsConfig()
+    """Configuration for the timeouts."""
+
+    download: EmeraldS3DownloadConfig = EmeraldS3DownloadConfig()
+    """Configuration for downloads."""
+
+    upload: EmeraldS3UploadConfig = EmeraldS3UploadConfig()
+    """Configuration for uploads."""
+
+    executors: EmeraldS3ExecutorsConfig = EmeraldS3ExecutorsConfig()
+    """Configuration for the worker threads."""
+
     @property
     def bucket(self) -> str:
         """Bucket to store media in."""
@@ -71,6 +306,39 @@ class EmeraldS3Config(BaseModel):
 
         return f"{self.host}:{self.port}"
 
+    @property
+    def url(self) -> str:
+        """URL of the S3 API."""
+        scheme = "https" if self.secure else "http"
+        return f"{scheme}://{self.endpoint}"
+
+
+class EmeraldLimiterConfig(BaseModel):
+    """Configuration for the adaptive limit of concurrent metadata requests made for listings."""
+
+    initial: int = Field(default=10, ge=1)
+    """Initial number of concurrent requests."""
+
+    minimum: int = Field(default=1, ge=1)
+    """Minimum number of concurrent requests."""
+
+    maximum: int = Field(default=100, ge=1)
+    """Maximum number of concurrent requests."""
+
+    latency: float = Field(default=0.25, gt=0)
+    """Time in seconds above which a request is considered slow."""
+
+    backoff: float = Field(default=0.5, gt=0, lt=1)
+    """Factor to multiply the limit by after a slow or failed request."""
+
+    @model_validator(mode="after")
+    def _check_bounds(self) -> Self:
+        if not self.minimum <= self.initial <= self.maximum:
+            message = "Limits must satisfy minimum <= initial <= maximum."
+            raise ValueError(message)
+
+        return self
+
 
 class EmeraldConfig(BaseModel):
     """Configuration for the emerald database."""
@@ -78,6 +346,45 @@ class EmeraldConfig(BaseModel):
     s3: EmeraldS3Config = EmeraldS3Config()
     """Configuration for the S3 API of the emerald database."""
 
+    limiter: EmeraldLimiterConfig = EmeraldLimiterConfig()
+    """Configuration for the adaptive limit of concurrent metadata requests made for listings."""
+
+
+class IndexConfig(BaseModel):
+    """Configuration for the local index of recordings."""
+
+    enabled: bool = False
+    """Whether to answer listings from the index, only for a single instance."""
+
+    path: str = "gecko.sqlite3"
+    """Path to the SQLite database file."""
+
+    threads: int = Field(default=4, ge=1)
+    """Number of threads running queries, each with its own connection."""
+
+    watch: bool = False
+    """Whether to follow notifications of the emerald database to stay current."""
+
+    retry: float = Field(default=5.0, ge=0)
+    """Time in seconds to wait before scanning or following notifications again after a failure."""
+
+
+class RecordingsWindowsConfig(BaseModel):
+    """Configuration for the windows of instances used to filter listed recordings."""
+
+    days: int = Field(default=28, ge=1)
+    """Size of a window of instances in days."""
+
+    concurrency: int = Field(default=4, ge=1)
+    """Maximum number of windows of instances to fetch at the same time."""
+
+
+class RecordingsConfig(BaseModel):
+    """Configuration for recordings."""
+
+    windows: RecordingsWindowsConfig = RecordingsWindowsConfig()
+    """Configuration for the windows of instances used to filter listed recordings."""
+
 
 class ServerConfig(BaseModel):
     """Configuration for the server."""
@@ -104,5 +411,11 @@ class Config(BaseConfig):
     emerald: EmeraldConfig = EmeraldConfig()
     """Configuration for the emerald database."""
 
+    index: IndexConfig = IndexConfig()
+    """Configuration for the local index of recordings."""
+
+    recordings: RecordingsConfig = RecordingsConfig()
+    """Configuration for recordings."""
+
     server: ServerConfig = ServerConfig()
     """Configuration for the server."""
@@ -4,3 +4,24 @@ class ServiceError(Exception):
 
 class NotFoundError(ServiceError):
     """Raised when a resource is not found."""
+
+
+class ClientClosedError(ServiceError):
+    """Raised when a request is made with a closed client."""
+
+    def __init__(self) -> None:
+        super().__init__("Client is closed.")
+
+
+class CircuitOpenError(ServiceError):
+    """Raised when a request is rejected because the service is unhealthy."""
+
+    def __init__(self) -> None:
+        super().__init__("Service is unhealthy, requests are failing fast.")
+
+
+class DeadlineExceededError(ServiceError):
+    """Raised when a request does not complete in time."""
+
+    def __init__(self) -> None:
+        super().__init__("Request did not complete in time.")
@@ -1,6 +1,6 @@
 from collections.abc import Sequence
 from enum import StrEnum
-from typing import TypedDict
+from typing import NotRequired, TypedDict
 from uuid import UUID
 
 from gecko.models.base import SerializableModel, datamodel
@@ -48,6 +48,40 @@ class InstanceList(SerializableModel):
     """Instances that matched the request."""
 
 
+class InstanceStart(TypedDict):
+    """Start of an instance, without the other data."""
+
+    start: NaiveDatetime
+    """Start datetime of the instance in event timezone."""
+
+
+class InstanceStartList(TypedDict):
+    """List of starts of instances."""
+
+    instances: Sequence[InstanceStart]
+    """Starts of instances that matched the request."""
+
+
+class InstanceSpanEvent(TypedDict):
+    """Timezone of the event of an instance, without the other data."""
+
+    timezone: Timezone
+    """Timezone of the event."""
+
+
+class InstanceSpan(TypedDict):
+    """Time span of an instance, without the other data."""
+
+    start: NaiveDatetime
+    """Start datetime of the instance in event timezone."""
+
+    duration: Timedelta
+    """Duration of the instance."""
+
+    event: NotRequired[InstanceSpanEvent | None]
+    """Event the instance belongs to, if included."""
+
+
 class EventWhereInput(TypedDict, total=False):
     """Event arguments for searching."""
 
@@ -79,6 +113,49 @@ class InstanceInclude(TypedDict, total=False):
     """Event relation to include."""
 
 
+@datamodel
+class CacheStats:
+    """Cache of responses statistics."""
+
+    entries: int
+    """Number of cached responses."""
+
+    size: int
+    """Total size of cached responses in bytes."""
+
+    hits: int
+    """Number of requests answered from the cache."""
+
+    misses: int
+    """Number of requests not answered from the cache."""
+
+    evictions: int
+    """Number of responses evicted to make room for others."""
+
+    revalidations: int
+    """Number of expired responses confirmed as unchanged."""
+
+
+@datamodel
+class ResilienceStats:
+    """Resilience of requests statistics."""
+
+    breaker: str
+    """State of the circuit breaker."""
+
+    rejected: int
+    """Number of requests rejected while the circuit was open."""
+
+    retries: int
+    """Number of retried requests."""
+
+    hedges: int
+    """Number of hedged requests sent after a slow response."""
+
+    budget: float
+    """Number of retries and hedges currently allowed by the budget."""
+
+
 type EventsGetRequestId = UUID
 
 type EventsGetResponseEvent = Event
@@ -93,6 +170,14 @@ type InstancesListRequestInclude = InstanceInclude | None
 
 type InstancesListResponseResults = InstanceList
 
+type InstancesStartsRequestStart = UTCDatetime
+
+type InstancesStartsRequestEnd = UTCDatetime
+
+type InstancesStartsRequestWhere = InstanceWhereInput | None
+
+type InstancesStartsResponseStarts = Sequence[NaiveDatetime]
+
 type InstancesGetRequestEventId = UUID
 
 type InstancesGetRequestStart = NaiveDatetime
@@ -101,6 +186,12 @@ type InstancesGetRequestInclude = InstanceInclude | None
 
 type InstancesGetResponseInstance = Instance
 
+type StatsResponseCoalesced = int
+
+type StatsResponseCache = CacheStats
+
+type StatsResponseResilience = ResilienceStats
+
 
 @datamodel
 class EventsGetRequest:
@@ -143,6 +234,28 @@ class InstancesListResponse:
     """List of instances."""
 
 
+@datamodel
+class InstancesStartsRequest:
+    """Request to list only the starts of instances."""
+
+    start: InstancesStartsRequestStart
+    """Start datetime in UTC to filter events instances."""
+
+    end: InstancesStartsRequestEnd
+    """End datetime in UTC to filter events instances."""
+
+    where: InstancesStartsRequestWhere
+    """Filter to apply to find events."""
+
+
+@datamodel
+class InstancesStartsResponse:
+    """Response for listing only the starts of instances."""
+
+    starts: InstancesStartsResponseStarts
+    """Start datetimes of instances in event timezone."""
+
+
 @datamodel
 class InstancesGetRequest:
     """Request to get an instance."""
@@ -163,3 +276,22 @@ class InstancesGetResponse:
 
     instance: InstancesGetResponseInstance
     """Instance that matched the request."""
+
+
+@datamodel
+class StatsRequest:
+    """Request to get statistics."""
+
+
+@datamodel
+class StatsResponse:
+    """Response for getting statistics."""
+
+    coalesced: StatsResponseCoalesced
+    """Number of requests that joined an identical request in flight."""
+
+    cache: StatsResponseCache
+    """Statistics of the cache of responses."""
+
+    resilience: StatsResponseResilience
+    """Statistics of the resilience of requests."""
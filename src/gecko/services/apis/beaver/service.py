@@ -1,20 +1,195 @@
-from collections.abc import Mapping
+import asyncio
+import random
+import time
+from collections.abc import Callable, Mapping
+from datetime import UTC, datetime, timedelta
 from http import HTTPMethod, HTTPStatus
 from typing import Any
 
-from httpx import AsyncClient, HTTPError, HTTPStatusError, Response
+from httpx import AsyncClient, HTTPError, HTTPStatusError, Limits, Response, Timeout
+from pydantic import TypeAdapter
 
-from gecko.config.models import BeaverConfig, BeaverHTTPConfig
+from gecko.config.models import BeaverCacheConfig, BeaverConfig, BeaverHTTPConfig
 from gecko.models.base import Jsonable, Serializable
 from gecko.services.apis.beaver import errors as e
 from gecko.services.apis.beaver import models as m
+from gecko.utils.caches import TTLCache
+from gecko.utils.resilience import CircuitBreaker, LatencyTracker, RetryBudget
+
+type CacheKey = tuple[str, tuple[tuple[str, str], ...]]
+
+type CacheTTL = float | Callable[[Response], float]
+
+type Parser[T] = Callable[[Response], T]
+
+type FlightKey = tuple[CacheKey, Parser[Any]]
 
 
 class BeaverClient:
     """Client for beaver API."""
 
-    def __init__(self, config: BeaverHTTPConfig) -> None:
+    # Only requests without side effects can be repeated
+    SAFE_METHODS = frozenset({HTTPMethod.GET, HTTPMethod.HEAD, HTTPMethod.OPTIONS})
+
+    RETRYABLE_STATUSES = frozenset(
+        {
+            HTTPStatus.TOO_MANY_REQUESTS,
+            HTTPStatus.BAD_GATEWAY,
+            HTTPStatus.SERVICE_UNAVAILABLE,
+            HTTPStatus.GATEWAY_TIMEOUT,
+        }
+    )
+
+    def __init__(self, config: BeaverHTTPConfig, cache: BeaverCacheConfig) -> None:
         self.config = config
+        self.cache_config = cache
+        self.cache = TTLCache[CacheKey, Response](cache.entries, cache.size)
+        self.revalidations = 0
+        self.coalesced = 0
+        self.retries = 0
+        self.hedges = 0
+        self.breaker = CircuitBreaker(config.breaker.threshold, config.breaker.cooldown)
+        self.budget = RetryBudget(config.retries.budget, config.retries.reserve)
+        self.latencies = LatencyTracker(config.hedging.window, config.hedging.minimum)
+        self._client: AsyncClient | None = None
+        self._flights: dict[FlightKey, asyncio.Task[Any]] = {}
+
+    def _build_limits(self) -> Limits:
+        return Limits(
+            max_connections=self.config.limits.connections,
+            max_keepalive_connections=self.config.limits.keepalive,
+            keepalive_expiry=self.config.limits.expiry,
+        )
+
+    def _build_timeout(self) -> Timeout:
+        return Timeout(
+            connect=self.config.timeouts.connect,
+            read=self.config.timeouts.read,
+            write=self.config.timeouts.write,
+            pool=self.config.timeouts.pool,
+        )
+
+    def _build_client(self) -> AsyncClient:
+        return AsyncClient(
+            base_url=self.config.url,
+            http2=self.config.http2,
+            limits=self._build_limits(),
+            timeout=self._build_timeout(),
+        )
+
+    async def open(self) -> None:
+        """Open the connection pool."""
+        if self._client is None:
+            self._client = self._build_client()
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    async def _send(  # noqa: PLR0913
+        self,
+        client: AsyncClient,
+        method: HTTPMethod,
+        path: str,
+        data: Any | None,
+        params: Mapping[str, str] | None,
+        headers: Mapping[str, str] | None,
+    ) -> Response:
+        started = time.monotonic()
+
+        response = await client.request(
+            method, path, json=data, params=params, headers=headers
+        )
+
+        self.latencies.add(time.monotonic() - started)
+        return response
+
+    async def _send_hedged(  # noqa: PLR0913
+        self,
+        client: AsyncClient,
+        method: HTTPMethod,
+        path: str,
+        data: Any | None,
+        params: Mapping[str, str] | None,
+        headers: Mapping[str, str] | None,
+    ) -> Response:
+        hedging = self.config.hedging
+        delay = (
+            self.latencies.percentile(hedging.percentile)
+            if hedging.enabled and method in self.SAFE_METHODS
+            else None
+        )
+
+        if delay is None:
+            return await self._send(client, method, path, data, params, headers)
+
+        pending = {
+            asyncio.create_task(self._send(client, method, path, data, params, headers))
+        }
+
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+
+            # A second request is sent only if the first one is slower than usual
+            if not done and self.budget.withdraw():
+                self.hedges += 1
+                pending.add(
+                    asyncio.create_task(
+                        self._send(client, method, path, data, params, headers)
+                    )
+                )
+
+            while True:
+                for task in done:
+                    if task.exception() is None or not pending:
+                        return task.result()
+
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            for task in pending:
+                task.cancel()
+
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _send_retried(  # noqa: PLR0913
+        self,
+        client: AsyncClient,
+        method: HTTPMethod,
+        path: str,
+        data: Any | None,
+        params: Mapping[str, str] | None,
+        headers: Mapping[str, str] | None,
+    ) -> Response:
+        attempts = self.config.retries.attempts if method in self.SAFE_METHODS else 0
+        self.budget.deposit()
+
+        for attempt in range(attempts + 1):
+            try:
+                response = await self._send_hedged(
+                    client, method, path, data, params, headers
+                )
+            except HTTPError as ex:
+                if attempt >= attempts or not self.budget.withdraw():
+                    raise e.ServiceError from ex
+            else:
+                if (
+                    response.status_code not in self.RETRYABLE_STATUSES
+                    or attempt >= attempts
+                    or not self.budget.withdraw()
+                ):
+                    return response
+
+            self.retries += 1
+
+            # Full jitter spreads retries of many callers over time
+            backoff = self.config.retries.backoff * 2**attempt
+            await asyncio.sleep(random.uniform(0, backoff))  # noqa: S311
+
+        raise e.ServiceError
 
     async def request(
         self,
@@ -26,17 +201,111 @@ class BeaverClient:
         headers: Mapping[str, str] | None = None,
     ) -> Response:
         """Make a request and return the response."""
+        if self._client is None:
+            raise e.ClientClosedError
+
+        if not self.breaker.allow():
+            raise e.CircuitOpenError
+
         try:
-            async with AsyncClient(base_url=self.config.url) as client:
-                return await client.request(
-                    method,
-                    path,
-                    json=data,
-                    params=params,
-                    headers=headers,
+            async with asyncio.timeout(self.config.deadline):
+                response = await self._send_retried(
+                    self._client, method, path, data, params, headers
                 )
-        except HTTPError as ex:
-            raise e.ServiceError from ex
+        except TimeoutError as ex:
+            self.breaker.failure()
+            raise e.DeadlineExceededError from ex
+        except e.ServiceError:
+            self.breaker.failure()
+            raise
+
+        if (
+            response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+            or response.status_code in self.RETRYABLE_STATUSES
+        ):
+            self.breaker.failure()
+        else:
+            self.breaker.success()
+
+        return response
+
+    def _cache_ttl(self, response: Response, ttl: CacheTTL) -> float:
+        # Missing resources are cached briefly, failures are not cached at all
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            return self.cache_config.ttl.missing
+
+        if not response.is_success:
+            return 0
+
+        return ttl(response) if callable(ttl) else ttl
+
+    async def _fetch[T](
+        self,
+        key: CacheKey,
+        path: str,
+        ttl: CacheTTL,
+        params: Mapping[str, str] | None,
+        parse: Parser[T],
+    ) -> T:
+        stale = self.cache.peek(key) if self.cache_config.revalidate else None
+        tag = stale.headers.get("ETag") if stale is not None else None
+        headers = {"If-None-Match": tag} if tag is not None else None
+
+        response = await self.request(
+            HTTPMethod.GET, path, params=params, headers=headers
+        )
+
+        if stale is not None and response.status_code == HTTPStatus.NOT_MODIFIED:
+            self.revalidations += 1
+            response = stale
+
+        self.cache.put(
+            key, response, self._cache_ttl(response, ttl), len(response.content)
+        )
+
+        return parse(response)
+
+    def _land(self, key: FlightKey, flight: asyncio.Task[Any]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+        # Every waiter might have gone, so the failure is marked as retrieved here
+        if not flight.cancelled():
+            flight.exception()
+
+    async def fetch[T](
+        self,
+        path: str,
+        *,
+        ttl: CacheTTL,
+        parse: Parser[T],
+        params: Mapping[str, str] | None = None,
+    ) -> T:
+        """Make a GET request and parse the response, using the cache when possible.
+
+        Identical requests made at the same time share a single call and the result
+        of parsing, so the parser should be the same function for all of them.
+        The time to live can be computed from a successful response.
+        """
+        key = (path, tuple(sorted((params or {}).items())))
+        cached = self.cache.get(key)
+
+        if cached is not None:
+            return parse(cached)
+
+        # Requests parsed differently share the cache, but not the result
+        flight_key = (key, parse)
+        flight = self._flights.get(flight_key)
+
+        if flight is None:
+            flight = asyncio.create_task(self._fetch(key, path, ttl, params, parse))
+            flight.add_done_callback(lambda flight: self._land(flight_key, flight))
+            self._flights[flight_key] = flight
+        else:
+            self.coalesced += 1
+
+        # A waiter that is cancelled leaves the call running for the others
+        return await asyncio.shield(flight)
 
 
 class BeaverEventsService:
@@ -51,11 +320,8 @@ class BeaverEventsService:
     def _dump_json(self, value: Jsonable) -> str:
         return value.model_dump_json(round_trip=True)
 
-    async def get(self, request: m.EventsGetRequest) -> m.EventsGetResponse:
-        """Get event."""
-        event_id = self._dump(Serializable[m.EventsGetRequestId](request.id))
-        response = await self.client.request(HTTPMethod.GET, f"/events/{event_id}")
-
+    @staticmethod
+    def _parse_get(response: Response) -> m.EventsGetResponse:
         try:
             response.raise_for_status()
         except HTTPStatusError as ex:
@@ -66,10 +332,27 @@ class BeaverEventsService:
         event = m.Event.model_validate_json(response.content)
         return m.EventsGetResponse(event=event)
 
+    async def get(self, request: m.EventsGetRequest) -> m.EventsGetResponse:
+        """Get event."""
+        event_id = self._dump(Serializable[m.EventsGetRequestId](request.id))
+
+        return await self.client.fetch(
+            f"/events/{event_id}",
+            ttl=self.client.cache_config.ttl.events,
+            parse=self._parse_get,
+        )
+
 
 class BeaverInstancesService:
     """Service for instances in beaver API."""
 
+    # The decoders are built once, since building them takes longer than decoding
+    STARTS = TypeAdapter(m.InstanceStartList)
+    SPAN = TypeAdapter(m.InstanceSpan)
+
+    # Largest offset of a timezone, for instances whose event is not known
+    OFFSET = timedelta(hours=14)
+
     def __init__(self, client: BeaverClient) -> None:
         self.client = client
 
@@ -79,35 +362,109 @@ class BeaverInstancesService:
     def _dump_json(self, value: Jsonable) -> str:
         return value.model_dump_json(round_trip=True)
 
-    async def list(self, request: m.InstancesListRequest) -> m.InstancesListResponse:
-        """List instances."""
-        start = self._dump_json(Jsonable[m.InstancesListRequestStart](request.start))
-        end = self._dump_json(Jsonable[m.InstancesListRequestEnd](request.end))
-        params = {"start": start, "end": end}
+    @staticmethod
+    def _check_list(response: Response) -> None:
+        try:
+            response.raise_for_status()
+        except HTTPStatusError as ex:
+            raise e.ServiceError from ex
+
+    @staticmethod
+    def _parse_list(response: Response) -> m.InstancesListResponse:
+        BeaverInstancesService._check_list(response)
+
+        results = m.InstanceList.model_validate_json(response.content)
+        return m.InstancesListResponse(results=results)
+
+    @staticmethod
+    def _parse_starts(response: Response) -> m.InstancesStartsResponse:
+        BeaverInstancesService._check_list(response)
+
+        results = BeaverInstancesService.STARTS.validate_json(response.content)
+        return m.InstancesStartsResponse(
+            starts=[instance["start"] for instance in results["instances"]]
+        )
 
-        if request.where is not None:
-            where = self._dump_json(
-                Jsonable[m.InstancesListRequestWhere](request.where)
+    async def _list[T](
+        self,
+        start: datetime,
+        end: datetime,
+        where: m.InstanceWhereInput | None,
+        include: m.InstanceInclude | None,
+        parse: Parser[T],
+    ) -> T:
+        params = {
+            "start": self._dump_json(Jsonable[m.InstancesListRequestStart](start)),
+            "end": self._dump_json(Jsonable[m.InstancesListRequestEnd](end)),
+        }
+
+        if where is not None:
+            params["where"] = self._dump_json(
+                Jsonable[m.InstancesListRequestWhere](where)
             )
-            params["where"] = where
 
-        if request.include is not None:
-            include = self._dump_json(
-                Jsonable[m.InstancesListRequestInclude](request.include)
+        if include is not None:
+            params["include"] = self._dump_json(
+                Jsonable[m.InstancesListRequestInclude](include)
             )
-            params["include"] = include
 
-        response = await self.client.request(
-            HTTPMethod.GET, "/instances", params=params
+        # Instances of a period that is over are unlikely to change
+        ttl = (
+            self.client.cache_config.ttl.finished
+            if end <= datetime.now(UTC)
+            else self.client.cache_config.ttl.instances
+        )
+
+        return await self.client.fetch(
+            "/instances", ttl=ttl, parse=parse, params=params
+        )
+
+    async def list(self, request: m.InstancesListRequest) -> m.InstancesListResponse:
+        """List instances."""
+        return await self._list(
+            request.start,
+            request.end,
+            request.where,
+            request.include,
+            self._parse_list,
+        )
+
+    async def starts(
+        self, request: m.InstancesStartsRequest
+    ) -> m.InstancesStartsResponse:
+        """List only the starts of instances, without the other data."""
+        return await self._list(
+            request.start, request.end, request.where, None, self._parse_starts
+        )
+
+    def _get_ttl(self, response: Response) -> float:
+        span = self.SPAN.validate_json(response.content)
+        end = span["start"] + span["duration"]
+        event = span.get("event")
+
+        if event is None:
+            finished = end + self.OFFSET <= datetime.now(UTC).replace(tzinfo=None)
+        else:
+            finished = end.replace(tzinfo=event["timezone"]) <= datetime.now(UTC)
+
+        # Instances that are over are unlikely to change
+        return (
+            self.client.cache_config.ttl.finished
+            if finished
+            else self.client.cache_config.ttl.instances
         )
 
+    @staticmethod
+    def _parse_get(response: Response) -> m.InstancesGetResponse:
         try:
             response.raise_for_status()
         except HTTPStatusError as ex:
+            if ex.response.status_code == HTTPStatus.NOT_FOUND:
+                raise e.NotFoundError from ex
             raise e.ServiceError from ex
 
-        results = m.InstanceList.model_validate_json(response.content)
-        return m.InstancesListResponse(results=results)
+        instance = m.Instance.model_validate_json(response.content)
+        return m.InstancesGetResponse(instance=instance)
 
     async def get(self, request: m.InstancesGetRequest) -> m.InstancesGetResponse:
         """Get instance."""
@@ -123,26 +480,27 @@ class BeaverInstancesService:
             )
             params["include"] = include
 
-        response = await self.client.request(
-            HTTPMethod.GET, f"/instances/{event_id}/{start}", params=params
+        return await self.client.fetch(
+            f"/instances/{event_id}/{start}",
+            ttl=self._get_ttl,
+            parse=self._parse_get,
+            params=params,
         )
 
-        try:
-            response.raise_for_status()
-        except HTTPStatusError as ex:
-            if ex.response.status_code == HTTPStatus.NOT_FOUND:
-                raise e.NotFoundError from ex
-            raise e.ServiceError from ex
-
-        instance = m.Instance.model_validate_json(response.content)
-        return m.InstancesGetResponse(instance=instance)
-
 
 class BeaverService:
     """Service for beaver API."""
 
     def __init__(self, config: BeaverConfig) -> None:
-        self.client = BeaverClient(config.http)
+        self.client = BeaverClient(config.http, config.cache)
+
+    async def open(self) -> None:
+        """Open the connections to beaver API."""
+        await self.client.open()
+
+    async def close(self) -> None:
+        """Close the connections to beaver API."""
+        await self.client.close()
 
     @property
     def events(self) -> BeaverEventsService:
@@ -153,3 +511,24 @@ class BeaverService:
     def instances(self) -> BeaverInstancesService:
         """Service for instances in beaver API."""
         return BeaverInstancesService(self.client)
+
+    async def stats(self, request: m.StatsRequest) -> m.StatsResponse:
+        """Get statistics."""
+        return m.StatsResponse(
+            coalesced=self.client.coalesced,
+            resilience=m.ResilienceStats(
+                breaker=self.client.breaker.state,
+                rejected=self.client.breaker.rejected,
+                retries=self.client.retries,
+                hedges=self.client.hedges,
+                budget=self.client.budget.balance,
+            ),
+            cache=m.CacheStats(
+                entries=len(self.client.cache),
+                size=self.client.cache.size,
+                hits=self.client.cache.hits,
+                misses=self.client.cache.misses,
+                evictions=self.client.cache.evictions,
+                revalidations=self.client.revalidations,
+            ),
+        )
@@ -0,0 +1,53 @@
+from abc import ABC, abstractmethod
+
+from gecko.services.data.emerald import models as m
+
+
+def normalize_tag(tag: str) -> str:
+    """Normalize an ETag to the quoted form used in HTTP headers."""
+    value = tag.strip().strip('"')
+    return f'"{value}"'
+
+
+class Engine(ABC):
+    """Base class for engines communicating with the S3 API."""
+
+    async def open(self) -> None:
+        """Open the connections to the S3 API."""
+        return
+
+    async def close(self) -> None:
+        """Close the connections to the S3 API."""
+        return
+
+    @abstractmethod
+    async def list(self, request: m.ListRequest) -> m.ListResponse:
+        """List objects."""
+
+    @abstractmethod
+    async def get(self, request: m.GetRequest) -> m.GetResponse:
+        """Get an object."""
+
+    @abstractmethod
+    async def download(self, request: m.DownloadRequest) -> m.DownloadResponse:
+        """Download an object."""
+
+    @abstractmethod
+    async def upload(self, request: m.UploadRequest) -> m.UploadResponse:
+        """Upload an object."""
+
+    @abstractmethod
+    async def copy(self, request: m.CopyRequest) -> m.CopyResponse:
+        """Copy an object."""
+
+    @abstractmethod
+    async def delete(self, request: m.DeleteRequest) -> m.DeleteResponse:
+        """Delete an object."""
+
+    @abstractmethod
+    async def listen(self, request: m.ListenRequest) -> m.ListenResponse:
+        """Listen to changes of objects."""
+
+    @abstractmethod
+    async def stats(self, request: m.StatsRequest) -> m.StatsResponse:
+        """Get statistics."""
@@ -0,0 +1,460 @@
+import asyncio
+from collections.abc import AsyncGenerator, Callable, Generator, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import AbstractContextManager, contextmanager, suppress
+from enum import StrEnum
+from functools import partial
+from queue import LifoQueue
+from typing import Any, BinaryIO, Never, cast, override
+
+from minio import Minio
+from minio.commonconfig import CopySource
+from minio.datatypes import Object
+from minio.error import MinioException, S3Error
+from urllib3 import (
+    BaseHTTPResponse,
+    HTTPConnectionPool,
+    HTTPSConnectionPool,
+    PoolManager,
+    Retry,
+    Timeout,
+)
+from urllib3.exceptions import HTTPError
+
+from gecko.config.models import EmeraldS3Config
+from gecko.services.data.emerald import errors as e
+from gecko.services.data.emerald import models as m
+from gecko.services.data.emerald.engines.base import Engine, normalize_tag
+from gecko.services.data.emerald.engines.notifications import NotificationParser
+from gecko.utils import asyncify, syncify
+from gecko.utils.executors import InstrumentedExecutor
+from gecko.utils.ranges import ContentRange
+from gecko.utils.read import ReadableIterator
+from gecko.utils.time import httpparse
+
+
+class ErrorCodes(StrEnum):
+    """Error codes."""
+
+    NOT_FOUND = "NoSuchKey"
+    INVALID_RANGE = "InvalidRange"
+
+
+class InstrumentedQueue[T](LifoQueue[T]):
+    """Queue of pooled connections that counts requests waiting for a connection."""
+
+    def __init__(self, maxsize: int = 0) -> None:
+        super().__init__(maxsize)
+        self.waited = 0
+
+    @override
+    def get(self, block: bool = True, timeout: float | None = None) -> T:
+        if block and self.empty():
+            self.waited += 1
+
+        return super().get(block, timeout)
+
+    def stats(self) -> m.PoolStats:
+        """Get statistics of the pool."""
+        free = list(self.queue)
+
+        return m.PoolStats(
+            size=self.maxsize,
+            inuse=self.maxsize - len(free),
+            idle=sum(conn is not None for conn in free),
+            waited=self.waited,
+        )
+
+
+class InstrumentedHTTPConnectionPool(HTTPConnectionPool):
+    """HTTP connection pool with an instrumented queue."""
+
+    QueueCls = InstrumentedQueue
+
+
+class InstrumentedHTTPSConnectionPool(HTTPSConnectionPool):
+    """HTTPS connection pool with an instrumented queue."""
+
+    QueueCls = InstrumentedQueue
+
+
+class InstrumentedPoolManager(PoolManager):
+    """Pool manager that creates instrumented connection pools."""
+
+    def __init__(
+        self, *args: Any, pool_timeout: float | None = None, **kwargs: Any
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.pool_timeout = pool_timeout
+        self.pool_classes_by_scheme = {
+            "http": InstrumentedHTTPConnectionPool,
+            "https": InstrumentedHTTPSConnectionPool,
+        }
+
+    @override
+    def urlopen(
+        self,
+        method: str,
+        url: str,
+        redirect: bool = True,
+        **kw: Any,
+    ) -> BaseHTTPResponse:
+        # The pool blocks when all connections are taken, so waiting has to be bounded
+        kw.setdefault("pool_timeout", self.pool_timeout)
+        return super().urlopen(method, url, redirect, **kw)
+
+
+class MinioEngine(Engine):
+    """Engine that uses the blocking MinIO client in worker threads."""
+
+    # Matches the page size of the listing, so a batch usually costs a single request
+    LIST_BATCH_SIZE = 1000
+
+    def __init__(self, config: EmeraldS3Config) -> None:
+        self._config = config
+        self._http = self._build_http(config)
+        self._client = Minio(
+            endpoint=config.endpoint,
+            access_key=config.user,
+            secret_key=config.password,
+            secure=config.secure,
+            region=config.region,
+            http_client=self._http,
+        )
+        self._bucket = config.bucket
+        self._metadata = InstrumentedExecutor(
+            config.executors.metadata, "emerald-metadata"
+        )
+        self._download = InstrumentedExecutor(
+            config.executors.download, "emerald-download"
+        )
+        self._upload = InstrumentedExecutor(config.executors.upload, "emerald-upload")
+        self._listener = InstrumentedExecutor(config.executors.listen, "emerald-listen")
+
+    def _build_http(self, config: EmeraldS3Config) -> InstrumentedPoolManager:
+        return InstrumentedPoolManager(
+            maxsize=config.pool.connections,
+            block=True,
+            pool_timeout=config.pool.timeout,
+            timeout=Timeout(connect=config.timeouts.connect, read=config.timeouts.read),
+            retries=Retry(
+                total=config.retries.attempts,
+                backoff_factor=config.retries.backoff,
+                status_forcelist=[500, 502, 503, 504],
+            ),
+            cert_reqs="CERT_NONE",
+        )
+
+    @property
+    def _queue(self) -> InstrumentedQueue:
+        return cast(
+            "InstrumentedQueue", self._http.connection_from_url(self._config.url).pool
+        )
+
+    @property
+    def _executors(self) -> dict[str, InstrumentedExecutor]:
+        return {
+            "metadata": self._metadata,
+            "download": self._download,
+            "upload": self._upload,
+            "listen": self._listener,
+        }
+
+    async def _run[T](
+        self, executor: Executor, function: Callable[..., T], /, **kwargs: Any
+    ) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, partial(function, **kwargs))
+
+    @override
+    async def open(self) -> None:
+        # Connections are opened by concurrent requests and kept alive in the pool
+        count = min(self._config.pool.prewarm, self._config.pool.connections)
+
+        if count == 0:
+            return
+
+        # Requests get their own threads, so they are not limited by other executors
+        executor = ThreadPoolExecutor(count, "emerald-prewarm")
+
+        async def ping() -> None:
+            with suppress(MinioException):
+                await self._run(
+                    executor, self._client.bucket_exists, bucket_name=self._bucket
+                )
+
+        try:
+            await asyncio.gather(*(ping() for _ in range(count)))
+        finally:
+            executor.shutdown(wait=False)
+
+    @override
+    async def close(self) -> None:
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self._http.clear()
+
+    @contextmanager
+    def _handle_errors(self) -> Generator[None]:
+        try:
+            yield
+        except (MinioException, HTTPError) as ex:
+            raise e.ServiceError from ex
+
+    @contextmanager
+    def _handle_not_found(self, name: str) -> Generator[None]:
+        try:
+            yield
+        except S3Error as ex:
+            if ex.code == ErrorCodes.NOT_FOUND:
+                raise e.NotFoundError(name) from ex
+            raise
+
+    @contextmanager
+    def _handle_invalid_range(self, name: str) -> Generator[None]:
+        try:
+            yield
+        except S3Error as ex:
+            if ex.code == ErrorCodes.INVALID_RANGE:
+                raise e.InvalidRangeError(name) from ex
+            raise
+
+    def _list_details(self, obj: Object) -> m.ObjectDetails | None:
+        # The content type is only listed by MinIO, as a part of the metadata
+        metadata = {key.lower(): value for key, value in (obj.metadata or {}).items()}
+        content_type = metadata.get("content-type")
+
+        if content_type is None or obj.size is None or obj.last_modified is None:
+            return None
+
+        return m.ObjectDetails(
+            name=str(obj.object_name),
+            type=content_type,
+            size=obj.size,
+            tag=normalize_tag(str(obj.etag)),
+            modified=obj.last_modified,
+        )
+
+    @override
+    async def list(self, request: m.ListRequest) -> m.ListResponse:
+        def iterate(objects: Iterator[Object]) -> Generator[m.ObjectListing]:
+            with self._handle_errors():
+                for obj in objects:
+                    name = str(obj.object_name)
+
+                    # Names are listed in ascending order, so no later page can match
+                    if request.stop is not None and name >= request.stop:
+                        return
+
+                    yield m.ObjectListing(
+                        name=name,
+                        details=self._list_details(obj) if request.details else None,
+                    )
+
+        with self._handle_errors():
+            objects = await self._run(
+                self._metadata,
+                self._client.list_objects,
+                bucket_name=self._bucket,
+                prefix=request.prefix,
+                recursive=request.recursive,
+                start_after=request.start_after,
+                include_user_meta=request.details,
+            )
+
+        return m.ListResponse(
+            objects=asyncify.BatchingGenerator(
+                iterate(objects), size=self.LIST_BATCH_SIZE, executor=self._metadata
+            )
+        )
+
+    @override
+    async def get(self, request: m.GetRequest) -> m.GetResponse:
+        with self._handle_errors(), self._handle_not_found(request.name):
+            obj = await self._run(
+                self._metadata,
+                self._client.stat_object,
+                bucket_name=self._bucket,
+                object_name=request.name,
+            )
+
+        if obj.last_modified is None:
+            raise e.InvalidResponseError
+
+        return m.GetResponse(
+            object=m.ObjectDetails(
+                name=str(obj.object_name),
+                type=str(obj.content_type),
+                size=int(obj.size or 0),
+                tag=normalize_tag(str(obj.etag)),
+                modified=obj.last_modified,
+            )
+        )
+
+    @override
+    async def download(self, request: m.DownloadRequest) -> m.DownloadResponse:
+        class Stream(Generator[bytes]):
+            def __init__(
+                self,
+                response: BaseHTTPResponse,
+                chunk: int,
+                context: Callable[[], AbstractContextManager],
+            ) -> None:
+                self.response = response
+                self.iterator = response.stream(chunk)
+                self.context = context
+
+            @override
+            def send(self, *args: Any, **kwargs: Any) -> bytes:
+                try:
+                    with self.context():
+                        return next(self.iterator)
+                except:
+                    self.response.close()
+                    self.response.release_conn()
+                    raise
+
+            @override
+            def throw(self, *args: Any, **kwargs: Any) -> Never:
+                self.response.close()
+                self.response.release_conn()
+                raise StopIteration
+
+        with (
+            self._handle_errors(),
+            self._handle_not_found(request.name),
+            self._handle_invalid_range(request.name),
+        ):
+            get_object_response = await self._run(
+                self._download,
+                self._client.get_object,
+                bucket_name=self._bucket,
+                object_name=request.name,
+                offset=request.offset,
+                length=request.length or 0,
+            )
+
+        headers = get_object_response.headers
+
+        return m.DownloadResponse(
+            content=m.DownloadContent(
+                type=headers["Content-Type"],
+                size=int(headers["Content-Length"]),
+                tag=normalize_tag(headers["ETag"]),
+                modified=httpparse(headers["Last-Modified"]),
+                range=ContentRange.parse(headers["Content-Range"])
+                if "Content-Range" in headers
+                else None,
+                data=asyncify.PrefetchingGenerator(
+                    Stream(get_object_response, request.chunk, self._handle_errors),
+                    readahead=self._config.download.readahead,
+                    executor=self._download,
+                ),
+            )
+        )
+
+    @override
+    async def upload(self, request: m.UploadRequest) -> m.UploadResponse:
+        iterator = syncify.BatchingIterator(
+            request.content.data,
+            size=request.chunk,
+            buffers=self._config.upload.buffers,
+        )
+
+        # Closing the iterator makes the upload thread fail and abort the upload
+        async with iterator:
+            with self._handle_errors():
+                await self._run(
+                    self._upload,
+                    self._client.put_object,
+                    bucket_name=self._bucket,
+                    object_name=request.name,
+                    data=cast("BinaryIO", ReadableIterator(iterator)),
+                    length=-1,
+                    content_type=request.content.type,
+                    part_size=request.chunk,
+                )
+
+        return m.UploadResponse()
+
+    @override
+    async def copy(self, request: m.CopyRequest) -> m.CopyResponse:
+        with self._handle_errors(), self._handle_not_found(request.source):
+            await self._run(
+                self._metadata,
+                self._client.copy_object,
+                bucket_name=self._bucket,
+                object_name=request.destination,
+                source=CopySource(bucket_name=self._bucket, object_name=request.source),
+            )
+
+        return m.CopyResponse()
+
+    @override
+    async def delete(self, request: m.DeleteRequest) -> m.DeleteResponse:
+        with self._handle_errors(), self._handle_not_found(request.name):
+            await self._run(
+                self._metadata,
+                self._client.remove_object,
+                bucket_name=self._bucket,
+                object_name=request.name,
+            )
+
+        return m.DeleteResponse()
+
+    async def _iterate_events(
+        self, response: BaseHTTPResponse
+    ) -> AsyncGenerator[m.ObjectEvent]:
+        parser = NotificationParser()
+
+        try:
+            while True:
+                with self._handle_errors():
+                    line = await self._run(self._listener, response.readline)
+
+                if not line:
+                    raise e.StreamEndedError
+
+                for event in parser.parse(line):
+                    yield event
+        finally:
+            # Closing the response also interrupts a read pending in the thread
+            response.close()
+            response.release_conn()
+
+    @override
+    async def listen(self, request: m.ListenRequest) -> m.ListenResponse:
+        # The client reconnects silently when the stream ends, which would hide
+        # missed notifications, so the request is sent directly
+        with self._handle_errors():
+            response = await self._run(
+                self._listener,
+                self._client._execute,  # noqa: SLF001
+                method="GET",
+                bucket_name=self._bucket,
+                query_params={
+                    "prefix": request.prefix or "",
+                    "suffix": "",
+                    "events": NotificationParser.EVENTS,
+                },
+                preload_content=False,
+            )
+
+        return m.ListenResponse(events=self._iterate_events(response))
+
+    @override
+    async def stats(self, request: m.StatsRequest) -> m.StatsResponse:
+        return m.StatsResponse(
+            pool=self._queue.stats(),
+            executors={
+                name: m.ExecutorStats(
+                    size=executor.size,
+                    active=executor.active,
+                    queued=executor.queued,
+                    tasks=executor.tasks,
+                    wait=executor.wait,
+                )
+                for name, executor in self._executors.items()
+            },
+        )
@@ -0,0 +1,103 @@
+import hashlib
+import hmac
+from collections.abc import Generator
+from datetime import UTC, datetime
+from typing import override
+from urllib.parse import parse_qsl, quote
+
+from httpx import Auth, Request, Response
+
+
+class SigV4Auth(Auth):
+    """Authentication that signs requests with AWS Signature Version 4."""
+
+    ALGORITHM = "AWS4-HMAC-SHA256"
+    UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+    SIGNED_HEADERS = frozenset({"host", "content-md5", "content-type", "range"})
+
+    def __init__(
+        self, access_key: str, secret_key: str, region: str, service: str = "s3"
+    ) -> None:
+        self._access_key = access_key
+        self._secret_key = secret_key
+        self._region = region
+        self._service = service
+        self._keys: dict[str, bytes] = {}
+
+    def _hmac(self, key: bytes, message: str) -> bytes:
+        return hmac.new(key, message.encode(), hashlib.sha256).digest()
+
+    def _get_signing_key(self, date: str) -> bytes:
+        if (key := self._keys.get(date)) is not None:
+            return key
+
+        key = self._hmac(f"AWS4{self._secret_key}".encode(), date)
+        key = self._hmac(key, self._region)
+        key = self._hmac(key, self._service)
+        key = self._hmac(key, "aws4_request")
+
+        self._keys = {date: key}
+        return key
+
+    def _encode(self, value: str) -> str:
+        return quote(value, safe="-_.~")
+
+    def _canonical_query(self, request: Request) -> str:
+        query = request.url.query.decode()
+        pairs = parse_qsl(query, keep_blank_values=True)
+        encoded = sorted((self._encode(k), self._encode(v)) for k, v in pairs)
+        return "&".join(f"{k}={v}" for k, v in encoded)
+
+    def _canonical_headers(self, request: Request) -> tuple[str, str]:
+        headers = sorted(
+            (name.lower(), " ".join(value.split()))
+            for name, value in request.headers.items()
+            if name.lower() in self.SIGNED_HEADERS or name.lower().startswith("x-amz-")
+        )
+        canonical = "".join(f"{name}:{value}\n" for name, value in headers)
+        signed = ";".join(name for name, _ in headers)
+        return canonical, signed
+
+    def sign(self, request: Request, now: datetime) -> None:
+        """Add signature headers to the request."""
+        timestamp = now.astimezone(UTC).strftime("%Y%m%dT%H%M%SZ")
+        date = timestamp[:8]
+        scope = f"{date}/{self._region}/{self._service}/aws4_request"
+
+        request.headers["X-Amz-Date"] = timestamp
+        request.headers["X-Amz-Content-SHA256"] = self.UNSIGNED_PAYLOAD
+
+        canonical_headers, signed_headers = self._canonical_headers(request)
+        canonical_request = "\n".join(
+            [
+                request.method,
+                request.url.raw_path.split(b"?", 1)[0].decode(),
+                self._canonical_query(request),
+                canonical_headers,
+                signed_headers,
+                self.UNSIGNED_PAYLOAD,
+            ]
+        )
+
+        string_to_sign = "\n".join(
+            [
+                self.ALGORITHM,
+                timestamp,
+                scope,
+                hashlib.sha256(canonical_request.encode()).hexdigest(),
+            ]
+        )
+
+        signature = hmac.new(
+            self._get_signing_key(date), string_to_sign.encode(), hashlib.sha256
+        ).hexdigest()
+
+        request.headers["Authorization"] = (
+            f"{self.ALGORITHM} Credential={self._access_key}/{scope}, "
+            f"SignedHeaders={signed_headers}, Signature={signature}"
+        )
+
+    @override
+    def auth_flow(self, request: Request) -> Generator[Request, Response]:
+        self.sign(request, datetime.now(UTC))
+        yield request
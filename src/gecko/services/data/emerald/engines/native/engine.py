@@ -0,0 +1,733 @@
+import asyncio
+from collections import deque
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterator,
+    Generator,
+    Mapping,
+    Sequence,
+)
+from contextlib import contextmanager, suppress
+from enum import StrEnum
+from http import HTTPStatus
+from typing import override
+from urllib.parse import quote
+from xml.etree import ElementTree as ET
+
+from httpx import (
+    AsyncClient,
+    AsyncHTTPTransport,
+    HTTPError,
+    Limits,
+    Request,
+    Response,
+    Timeout,
+)
+
+from gecko.config.models import EmeraldS3Config
+from gecko.services.data.emerald import errors as e
+from gecko.services.data.emerald import models as m
+from gecko.services.data.emerald.engines.base import Engine, normalize_tag
+from gecko.services.data.emerald.engines.native.auth import SigV4Auth
+from gecko.services.data.emerald.engines.native.transport import (
+    CountingTransport,
+    RetryTransport,
+)
+from gecko.services.data.emerald.engines.notifications import NotificationParser
+from gecko.utils.ranges import ContentRange
+from gecko.utils.time import httpparse, isoparse
+
+
+class ErrorCodes(StrEnum):
+    """Error codes."""
+
+    NOT_FOUND = "NoSuchKey"
+    INVALID_RANGE = "InvalidRange"
+
+
+class NativeEngine(Engine):
+    """Engine that talks to the S3 API asynchronously on the event loop."""
+
+    def __init__(self, config: EmeraldS3Config) -> None:
+        self._config = config
+        self._bucket = config.bucket
+        self._client: AsyncClient | None = None
+        self._pool: AsyncHTTPTransport | None = None
+        self._transport: CountingTransport | None = None
+
+    def _build_auth(self) -> SigV4Auth:
+        return SigV4Auth(
+            access_key=self._config.user,
+            secret_key=self._config.password,
+            region=self._config.region,
+        )
+
+    def _build_limits(self) -> Limits:
+        return Limits(
+            max_connections=self._config.pool.connections,
+            max_keepalive_connections=self._config.pool.connections,
+        )
+
+    def _build_timeout(self) -> Timeout:
+        return Timeout(
+            connect=self._config.timeouts.connect,
+            read=self._config.timeouts.read,
+            write=self._config.timeouts.read,
+            pool=self._config.pool.timeout,
+        )
+
+    def _build_transport(self) -> AsyncHTTPTransport:
+        return AsyncHTTPTransport(
+            verify=False,
+            limits=self._build_limits(),
+        )
+
+    def _build_client(self, transport: CountingTransport) -> AsyncClient:
+        return AsyncClient(
+            base_url=self._config.url,
+            auth=self._build_auth(),
+            timeout=self._build_timeout(),
+            transport=RetryTransport(
+                transport,
+                attempts=self._config.retries.attempts,
+                backoff=self._config.retries.backoff,
+            ),
+        )
+
+    def _pool_stats(self) -> m.PoolStats:
+        size = self._config.pool.connections
+
+        if self._transport is None or self._pool is None:
+            return m.PoolStats(size=size, inuse=0, idle=0, waited=0)
+
+        connections = self._pool._pool.connections  # noqa: SLF001
+
+        return m.PoolStats(
+            size=size,
+            inuse=min(self._transport.active, size),
+            idle=sum(connection.is_idle() for connection in connections),
+            waited=self._transport.waited,
+        )
+
+    async def _prewarm(self) -> None:
+        # Connections are opened by concurrent requests and kept alive in the pool
+        async def ping() -> None:
+            with suppress(HTTPError):
+                await self.client.head(self._path())
+
+        await asyncio.gather(*(ping() for _ in range(self._config.pool.prewarm)))
+
+    @property
+    def client(self) -> AsyncClient:
+        """HTTP client for the S3 API."""
+        if self._client is None:
+            raise e.EngineClosedError
+
+        return self._client
+
+    @override
+    async def open(self) -> None:
+        if self._client is None:
+            self._pool = self._build_transport()
+            self._transport = CountingTransport(
+                self._pool, size=self._config.pool.connections
+            )
+            self._client = self._build_client(self._transport)
+            await self._prewarm()
+
+    @override
+    async def close(self) -> None:
+        if self._client is not None:
+            client, self._client = self._client, None
+            self._pool, self._transport = None, None
+            await client.aclose()
+
+    @contextmanager
+    def _handle_errors(self) -> Generator[None]:
+        try:
+            yield
+        except HTTPError as ex:
+            raise e.ServiceError from ex
+
+    def _path(self, name: str | None = None) -> str:
+        if name is None:
+            return f"/{self._bucket}"
+
+        return f"/{self._bucket}/{quote(name, safe='/')}"
+
+    def _parse(self, content: bytes) -> ET.Element:
+        return ET.fromstring(content)  # noqa: S314
+
+    def _find(self, element: ET.Element, tag: str) -> str | None:
+        return element.findtext(f"{{*}}{tag}")
+
+    def _raise(self, response: Response, name: str | None = None) -> None:
+        try:
+            error = self._parse(response.content) if response.content else None
+        except ET.ParseError:
+            error = None
+
+        code = self._find(error, "Code") if error is not None else None
+
+        if name is not None and (
+            code == ErrorCodes.NOT_FOUND
+            or (code is None and response.status_code == HTTPStatus.NOT_FOUND)
+        ):
+            raise e.NotFoundError(name)
+
+        if name is not None and (
+            code == ErrorCodes.INVALID_RANGE
+            or (
+                code is None
+                and response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+            )
+        ):
+            raise e.InvalidRangeError(name)
+
+        raise e.RequestFailedError(response.status_code, code)
+
+    def _check(self, response: Response, name: str | None = None) -> None:
+        if not response.is_success:
+            self._raise(response, name)
+
+    def _check_result(self, response: Response, name: str | None = None) -> None:
+        self._check(response, name)
+
+        if self._parse(response.content).tag.endswith("Error"):
+            self._raise(response, name)
+
+    def _list_details(self, element: ET.Element, name: str) -> m.ObjectDetails | None:
+        # The content type is only listed by MinIO, as a part of the metadata
+        metadata = {
+            child.tag.rpartition("}")[2].lower(): child.text or ""
+            for child in element.iterfind("{*}UserMetadata/*")
+        }
+        content_type = metadata.get("content-type")
+        size = self._find(element, "Size")
+        modified = self._find(element, "LastModified")
+
+        if content_type is None or size is None or modified is None:
+            return None
+
+        return m.ObjectDetails(
+            name=name,
+            type=content_type,
+            size=int(size),
+            tag=normalize_tag(self._find(element, "ETag") or ""),
+            modified=isoparse(modified),
+        )
+
+    def _list_object(self, element: ET.Element, *, details: bool) -> m.ObjectListing:
+        name = self._find(element, "Key") or ""
+
+        return m.ObjectListing(
+            name=name, details=self._list_details(element, name) if details else None
+        )
+
+    async def _list(self, request: m.ListRequest) -> AsyncGenerator[m.ObjectListing]:
+        params: dict[str, str] = {"list-type": "2"}
+
+        if request.prefix is not None:
+            params["prefix"] = request.prefix
+
+        if not request.recursive:
+            params["delimiter"] = "/"
+
+        if request.start_after is not None:
+            params["start-after"] = request.start_after
+
+        if request.details:
+            params["metadata"] = "true"
+
+        while True:
+            with self._handle_errors():
+                response = await self.client.get(self._path(), params=params)
+
+            self._check(response)
+            result = self._parse(response.content)
+
+            listings = [
+                *(
+                    self._list_object(element, details=request.details)
+                    for element in result.iterfind("{*}Contents")
+                ),
+                *(
+                    m.ObjectListing(name=self._find(element, "Prefix") or "")
+                    for element in result.iterfind("{*}CommonPrefixes")
+                ),
+            ]
+
+            for listing in listings:
+                # Names are listed in ascending order, so no later page can match
+                if request.stop is not None and listing.name >= request.stop:
+                    return
+
+                yield listing
+
+            token = self._find(result, "NextContinuationToken")
+
+            if self._find(result, "IsTruncated") != "true" or not token:
+                return
+
+            params["continuation-token"] = token
+
+    @override
+    async def list(self, request: m.ListRequest) -> m.ListResponse:
+        return m.ListResponse(objects=self._list(request))
+
+    def _details(self, name: str, headers: Mapping[str, str]) -> m.ObjectDetails:
+        if "Last-Modified" not in headers:
+            raise e.InvalidResponseError
+
+        return m.ObjectDetails(
+            name=name,
+            type=headers.get("Content-Type", ""),
+            size=int(headers.get("Content-Length", 0)),
+            tag=normalize_tag(headers.get("ETag", "")),
+            modified=httpparse(headers["Last-Modified"]),
+        )
+
+    @override
+    async def get(self, request: m.GetRequest) -> m.GetResponse:
+        with self._handle_errors():
+            response = await self.client.head(self._path(request.name))
+
+        self._check(response, request.name)
+
+        return m.GetResponse(object=self._details(request.name, response.headers))
+
+    async def _stream(self, response: Response, chunk: int) -> AsyncGenerator[bytes]:
+        try:
+            with self._handle_errors():
+                async for data in response.aiter_raw(chunk):
+                    yield data
+        finally:
+            await response.aclose()
+
+    def _range(self, offset: int, length: int | None) -> str | None:
+        if length is not None:
+            return f"bytes={offset}-{offset + length - 1}"
+
+        if offset:
+            return f"bytes={offset}-"
+
+        return None
+
+    async def _open(self, name: str, value: str | None) -> Response:
+        headers = {"Range": value} if value is not None else {}
+
+        return await self._send_streaming(
+            self.client.build_request("GET", self._path(name), headers=headers), name
+        )
+
+    async def _send_streaming(self, request: Request, name: str | None) -> Response:
+        with self._handle_errors():
+            response = await self.client.send(request, stream=True)
+
+        try:
+            if not response.is_success:
+                with self._handle_errors():
+                    await response.aread()
+
+                self._check(response, name)
+        except:
+            await response.aclose()
+            raise
+
+        return response
+
+    def _content_range(self, response: Response) -> ContentRange | None:
+        if response.status_code != HTTPStatus.PARTIAL_CONTENT:
+            return None
+
+        return ContentRange.parse(response.headers["Content-Range"])
+
+    async def _download_single(self, request: m.DownloadRequest) -> m.DownloadResponse:
+        response = await self._open(
+            request.name, self._range(request.offset, request.length)
+        )
+
+        try:
+            details = self._details(request.name, response.headers)
+            content_range = self._content_range(response)
+        except:
+            await response.aclose()
+            raise
+
+        return m.DownloadResponse(
+            content=m.DownloadContent(
+                type=details.type,
+                size=details.size,
+                tag=details.tag,
+                modified=details.modified,
+                range=content_range,
+                data=self._stream(response, request.chunk),
+            )
+        )
+
+    async def _download_part(self, name: str, tag: str, start: int, end: int) -> bytes:
+        # If-Match makes sure all parts come from the same version of the object
+        headers = {"Range": f"bytes={start}-{end}", "If-Match": tag}
+
+        with self._handle_errors():
+            response = await self.client.get(self._path(name), headers=headers)
+
+        self._check(response, name)
+
+        return response.content
+
+    async def _download_part_limited(
+        self, semaphore: asyncio.Semaphore, name: str, tag: str, start: int, end: int
+    ) -> bytes:
+        async with semaphore:
+            return await self._download_part(name, tag, start, end)
+
+    async def _stream_parts(
+        self,
+        name: str,
+        tag: str,
+        first: Response,
+        parts: Sequence[tuple[int, int]],
+        chunk: int,
+    ) -> AsyncGenerator[bytes]:
+        config = self._config.download
+        semaphore = asyncio.Semaphore(config.concurrency)
+        remaining = iter(parts)
+        tasks: deque[asyncio.Task[bytes]] = deque()
+
+        def fill() -> None:
+            # Parts are fetched ahead only as far as the reorder buffer allows
+            while (
+                len(tasks) < config.buffers
+                and (part := next(remaining, None)) is not None
+            ):
+                tasks.append(
+                    asyncio.create_task(
+                        self._download_part_limited(semaphore, name, tag, *part)
+                    )
+                )
+
+        try:
+            fill()
+
+            async for data in self._stream(first, chunk):
+                yield data
+
+            while tasks:
+                data = await tasks.popleft()
+                fill()
+
+                for offset in range(0, len(data), chunk):
+                    yield data[offset : offset + chunk]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await first.aclose()
+
+    async def _download_parallel(
+        self, request: m.DownloadRequest
+    ) -> m.DownloadResponse:
+        end = request.offset + request.chunk - 1
+
+        if request.length is not None:
+            end = min(end, request.offset + request.length - 1)
+
+        try:
+            response = await self._open(request.name, f"bytes={request.offset}-{end}")
+        except e.InvalidRangeError:
+            # Any range is invalid for an empty object, so fetch it whole instead
+            if request.offset or request.length is not None:
+                raise
+
+            return await self._download_single(request)
+
+        try:
+            details = self._details(request.name, response.headers)
+            first = self._content_range(response)
+        except:
+            await response.aclose()
+            raise
+
+        if first is None:
+            return m.DownloadResponse(
+                content=m.DownloadContent(
+                    type=details.type,
+                    size=details.size,
+                    tag=details.tag,
+                    modified=details.modified,
+                    range=None,
+                    data=self._stream(response, request.chunk),
+                )
+            )
+
+        last = first.size - 1
+
+        if request.length is not None:
+            last = min(last, request.offset + request.length - 1)
+
+        parts = [
+            (start, min(start + request.chunk - 1, last))
+            for start in range(first.end + 1, last + 1, request.chunk)
+        ]
+
+        return m.DownloadResponse(
+            content=m.DownloadContent(
+                type=details.type,
+                size=last - first.start + 1,
+                tag=details.tag,
+                modified=details.modified,
+                range=ContentRange(start=first.start, end=last, size=first.size)
+                if request.offset or request.length is not None
+                else None,
+                data=self._stream_parts(
+                    request.name, details.tag, response, parts, request.chunk
+                ),
+            )
+        )
+
+    @override
+    async def download(self, request: m.DownloadRequest) -> m.DownloadResponse:
+        if self._config.download.concurrency > 1:
+            return await self._download_parallel(request)
+
+        return await self._download_single(request)
+
+    async def _parts(
+        self, data: AsyncIterator[bytes], size: int
+    ) -> AsyncGenerator[bytes]:
+        # Views of the chunks are collected and joined once per part
+        views: list[memoryview] = []
+        buffered = 0
+
+        async for chunk in data:
+            view = memoryview(chunk)
+
+            while buffered + len(view) >= size:
+                taken = size - buffered
+                views.append(view[:taken])
+                view = view[taken:]
+
+                yield b"".join(views)
+                views.clear()
+                buffered = 0
+
+            if view:
+                views.append(view)
+                buffered += len(view)
+
+        if views:
+            yield b"".join(views)
+
+    async def _put(self, name: str, content_type: str, data: bytes) -> None:
+        with self._handle_errors():
+            response = await self.client.put(
+                self._path(name), content=data, headers={"Content-Type": content_type}
+            )
+
+        self._check(response)
+
+    async def _create_multipart(self, name: str, content_type: str) -> str:
+        with self._handle_errors():
+            response = await self.client.post(
+                self._path(name),
+                params={"uploads": ""},
+                headers={"Content-Type": content_type},
+            )
+
+        self._check(response)
+
+        upload = self._find(self._parse(response.content), "UploadId")
+
+        if not upload:
+            raise e.InvalidResponseError
+
+        return upload
+
+    async def _upload_part(
+        self, name: str, upload: str, number: int, data: bytes
+    ) -> str:
+        with self._handle_errors():
+            response = await self.client.put(
+                self._path(name),
+                params={"partNumber": str(number), "uploadId": upload},
+                content=data,
+            )
+
+        self._check(response)
+
+        return response.headers.get("ETag", "")
+
+    async def _complete_multipart(
+        self, name: str, upload: str, tags: Sequence[str]
+    ) -> None:
+        root = ET.Element("CompleteMultipartUpload")
+
+        for number, tag in enumerate(tags, start=1):
+            part = ET.SubElement(root, "Part")
+            ET.SubElement(part, "PartNumber").text = str(number)
+            ET.SubElement(part, "ETag").text = tag
+
+        with self._handle_errors():
+            response = await self.client.post(
+                self._path(name),
+                params={"uploadId": upload},
+                content=ET.tostring(root),
+            )
+
+        self._check_result(response)
+
+    async def _abort_multipart(self, name: str, upload: str) -> None:
+        with self._handle_errors():
+            response = await self.client.delete(
+                self._path(name), params={"uploadId": upload}
+            )
+
+        self._check(response)
+
+    async def _upload_part_limited(
+        self,
+        semaphore: asyncio.Semaphore,
+        name: str,
+        upload: str,
+        number: int,
+        data: bytes,
+    ) -> str:
+        async with semaphore:
+            return await self._upload_part(name, upload, number, data)
+
+    async def _upload_parts(
+        self, name: str, upload: str, first: bytes, rest: AsyncIterator[bytes]
+    ) -> Sequence[str]:
+        config = self._config.upload
+        semaphore = asyncio.Semaphore(config.concurrency)
+        tasks: list[asyncio.Task[str]] = []
+        pending: set[asyncio.Task[str]] = set()
+
+        def spawn(data: bytes) -> None:
+            task = asyncio.create_task(
+                self._upload_part_limited(semaphore, name, upload, len(tasks) + 1, data)
+            )
+            tasks.append(task)
+            pending.add(task)
+
+        async def wait(when: str) -> None:
+            done, _ = await asyncio.wait(pending, return_when=when)
+            pending.difference_update(done)
+
+            for task in done:
+                task.result()
+
+        try:
+            spawn(first)
+
+            # Keep reading parts while others are uploading, up to the buffer limit
+            async for data in rest:
+                while len(pending) >= config.buffers:
+                    await wait(asyncio.FIRST_COMPLETED)
+
+                spawn(data)
+
+            while pending:
+                await wait(asyncio.FIRST_EXCEPTION)
+        finally:
+            for task in pending:
+                task.cancel()
+
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        return [task.result() for task in tasks]
+
+    async def _upload_multipart(
+        self, name: str, content_type: str, first: bytes, rest: AsyncIterator[bytes]
+    ) -> None:
+        upload = await self._create_multipart(name, content_type)
+
+        try:
+            tags = await self._upload_parts(name, upload, first, rest)
+            await self._complete_multipart(name, upload, tags)
+        except:
+            with suppress(e.ServiceError):
+                await self._abort_multipart(name, upload)
+            raise
+
+    @override
+    async def upload(self, request: m.UploadRequest) -> m.UploadResponse:
+        parts = self._parts(request.content.data, request.chunk)
+
+        try:
+            first = await anext(parts, b"")
+
+            if len(first) < request.chunk:
+                await self._put(request.name, request.content.type, first)
+            else:
+                await self._upload_multipart(
+                    request.name, request.content.type, first, parts
+                )
+        finally:
+            await parts.aclose()
+
+        return m.UploadResponse()
+
+    @override
+    async def copy(self, request: m.CopyRequest) -> m.CopyResponse:
+        source = quote(f"{self._bucket}/{request.source}", safe="/")
+
+        with self._handle_errors():
+            response = await self.client.put(
+                self._path(request.destination),
+                headers={"X-Amz-Copy-Source": f"/{source}"},
+            )
+
+        self._check_result(response, request.source)
+
+        return m.CopyResponse()
+
+    @override
+    async def delete(self, request: m.DeleteRequest) -> m.DeleteResponse:
+        with self._handle_errors():
+            response = await self.client.delete(self._path(request.name))
+
+        self._check(response, request.name)
+
+        return m.DeleteResponse()
+
+    async def _listen(self, response: Response) -> AsyncGenerator[m.ObjectEvent]:
+        parser = NotificationParser()
+
+        try:
+            with self._handle_errors():
+                async for line in response.aiter_lines():
+                    for event in parser.parse(line):
+                        yield event
+        finally:
+            await response.aclose()
+
+        raise e.StreamEndedError
+
+    @override
+    async def listen(self, request: m.ListenRequest) -> m.ListenResponse:
+        params = {
+            "events": list(NotificationParser.EVENTS),
+            "prefix": request.prefix or "",
+            "suffix": "",
+        }
+
+        # Notifications can be far apart, the server sends keepalives in between
+        response = await self._send_streaming(
+            self.client.build_request(
+                "GET",
+                self._path(),
+                params=params,
+                timeout=Timeout(self._config.timeouts.connect, read=None),
+            ),
+            None,
+        )
+
+        return m.ListenResponse(events=self._listen(response))
+
+    @override
+    async def stats(self, request: m.StatsRequest) -> m.StatsResponse:
+        # Requests run on the event loop, so there are no worker threads to report
+        return m.StatsResponse(pool=self._pool_stats(), executors={})
@@ -0,0 +1,112 @@
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from typing import cast, override
+
+from httpx import (
+    AsyncBaseTransport,
+    AsyncByteStream,
+    Request,
+    Response,
+    TransportError,
+)
+
+
+class ReleasingStream(AsyncByteStream):
+    """Response stream that calls a function once when closed."""
+
+    def __init__(self, stream: AsyncByteStream, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._release: Callable[[], None] | None = release
+
+    @override
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    @override
+    async def aclose(self) -> None:
+        if self._release is not None:
+            release, self._release = self._release, None
+            release()
+
+        await self._stream.aclose()
+
+
+class CountingTransport(AsyncBaseTransport):
+    """Transport that counts active requests and requests that had to wait."""
+
+    def __init__(self, transport: AsyncBaseTransport, size: int) -> None:
+        self._transport = transport
+        self._size = size
+        self.active = 0
+        self.waited = 0
+
+    def _release(self) -> None:
+        self.active -= 1
+
+    @override
+    async def handle_async_request(self, request: Request) -> Response:
+        if self.active >= self._size:
+            self.waited += 1
+
+        self.active += 1
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except:
+            self._release()
+            raise
+
+        return Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=ReleasingStream(
+                cast("AsyncByteStream", response.stream), self._release
+            ),
+            extensions=response.extensions,
+        )
+
+    @override
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class RetryTransport(AsyncBaseTransport):
+    """Transport that retries idempotent requests failing with transient errors."""
+
+    METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE"})
+    STATUSES = frozenset({500, 502, 503, 504})
+
+    def __init__(
+        self, transport: AsyncBaseTransport, attempts: int, backoff: float
+    ) -> None:
+        self._transport = transport
+        self._attempts = attempts
+        self._backoff = backoff
+
+    @override
+    async def handle_async_request(self, request: Request) -> Response:
+        if request.method not in self.METHODS:
+            return await self._transport.handle_async_request(request)
+
+        delays = (self._backoff * 2**attempt for attempt in range(self._attempts))
+
+        while True:
+            delay = next(delays, None)
+
+            try:
+                response = await self._transport.handle_async_request(request)
+            except TransportError:
+                if delay is None:
+                    raise
+            else:
+                if delay is None or response.status_code not in self.STATUSES:
+                    return response
+
+                await response.aclose()
+
+            await asyncio.sleep(delay)
+
+    @override
+    async def aclose(self) -> None:
+        await self._transport.aclose()
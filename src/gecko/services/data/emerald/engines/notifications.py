@@ -0,0 +1,49 @@
+import json
+from collections.abc import Sequence
+from urllib.parse import unquote_plus
+
+from gecko.services.data.emerald import errors as e
+from gecko.services.data.emerald import models as m
+
+
+class NotificationParser:
+    """Parser for lines of a MinIO bucket notification stream."""
+
+    EVENTS = ("s3:ObjectCreated:*", "s3:ObjectRemoved:*")
+
+    TYPES = (
+        ("s3:ObjectCreated:", m.ObjectEventType.CREATED),
+        ("s3:ObjectRemoved:", m.ObjectEventType.REMOVED),
+    )
+
+    def _parse_record(self, record: dict) -> m.ObjectEvent | None:
+        name = record.get("eventName", "")
+        key = record.get("s3", {}).get("object", {}).get("key")
+
+        if key is None:
+            return None
+
+        for prefix, event_type in self.TYPES:
+            if name.startswith(prefix):
+                # Keys in notifications are URL-encoded
+                return m.ObjectEvent(type=event_type, name=unquote_plus(key))
+
+        return None
+
+    def parse(self, line: bytes | str) -> Sequence[m.ObjectEvent]:
+        """Parse a line of the stream, empty lines are keepalives."""
+        if not line.strip():
+            return []
+
+        try:
+            data = json.loads(line)
+        except ValueError as ex:
+            raise e.InvalidResponseError from ex
+
+        records = data.get("Records") or []
+
+        return [
+            event
+            for record in records
+            if (event := self._parse_record(record)) is not None
+        ]
@@ -7,3 +7,38 @@ class NotFoundError(ServiceError):
 
     def __init__(self, name: str) -> None:
         super().__init__(f"Object not found: {name}.")
+
+
+class InvalidRangeError(ServiceError):
+    """Raised when a requested range is outside of an object."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(f"Invalid range for object: {name}.")
+
+
+class EngineClosedError(ServiceError):
+    """Raised when a request is made with a closed engine."""
+
+    def __init__(self) -> None:
+        super().__init__("Engine is closed.")
+
+
+class RequestFailedError(ServiceError):
+    """Raised when a request to the S3 API fails."""
+
+    def __init__(self, status: int, code: str | None) -> None:
+        super().__init__(f"Request failed with status {status} and code {code}.")
+
+
+class InvalidResponseError(ServiceError):
+    """Raised when the S3 API returns an unexpected response."""
+
+    def __init__(self) -> None:
+        super().__init__("Invalid response from the S3 API.")
+
+
+class StreamEndedError(ServiceError):
+    """Raised when a stream of notifications ends and changes might be missed."""
+
+    def __init__(self) -> None:
+        super().__init__("Stream of notifications ended.")
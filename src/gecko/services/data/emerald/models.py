@@ -1,15 +1,9 @@
 from collections.abc import AsyncGenerator, AsyncIterator
 from datetime import datetime
+from enum import StrEnum
 
 from gecko.models.base import datamodel
-
-
-@datamodel
-class ObjectListing:
-    """Object listing model."""
-
-    name: str
-    """Name of the object."""
+from gecko.utils.ranges import ContentRange
 
 
 @datamodel
@@ -32,6 +26,77 @@ class ObjectDetails:
     """Datetime when the object was last modified."""
 
 
+@datamodel
+class ObjectListing:
+    """Object listing model."""
+
+    name: str
+    """Name of the object."""
+
+    details: ObjectDetails | None = None
+    """Details of the object, if requested and known from the listing."""
+
+
+@datamodel
+class PoolStats:
+    """Connection pool statistics model."""
+
+    size: int
+    """Maximum number of connections."""
+
+    inuse: int
+    """Number of connections in use."""
+
+    idle: int
+    """Number of idle connections kept open."""
+
+    waited: int
+    """Number of requests that had to wait for a free connection."""
+
+
+@datamodel
+class ExecutorStats:
+    """Worker threads statistics model."""
+
+    size: int
+    """Maximum number of threads."""
+
+    active: int
+    """Number of threads running a task."""
+
+    queued: int
+    """Number of tasks waiting for a free thread."""
+
+    tasks: int
+    """Number of tasks started so far."""
+
+    wait: float
+    """Total time in seconds that started tasks spent waiting for a free thread."""
+
+
+@datamodel
+class LimiterStats:
+    """Adaptive concurrency limiter statistics model."""
+
+    limit: float
+    """Current limit of concurrent requests."""
+
+    active: int
+    """Number of requests running."""
+
+    queued: int
+    """Number of requests waiting for a free slot."""
+
+    tasks: int
+    """Number of requests started so far."""
+
+    wait: float
+    """Total time in seconds that requests spent waiting for a free slot."""
+
+    decreases: int
+    """Number of times the limit was decreased after slow or failed requests."""
+
+
 @datamodel
 class UploadContent:
     """Content model for upload."""
@@ -51,7 +116,7 @@ class DownloadContent:
     """Content type of the object."""
 
     size: int
-    """Size of the object in bytes."""
+    """Size of the downloaded data in bytes."""
 
     tag: str
     """ETag of the object."""
@@ -59,6 +124,9 @@ class DownloadContent:
     modified: datetime
     """Datetime when the object was last modified."""
 
+    range: ContentRange | None
+    """Range of the downloaded data within the object, if only a part was requested."""
+
     data: AsyncGenerator[bytes]
     """Asynchronous generator of data bytes."""
 
@@ -73,6 +141,15 @@ class ListRequest:
     recursive: bool = True
     """Whether to list objects recursively."""
 
+    start_after: str | None = None
+    """List only objects with names after this one."""
+
+    stop: str | None = None
+    """Stop listing at the first object with a name not before this one."""
+
+    details: bool = False
+    """Whether to include object details in the listing, if the engine can."""
+
 
 @datamodel
 class ListResponse:
@@ -89,6 +166,9 @@ class GetRequest:
     name: str
     """Name of the object."""
 
+    limited: bool = False
+    """Whether the request is one of many made at once, which share an adaptive limit."""
+
 
 @datamodel
 class GetResponse:
@@ -105,6 +185,12 @@ class DownloadRequest:
     name: str
     """Name of the object."""
 
+    offset: int = 0
+    """Position of the first byte to download."""
+
+    length: int | None = None
+    """Number of bytes to download or None to download until the end."""
+
     chunk: int = 5 * (1024**2)
     """Chunk size for downloading."""
 
@@ -163,3 +249,56 @@ class DeleteRequest:
 @datamodel
 class DeleteResponse:
     """Response for deleting an object."""
+
+
+class ObjectEventType(StrEnum):
+    """Type of a change of an object."""
+
+    CREATED = "created"
+    REMOVED = "removed"
+
+
+@datamodel
+class ObjectEvent:
+    """Notification about a change of an object."""
+
+    type: ObjectEventType
+    """Type of the change."""
+
+    name: str
+    """Name of the object."""
+
+
+@datamodel
+class ListenRequest:
+    """Request for listening to changes of objects."""
+
+    prefix: str | None = None
+    """Prefix of the object names."""
+
+
+@datamodel
+class ListenResponse:
+    """Response for listening to changes of objects."""
+
+    events: AsyncGenerator[ObjectEvent]
+    """Asynchronous generator of notifications, failing when the stream ends."""
+
+
+@datamodel
+class StatsRequest:
+    """Request for getting statistics."""
+
+
+@datamodel
+class StatsResponse:
+    """Response for getting statistics."""
+
+    pool: PoolStats
+    """Connection pool statistics."""
+
+    executors: dict[str, ExecutorStats]
+    """Worker threads statistics by purpose."""
+
+    limiter: LimiterStats | None = None
+    """Metadata requests limiter statistics, if requests pass through one."""
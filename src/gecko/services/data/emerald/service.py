@@ -1,180 +1,92 @@
-import asyncio
-from collections.abc import Callable, Generator, Iterator
-from contextlib import AbstractContextManager, contextmanager
-from datetime import datetime
-from enum import StrEnum
-from typing import Any, BinaryIO, Never, cast, override
-
-from minio import Minio
-from minio.commonconfig import CopySource
-from minio.datatypes import Object
-from minio.error import MinioException, S3Error
-from urllib3 import BaseHTTPResponse
-
-from gecko.config.models import EmeraldConfig
+from gecko.config.models import EmeraldConfig, EmeraldLimiterConfig, EmeraldS3Engine
 from gecko.services.data.emerald import errors as e
 from gecko.services.data.emerald import models as m
-from gecko.utils import asyncify, syncify
-from gecko.utils.read import ReadableIterator
-from gecko.utils.time import httpparse
-
-
-class ErrorCodes(StrEnum):
-    """Error codes."""
-
-    NOT_FOUND = "NoSuchKey"
+from gecko.services.data.emerald.engines.base import Engine
+from gecko.services.data.emerald.engines.minio import MinioEngine
+from gecko.services.data.emerald.engines.native.engine import NativeEngine
+from gecko.utils.limiters import AdaptiveLimiter
 
 
 class EmeraldService:
     """Service for emerald database."""
 
     def __init__(self, config: EmeraldConfig) -> None:
-        self._client = Minio(
-            endpoint=config.s3.endpoint,
-            access_key=config.s3.user,
-            secret_key=config.s3.password,
-            secure=config.s3.secure,
-            cert_check=False,
+        self._engine = self._build_engine(config)
+        self._limiter = self._build_limiter(config.limiter)
+
+    def _build_engine(self, config: EmeraldConfig) -> Engine:
+        match config.s3.engine:
+            case EmeraldS3Engine.MINIO:
+                return MinioEngine(config.s3)
+            case EmeraldS3Engine.NATIVE:
+                return NativeEngine(config.s3)
+
+    def _build_limiter(self, config: EmeraldLimiterConfig) -> AdaptiveLimiter:
+        # Missing objects are expected answers, not signs of an overloaded server
+        return AdaptiveLimiter(
+            initial=config.initial,
+            minimum=config.minimum,
+            maximum=config.maximum,
+            latency=config.latency,
+            backoff=config.backoff,
+            ignored=(e.NotFoundError,),
         )
-        self._bucket = config.s3.bucket
-
-    @contextmanager
-    def _handle_errors(self) -> Generator[None]:
-        try:
-            yield
-        except MinioException as ex:
-            raise e.ServiceError from ex
-
-    @contextmanager
-    def _handle_not_found(self, name: str) -> Generator[None]:
-        try:
-            yield
-        except S3Error as ex:
-            if ex.code == ErrorCodes.NOT_FOUND:
-                raise e.NotFoundError(name) from ex
 
-    async def list(self, request: m.ListRequest) -> m.ListResponse:
-        """List objects."""
-
-        def iterate(objects: Iterator[Object]) -> Generator[m.ObjectListing]:
-            with self._handle_errors():
-                for obj in objects:
-                    yield m.ObjectListing(name=str(obj.object_name))
+    async def open(self) -> None:
+        """Open the connections to emerald database."""
+        await self._engine.open()
 
-        with self._handle_errors():
-            objects = await asyncio.to_thread(
-                self._client.list_objects,
-                bucket_name=self._bucket,
-                prefix=request.prefix,
-                recursive=request.recursive,
-            )
+    async def close(self) -> None:
+        """Close the connections to emerald database."""
+        await self._engine.close()
 
-        return m.ListResponse(objects=asyncify.Generator(iterate(objects)))
+    async def list(self, request: m.ListRequest) -> m.ListResponse:
+        """List objects."""
+        return await self._engine.list(request)
 
     async def get(self, request: m.GetRequest) -> m.GetResponse:
         """Get an object."""
-        with self._handle_errors(), self._handle_not_found(request.name):
-            obj = await asyncio.to_thread(
-                self._client.stat_object,
-                bucket_name=self._bucket,
-                object_name=request.name,
-            )
-
-        return m.GetResponse(
-            object=m.ObjectDetails(
-                name=str(obj.object_name),
-                type=str(obj.content_type),
-                size=int(obj.size or 0),
-                tag=str(obj.etag),
-                modified=obj.last_modified or datetime.min,
-            )
-        )
+        # Single requests of users are not held back by the fan-out of listings
+        if not request.limited:
+            return await self._engine.get(request)
+
+        # The limit is shared, so concurrent callers don't multiply the load
+        async with self._limiter.acquire():
+            return await self._engine.get(request)
 
     async def download(self, request: m.DownloadRequest) -> m.DownloadResponse:
         """Download an object."""
-
-        class Stream(Generator[bytes]):
-            def __init__(
-                self,
-                response: BaseHTTPResponse,
-                chunk: int,
-                context: Callable[[], AbstractContextManager],
-            ) -> None:
-                self.response = response
-                self.iterator = response.stream(chunk)
-                self.context = context
-
-            @override
-            def send(self, *args: Any, **kwargs: Any) -> bytes:
-                try:
-                    with self.context():
-                        return next(self.iterator)
-                except:
-                    self.response.close()
-                    self.response.release_conn()
-                    raise
-
-            @override
-            def throw(self, *args: Any, **kwargs: Any) -> Never:
-                self.response.close()
-                self.response.release_conn()
-                raise StopIteration
-
-        with self._handle_errors(), self._handle_not_found(request.name):
-            get_object_response = await asyncio.to_thread(
-                self._client.get_object,
-                bucket_name=self._bucket,
-                object_name=request.name,
-            )
-
-        return m.DownloadResponse(
-            content=m.DownloadContent(
-                type=get_object_response.headers["Content-Type"],
-                size=int(get_object_response.headers["Content-Length"]),
-                tag=get_object_response.headers["ETag"],
-                modified=httpparse(get_object_response.headers["Last-Modified"]),
-                data=asyncify.Generator(
-                    Stream(get_object_response, request.chunk, self._handle_errors)
-                ),
-            )
-        )
+        return await self._engine.download(request)
 
     async def upload(self, request: m.UploadRequest) -> m.UploadResponse:
         """Upload an object."""
-        with self._handle_errors():
-            await asyncio.to_thread(
-                self._client.put_object,
-                bucket_name=self._bucket,
-                object_name=request.name,
-                data=cast(
-                    "BinaryIO", ReadableIterator(syncify.Iterator(request.content.data))
-                ),
-                length=-1,
-                content_type=request.content.type,
-                part_size=request.chunk,
-            )
-
-        return m.UploadResponse()
+        return await self._engine.upload(request)
 
     async def copy(self, request: m.CopyRequest) -> m.CopyResponse:
         """Copy an object."""
-        with self._handle_errors(), self._handle_not_found(request.source):
-            await asyncio.to_thread(
-                self._client.copy_object,
-                bucket_name=self._bucket,
-                object_name=request.destination,
-                source=CopySource(bucket_name=self._bucket, object_name=request.source),
-            )
-
-        return m.CopyResponse()
+        return await self._engine.copy(request)
 
     async def delete(self, request: m.DeleteRequest) -> m.DeleteResponse:
         """Delete an object."""
-        with self._handle_errors(), self._handle_not_found(request.name):
-            await asyncio.to_thread(
-                self._client.remove_object,
-                bucket_name=self._bucket,
-                object_name=request.name,
-            )
-
-        return m.DeleteResponse()
+        return await self._engine.delete(request)
+
+    async def listen(self, request: m.ListenRequest) -> m.ListenResponse:
+        """Listen to changes of objects."""
+        return await self._engine.listen(request)
+
+    async def stats(self, request: m.StatsRequest) -> m.StatsResponse:
+        """Get statistics."""
+        stats_response = await self._engine.stats(request)
+
+        return m.StatsResponse(
+            pool=stats_response.pool,
+            executors=stats_response.executors,
+            limiter=m.LimiterStats(
+                limit=self._limiter.limit,
+                active=self._limiter.active,
+                queued=self._limiter.queued,
+                tasks=self._limiter.tasks,
+                wait=self._limiter.wait,
+                decreases=self._limiter.decreases,
+            ),
+        )
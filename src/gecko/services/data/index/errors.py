@@ -0,0 +1,9 @@
+class ServiceError(Exception):
+    """Base class for index errors."""
+
+
+class IndexClosedError(ServiceError):
+    """Raised when a request is made with a closed index."""
+
+    def __init__(self) -> None:
+        super().__init__("Index is closed.")
@@ -0,0 +1,104 @@
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from uuid import UUID
+
+from gecko.models.base import datamodel
+
+
+@datamodel
+class Entry:
+    """Index entry of a recording."""
+
+    event: UUID
+    """Identifier of the event."""
+
+    start: datetime
+    """Start datetime of the event instance in event timezone."""
+
+    type: str
+    """Content type of the recording."""
+
+    size: int
+    """Size of the recording in bytes."""
+
+    tag: str
+    """ETag of the recording."""
+
+    modified: datetime
+    """Datetime when the recording was last modified."""
+
+
+@datamodel
+class ListRequest:
+    """Request for listing entries."""
+
+    event: UUID
+    """Identifier of the event."""
+
+    after: datetime | None = None
+    """Only list entries starting at or after this datetime."""
+
+    before: datetime | None = None
+    """Only list entries starting before this datetime."""
+
+    last: datetime | None = None
+    """Start of the last entry already listed, to continue after it in listing order."""
+
+    descending: bool = False
+    """Whether to list entries from the latest to the earliest."""
+
+    limit: int | None = None
+    """Maximum number of entries to list."""
+
+
+@datamodel
+class ListResponse:
+    """Response for listing entries."""
+
+    entries: Sequence[Entry]
+    """Listed entries."""
+
+
+@datamodel
+class SaveRequest:
+    """Request for saving an entry."""
+
+    entry: Entry
+    """Entry to save, replacing any entry of the same recording."""
+
+
+@datamodel
+class SaveResponse:
+    """Response for saving an entry."""
+
+
+@datamodel
+class DeleteRequest:
+    """Request for deleting an entry."""
+
+    event: UUID
+    """Identifier of the event."""
+
+    start: datetime
+    """Start datetime of the event instance in event timezone."""
+
+
+@datamodel
+class DeleteResponse:
+    """Response for deleting an entry."""
+
+
+@datamodel
+class ReplaceRequest:
+    """Request for replacing all entries with the results of a scan."""
+
+    entries: AsyncIterator[Entry]
+    """Entries found by the scan, stored as they come."""
+
+    since: datetime
+    """Datetime when the scan started, entries saved later are kept."""
+
+
+@datamodel
+class ReplaceResponse:
+    """Response for replacing all entries."""
@@ -0,0 +1,287 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Generator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from gecko.config.models import IndexConfig
+from gecko.services.data.index import errors as e
+from gecko.services.data.index import models as m
+from gecko.utils.time import isoparse, isostringify
+
+
+class IndexService:
+    """Service for the local index of recordings."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS recordings (
+            event TEXT NOT NULL,
+            start TEXT NOT NULL,
+            type TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            tag TEXT NOT NULL,
+            modified TEXT NOT NULL,
+            updated REAL NOT NULL,
+            PRIMARY KEY (event, start)
+        ) WITHOUT ROWID
+    """
+
+    COLUMNS = "event, start, type, size, tag, modified"
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, config: IndexConfig) -> None:
+        self._config = config
+        self._executor: ThreadPoolExecutor | None = None
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._ready = False
+        self._deleted = set[tuple[UUID, datetime]]()
+        self._invalidated = asyncio.Event()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the index is enabled."""
+        return self._config.enabled
+
+    @property
+    def ready(self) -> bool:
+        """Whether the index was filled by a scan and can answer queries."""
+        return self._ready
+
+    def invalidate(self, *, rescan: bool = True) -> None:
+        """Mark the index as out of date until it is filled by a new scan.
+
+        Without a rescan, whoever invalidates the index is the one to scan it again.
+        """
+        self._ready = False
+
+        if rescan:
+            self._invalidated.set()
+
+    async def invalidated(self) -> None:
+        """Wait until the index is marked as out of date."""
+        await self._invalidated.wait()
+        self._invalidated.clear()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Each worker thread has its own connection, WAL lets readers run in parallel
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+            connection = sqlite3.connect(
+                self._config.path, timeout=5.0, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+
+            with self._lock:
+                self._connections.append(connection)
+
+        return connection
+
+    @contextmanager
+    def _handle_errors(self) -> Generator[None]:
+        try:
+            yield
+        except sqlite3.Error as ex:
+            raise e.ServiceError from ex
+
+    async def _run[T](self, function: Callable[[sqlite3.Connection], T]) -> T:
+        if self._executor is None:
+            raise e.IndexClosedError
+
+        loop = asyncio.get_running_loop()
+
+        with self._handle_errors():
+            return await loop.run_in_executor(
+                self._executor, lambda: function(self._connect())
+            )
+
+    def _serialize(self, entry: m.Entry, updated: float) -> tuple[Any, ...]:
+        return (
+            str(entry.event),
+            isostringify(entry.start),
+            entry.type,
+            entry.size,
+            entry.tag,
+            isostringify(entry.modified),
+            updated,
+        )
+
+    def _deserialize(self, row: tuple[Any, ...]) -> m.Entry:
+        event, start, content_type, size, tag, modified = row
+
+        return m.Entry(
+            event=UUID(event),
+            start=isoparse(start),
+            type=content_type,
+            size=size,
+            tag=tag,
+            modified=isoparse(modified),
+        )
+
+    async def open(self) -> None:
+        """Open the index."""
+        if not self.enabled:
+            return
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._config.threads, thread_name_prefix="index"
+        )
+
+        def create(connection: sqlite3.Connection) -> None:
+            with connection:
+                connection.execute(self.SCHEMA)
+
+        await self._run(create)
+
+    async def close(self) -> None:
+        """Close the index."""
+        if self._executor is None:
+            return
+
+        executor, self._executor = self._executor, None
+        self._ready = False
+
+        await asyncio.to_thread(executor.shutdown)
+
+        with self._lock:
+            connections, self._connections = self._connections, []
+
+        for connection in connections:
+            connection.close()
+
+    async def list(self, request: m.ListRequest) -> m.ListResponse:
+        """List entries of an event ordered by start."""
+        clauses = ["event = ?"]
+        parameters: list[Any] = [str(request.event)]
+
+        if request.after is not None:
+            clauses.append("start >= ?")
+            parameters.append(isostringify(request.after))
+
+        if request.before is not None:
+            clauses.append("start < ?")
+            parameters.append(isostringify(request.before))
+
+        if request.last is not None:
+            clauses.append("start < ?" if request.descending else "start > ?")
+            parameters.append(isostringify(request.last))
+
+        # Starts are stored as ISO 8601 strings, which sort like the times
+        query = (
+            f"SELECT {self.COLUMNS} FROM recordings"  # noqa: S608
+            f" WHERE {' AND '.join(clauses)}"
+            f" ORDER BY start {'DESC' if request.descending else 'ASC'}"
+        )
+
+        if request.limit is not None:
+            query += " LIMIT ?"
+            parameters.append(request.limit)
+
+        def select(connection: sqlite3.Connection) -> list[tuple[Any, ...]]:
+            return connection.execute(query, parameters).fetchall()
+
+        rows = await self._run(select)
+
+        return m.ListResponse(entries=[self._deserialize(row) for row in rows])
+
+    async def save(self, request: m.SaveRequest) -> m.SaveResponse:
+        """Save an entry."""
+        row = self._serialize(request.entry, time.time())
+
+        def upsert(connection: sqlite3.Connection) -> None:
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO recordings VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    row,
+                )
+
+        await self._run(upsert)
+
+        # A recording created again after it was deleted must not be pruned by a scan
+        self._deleted.discard((request.entry.event, request.entry.start))
+
+        return m.SaveResponse()
+
+    async def delete(self, request: m.DeleteRequest) -> m.DeleteResponse:
+        """Delete an entry."""
+        parameters = (str(request.event), isostringify(request.start))
+
+        def delete(connection: sqlite3.Connection) -> None:
+            with connection:
+                connection.execute(
+                    "DELETE FROM recordings WHERE event = ? AND start = ?", parameters
+                )
+
+        await self._run(delete)
+
+        # A scan in progress might have seen the entry before it was deleted
+        if not self._ready:
+            self._deleted.add((request.event, request.start))
+
+        return m.DeleteResponse()
+
+    async def replace(self, request: m.ReplaceRequest) -> m.ReplaceResponse:
+        """Replace all entries with the results of a scan and mark the index ready."""
+        since = request.since.timestamp()
+
+        def upsert(rows: list[tuple[Any, ...]]) -> Callable[[sqlite3.Connection], None]:
+            def run(connection: sqlite3.Connection) -> None:
+                with connection:
+                    # Entries saved after the scan started are newer than its results
+                    connection.executemany(
+                        "INSERT INTO recordings VALUES (?, ?, ?, ?, ?, ?, ?)"
+                        " ON CONFLICT (event, start) DO UPDATE SET"
+                        " type = excluded.type, size = excluded.size,"
+                        " tag = excluded.tag, modified = excluded.modified,"
+                        " updated = excluded.updated"
+                        " WHERE recordings.updated < excluded.updated",
+                        rows,
+                    )
+
+            return run
+
+        def prune(
+            deleted: list[tuple[str, str]],
+        ) -> Callable[[sqlite3.Connection], None]:
+            def run(connection: sqlite3.Connection) -> None:
+                with connection:
+                    connection.execute(
+                        "DELETE FROM recordings WHERE updated < ?", (since,)
+                    )
+                    connection.executemany(
+                        "DELETE FROM recordings WHERE event = ? AND start = ?", deleted
+                    )
+
+            return run
+
+        rows = list[tuple[Any, ...]]()
+
+        # Results are stored in batches as they come, so the scan is never held whole
+        async for entry in request.entries:
+            if (entry.event, entry.start) not in self._deleted:
+                rows.append(self._serialize(entry, since))
+
+            if len(rows) >= self.BATCH_SIZE:
+                await self._run(upsert(rows))
+                rows = []
+
+        await self._run(upsert(rows))
+
+        # Entries deleted during the scan might have been stored by an earlier batch
+        await self._run(
+            prune([(str(event), isostringify(start)) for event, start in self._deleted])
+        )
+        self._ready = True
+        self._deleted.clear()
+
+        return m.ReplaceResponse()
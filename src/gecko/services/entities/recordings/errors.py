@@ -54,3 +54,13 @@ class RecordingNotFoundError(NotFoundError):
         super().__init__(
             f"Recording not found for instance of live event {event_id} starting at {isostringify(start)}."
         )
+
+
+class RangeNotSatisfiableError(ServiceError):
+    """Raised when a requested range is outside of a recording."""
+
+    def __init__(self, event_id: UUID, start: datetime, size: int | None) -> None:
+        super().__init__(
+            f"Range not satisfiable for recording of live event {event_id} starting at {isostringify(start)}."
+        )
+        self.size = size
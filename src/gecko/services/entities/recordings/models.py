@@ -5,6 +5,7 @@ from uuid import UUID
 
 from gecko.models.base import datamodel
 from gecko.utils.mime import MimeType
+from gecko.utils.ranges import ByteRange, ContentRange
 
 
 class ListOrder(StrEnum):
@@ -14,6 +15,14 @@ class ListOrder(StrEnum):
     DESCENDING = "desc"
 
 
+class ListCount(StrEnum):
+    """Way to count recordings matching a listing."""
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
 @datamodel
 class Recording:
     """Recording data."""
@@ -52,10 +61,33 @@ class DownloadContent:
     modified: datetime
     """Date and time when the content was last modified."""
 
+    range: ContentRange | None
+    """Range of the content within the recording, if only a part was requested."""
+
     data: AsyncGenerator[bytes]
     """Asynchronous generator of data bytes."""
 
 
+@datamodel
+class ListCursor:
+    """Position in a listing of recordings to continue from."""
+
+    event: UUID
+    """Identifier of the listed event."""
+
+    start: datetime
+    """Start datetime of the last listed recording (in event timezone)."""
+
+    after: datetime | None
+    """Only list recordings after this datetime (in event timezone)."""
+
+    before: datetime | None
+    """Only list recordings before this datetime (in event timezone)."""
+
+    order: ListOrder
+    """Order of the listing."""
+
+
 @datamodel
 class ListRequest:
     """Request to list recordings."""
@@ -78,13 +110,19 @@ class ListRequest:
     order: ListOrder | None
     """Order to apply to the results."""
 
+    count: ListCount
+    """Way to count recordings that match the request."""
+
+    cursor: ListCursor | None
+    """Position to continue from, which overrides after, before and order."""
+
 
 @datamodel
 class ListResponse:
     """Response for listing recordings."""
 
-    count: int
-    """Total number of recordings that match the request."""
+    count: int | None
+    """Total number of recordings that match the request, if counted."""
 
     limit: int | None
     """Maximum number of returned recordings."""
@@ -95,6 +133,9 @@ class ListResponse:
     recordings: Sequence[Recording]
     """List of recordings."""
 
+    next: ListCursor | None
+    """Position to continue from to get the next page, if there may be one."""
+
 
 @datamodel
 class DownloadRequest:
@@ -106,6 +147,12 @@ class DownloadRequest:
     start: datetime
     """Start datetime of the event instance in event timezone."""
 
+    range: ByteRange | None = None
+    """Range of bytes to download or None to download the whole recording."""
+
+    ifrange: str | datetime | None = None
+    """ETag or modification datetime the recording must have to download the range."""
+
 
 @datamodel
 class DownloadResponse:
@@ -1,34 +1,54 @@
 import asyncio
-from collections.abc import Generator, Sequence
-from contextlib import contextmanager
+import logging
+from array import array
+from collections.abc import AsyncGenerator, AsyncIterator, Generator, Sequence
+from contextlib import aclosing, contextmanager, suppress
 from datetime import UTC, datetime, timedelta
+from itertools import filterfalse
 from uuid import UUID
 
+from gecko.config.models import RecordingsConfig
 from gecko.services.apis.beaver import errors as be
 from gecko.services.apis.beaver import models as bm
 from gecko.services.apis.beaver.service import BeaverService
 from gecko.services.data.emerald import errors as ee
 from gecko.services.data.emerald import models as em
 from gecko.services.data.emerald.service import EmeraldService
+from gecko.services.data.index import errors as ie
+from gecko.services.data.index import models as im
+from gecko.services.data.index.service import IndexService
 from gecko.services.entities.recordings import errors as e
 from gecko.services.entities.recordings import models as m
 from gecko.services.entities.recordings.utils import ContentTypeChecker
 from gecko.utils.mime import MimeType, MimeTypeValidationError
-from gecko.utils.time import isoparse, isostringify
+from gecko.utils.time import isoparse, isostringify, microparse, microstamp
+
+logger = logging.getLogger(__name__)
 
 
 class RecordingsService:
     """Service to manage recordings."""
 
-    def __init__(self, beaver: BeaverService, emerald: EmeraldService) -> None:
+    LIST_BATCH_SIZE = 10
+    LIST_PAGE_SIZE = 1000
+
+    def __init__(
+        self,
+        config: RecordingsConfig,
+        beaver: BeaverService,
+        emerald: EmeraldService,
+        index: IndexService,
+    ) -> None:
+        self._config = config
         self._beaver = beaver
         self._emerald = emerald
+        self._index = index
 
     @contextmanager
     def _handle_errors(self) -> Generator[None]:
         try:
             yield
-        except (be.ServiceError, ee.ServiceError) as ex:
+        except (be.ServiceError, ee.ServiceError, ie.ServiceError) as ex:
             raise e.ServiceError from ex
 
     @contextmanager
@@ -49,25 +69,25 @@ class RecordingsService:
 
         return events_get_response.event
 
-    async def _get_event_instances(
+    async def _get_event_instance_starts(
         self, event: bm.Event, after: datetime, before: datetime
-    ) -> Sequence[bm.Instance]:
+    ) -> Sequence[datetime]:
         utcafter = after.replace(tzinfo=event.timezone).astimezone(UTC)
         utcbefore = before.replace(tzinfo=event.timezone).astimezone(UTC)
 
-        instances_list_request = bm.InstancesListRequest(
+        # Only the starts are needed, so the event is not included
+        instances_starts_request = bm.InstancesStartsRequest(
             start=utcafter,
             end=utcbefore,
             where={"event": {"is": {"id": event.id}}},
-            include={"event": True},
         )
 
         with self._handle_errors():
-            instances_list_response = await self._beaver.instances.list(
-                instances_list_request
+            instances_starts_response = await self._beaver.instances.starts(
+                instances_starts_request
             )
 
-        return instances_list_response.results.instances
+        return instances_starts_response.starts
 
     async def _get_instance(self, event: UUID, start: datetime) -> bm.Instance | None:
         instances_get_request = bm.InstancesGetRequest(
@@ -84,8 +104,10 @@ class RecordingsService:
 
         return instances_get_response.instance
 
-    async def _get_object(self, name: str) -> em.ObjectDetails | None:
-        get_request = em.GetRequest(name=name)
+    async def _get_object(
+        self, name: str, *, limited: bool = False
+    ) -> em.ObjectDetails | None:
+        get_request = em.GetRequest(name=name, limited=limited)
 
         with self._handle_errors():
             try:
@@ -137,138 +159,416 @@ class RecordingsService:
 
         return parsed if ContentTypeChecker().check(parsed) else None
 
-    async def _list_get_objects(self, prefix: str) -> Sequence[em.ObjectListing]:
-        list_request = em.ListRequest(prefix=prefix, recursive=False)
+    def _index_make_entry(
+        self, event: UUID, start: datetime, details: em.ObjectDetails | None
+    ) -> im.Entry | None:
+        if details is None or not self._parse_content_type(details.type):
+            return None
+
+        return im.Entry(
+            event=event,
+            start=start,
+            type=details.type,
+            size=details.size,
+            tag=details.tag,
+            modified=details.modified,
+        )
+
+    async def _index_save(self, event: UUID, start: datetime) -> None:
+        details = await self._get_object(self._make_key(event, start))
+        entry = self._index_make_entry(event, start, details)
+
+        if entry is None:
+            return
+
+        save_request = im.SaveRequest(entry=entry)
+
+        with self._handle_errors():
+            await self._index.save(save_request)
+
+    @contextmanager
+    def _index_handle_errors(self, event: UUID, start: datetime) -> Generator[None]:
+        # The change is already stored, so a failure only makes the index out of date
+        try:
+            yield
+        except e.ServiceError:
+            logger.warning(
+                "Failed to update index for recording %s/%s",
+                event,
+                isostringify(start),
+                exc_info=True,
+            )
+            self._index.invalidate()
+
+    async def _list_get_objects(
+        self,
+        event: UUID,
+        after: datetime | None,
+        before: datetime | None,
+        last: datetime | None,
+    ) -> AsyncGenerator[em.ObjectListing]:
+        # Keys sort like the times in their names, so the scan is bounded by keys
+        # Starting after a proper prefix of the first key includes the key itself
+        prefix = self._make_prefix(event)
+        start_after = (
+            self._make_key(event, last)
+            if last is not None
+            else self._make_key(event, after)[:-1]
+            if after is not None
+            else None
+        )
+        stop = self._make_key(event, before) if before is not None else None
+
+        list_request = em.ListRequest(
+            prefix=prefix,
+            recursive=False,
+            start_after=start_after,
+            stop=stop,
+            details=True,
+        )
 
         with self._handle_errors():
             list_response = await self._emerald.list(list_request)
-            return [obj async for obj in list_response.objects]
-
-    def _list_map_objects(
-        self, objects: Sequence[em.ObjectListing]
-    ) -> Sequence[m.Recording]:
-        return [
-            m.Recording(event=event, start=start)
-            for obj in objects
-            if (parsed := self._parse_key(obj.name))
-            for event, start in [parsed]
-        ]
 
-    def _list_filter_recordings_by_time(
+        # Objects are listed page by page, so stopping early saves requests
+        async with aclosing(list_response.objects) as objects:
+            with self._handle_errors():
+                async for obj in objects:
+                    yield obj
+
+    async def _list_get_starts(
         self,
-        recordings: Sequence[m.Recording],
+        event: UUID,
         after: datetime | None,
         before: datetime | None,
-    ) -> Sequence[m.Recording]:
-        return [
-            recording
-            for recording in recordings
-            if (after is None or recording.start >= after)
-            and (before is None or recording.start < before)
+        last: datetime | None,
+        unchecked: set[int],
+    ) -> AsyncGenerator[int]:
+        objects = self._list_get_objects(event, after, before, last)
+        bounds = [
+            *([microstamp(after)] if after is not None else []),
+            *([microstamp(last) + 1] if last is not None else []),
         ]
+        lower = max(bounds, default=None)
+        upper = microstamp(before) if before is not None else None
+
+        async with aclosing(objects):
+            async for obj in objects:
+                parsed = self._parse_key(obj.name)
+
+                # Starts are in event timezone, so keys with an offset never match
+                if parsed is None or parsed[1].tzinfo is not None:
+                    continue
 
-    async def _list_filter_recordings_by_instance(
-        self, recordings: Sequence[m.Recording], event: bm.Event
-    ) -> Sequence[m.Recording]:
-        after = min(recording.start for recording in recordings)
-        after = after.replace(hour=0, minute=0, second=0, microsecond=0)
+                start = microstamp(parsed[1])
 
-        before = max(recording.start for recording in recordings)
-        before = before.replace(hour=0, minute=0, second=0, microsecond=0)
-        before = before + timedelta(days=1)
+                if (lower is not None and start < lower) or (
+                    upper is not None and start >= upper
+                ):
+                    continue
 
-        instances = await self._get_event_instances(event, after, before)
-        starts = {instance.start for instance in instances}
+                # Without details in the listing, the content type is checked later
+                if obj.details is None:
+                    unchecked.add(start)
+                elif not self._parse_content_type(obj.details.type):
+                    continue
 
-        return [recording for recording in recordings if recording.start in starts]
+                yield start
 
-    async def _list_filter_recordings_by_content_type(
-        self, recordings: Sequence[m.Recording]
-    ) -> Sequence[m.Recording]:
-        semaphore = asyncio.Semaphore(10)
+    async def _list_get_window_starts(
+        self, event: bm.Event, window: int, size: int
+    ) -> set[int]:
+        after = microparse(window * size)
+        before = microparse((window + 1) * size)
 
-        async def get(recording: m.Recording) -> em.ObjectDetails | None:
-            key = self._make_key(recording.event, recording.start)
+        starts = await self._get_event_instance_starts(event, after, before)
 
+        return {microstamp(start) for start in starts}
+
+    async def _list_filter_starts_by_instance(
+        self, starts: array[int], event: bm.Event
+    ) -> array[int]:
+        # Windows are aligned to whole days from the epoch, so the same windows are
+        # requested every time and past ones can be answered from the beaver cache
+        days = timedelta(days=self._config.windows.days)
+        size = days // timedelta(microseconds=1)
+        windows = sorted({start // size for start in starts})
+        semaphore = asyncio.Semaphore(self._config.windows.concurrency)
+
+        async def get(window: int) -> set[int]:
             async with semaphore:
-                return await self._get_object(key)
+                return await self._list_get_window_starts(event, window, size)
 
-        details = await asyncio.gather(*[get(recording) for recording in recordings])
+        matching = set[int]().union(*await asyncio.gather(*map(get, windows)))
 
-        return [
-            recording
-            for recording, detail in zip(recordings, details, strict=False)
-            if detail and self._parse_content_type(detail.type)
-        ]
+        return array("q", filter(matching.__contains__, starts))
+
+    async def _list_reject_starts_by_content_type(
+        self, starts: array[int], event: UUID, unchecked: set[int]
+    ) -> set[int]:
+        pending = [start for start in starts if start in unchecked]
+
+        if not pending:
+            return set()
+
+        # Concurrency is bounded by the limiter shared by all listings
+        details = await asyncio.gather(
+            *[
+                self._get_object(self._make_key(event, microparse(start)), limited=True)
+                for start in pending
+            ]
+        )
+
+        return {
+            start
+            for start, detail in zip(pending, details, strict=False)
+            if not detail or not self._parse_content_type(detail.type)
+        }
+
+    async def _list_filter_starts(
+        self, starts: array[int], event: bm.Event, unchecked: set[int]
+    ) -> array[int]:
+        if not starts:
+            return starts
+
+        # Stats don't depend on instances, so they are made while instances load
+        rejected = asyncio.create_task(
+            self._list_reject_starts_by_content_type(starts, event.id, unchecked)
+        )
+
+        try:
+            starts = await self._list_filter_starts_by_instance(starts, event)
+
+            if not starts:
+                return starts
+
+            return array("q", filterfalse((await rejected).__contains__, starts))
+        finally:
+            rejected.cancel()
+            await asyncio.gather(rejected, return_exceptions=True)
+
+    async def _list_take(
+        self, starts: AsyncIterator[int], size: int | None
+    ) -> array[int]:
+        batch = array("q")
+
+        async for start in starts:
+            batch.append(start)
+
+            if size is not None and len(batch) >= size:
+                break
+
+        return batch
 
-    async def _list_filter_recordings(
+    async def _list_iterate(
+        self, starts: array[int], rest: AsyncIterator[int] | None = None
+    ) -> AsyncGenerator[int]:
+        for start in starts:
+            yield start
+
+        if rest is not None:
+            async for start in rest:
+                yield start
+
+    async def _list_confirm_starts(
         self,
-        recordings: Sequence[m.Recording],
+        starts: AsyncIterator[int],
         event: bm.Event,
-        after: datetime | None,
-        before: datetime | None,
-    ) -> Sequence[m.Recording]:
-        recordings = self._list_filter_recordings_by_time(recordings, after, before)
+        needed: int | None,
+        unchecked: set[int],
+    ) -> array[int]:
+        confirmed = array("q")
+
+        # Candidates are checked in batches until enough of them are confirmed
+        while needed is None or len(confirmed) < needed:
+            size = (
+                None
+                if needed is None
+                else max(needed - len(confirmed), self.LIST_BATCH_SIZE)
+            )
+            batch = await self._list_take(starts, size)
 
-        if not recordings:
-            return []
+            if not batch:
+                break
 
-        recordings = await self._list_filter_recordings_by_instance(recordings, event)
+            confirmed.extend(await self._list_filter_starts(batch, event, unchecked))
 
-        if not recordings:
-            return []
+        return confirmed
 
-        return await self._list_filter_recordings_by_content_type(recordings)
+    async def _list_get_indexed_starts(
+        self,
+        event: UUID,
+        after: datetime | None,
+        before: datetime | None,
+        last: datetime | None,
+        order: m.ListOrder,
+    ) -> AsyncGenerator[int]:
+        while True:
+            list_request = im.ListRequest(
+                event=event,
+                after=after,
+                before=before,
+                last=last,
+                descending=order == m.ListOrder.DESCENDING,
+                limit=self.LIST_PAGE_SIZE,
+            )
 
-    def _list_sort_recordings(
-        self, recordings: Sequence[m.Recording], order: m.ListOrder | None
-    ) -> Sequence[m.Recording]:
-        if order is None:
-            return recordings
+            with self._handle_errors():
+                list_response = await self._index.list(list_request)
 
-        return sorted(
-            recordings,
-            key=lambda recording: recording.start,
-            reverse=order == m.ListOrder.DESCENDING,
-        )
+            for entry in list_response.entries:
+                if entry.start.tzinfo is None:
+                    yield microstamp(entry.start)
+
+            if len(list_response.entries) < self.LIST_PAGE_SIZE:
+                return
+
+            last = list_response.entries[-1].start
 
-    def _list_pick_recordings(
+    async def _list_get_candidates(  # noqa: PLR0913
         self,
-        recordings: Sequence[m.Recording],
-        limit: int | None,
-        offset: int | None,
-    ) -> Sequence[m.Recording]:
+        event: UUID,
+        after: datetime | None,
+        before: datetime | None,
+        last: datetime | None,
+        order: m.ListOrder,
+        unchecked: set[int],
+        *,
+        indexed: bool,
+    ) -> AsyncGenerator[int]:
+        # Only recordings with a supported content type are indexed
+        if indexed:
+            starts = self._list_get_indexed_starts(event, after, before, last, order)
+        else:
+            starts = self._list_get_starts(event, after, before, last, unchecked)
+
+        async with aclosing(starts):
+            # Keys are only listed in ascending order, so all are needed to reverse
+            if not indexed and order == m.ListOrder.DESCENDING:
+                for start in reversed(await self._list_take(starts, None)):
+                    yield start
+            else:
+                async for start in starts:
+                    yield start
+
+    def _list_pick_starts(
+        self, starts: array[int], limit: int | None, offset: int | None
+    ) -> memoryview:
+        # Slices of a memory view share the packed starts instead of copying them
+        view = memoryview(starts)
+
         if offset is not None:
-            recordings = recordings[offset:]
+            view = view[offset:]
 
         if limit is not None:
-            recordings = recordings[:limit]
+            view = view[:limit]
 
-        return recordings
+        return view
 
-    async def list(self, request: m.ListRequest) -> m.ListResponse:
-        """List recordings."""
-        event = await self._get_event(request.event)
+    def _list_resume(
+        self, request: m.ListRequest
+    ) -> tuple[datetime | None, datetime | None, datetime | None, m.ListOrder]:
+        cursor = request.cursor
+
+        if cursor is None:
+            return (
+                None,
+                request.after,
+                request.before,
+                request.order or m.ListOrder.ASCENDING,
+            )
+
+        # Ascending pages continue after the last recording, descending before it
+        if cursor.order == m.ListOrder.DESCENDING:
+            return None, cursor.after, cursor.start, cursor.order
+
+        return cursor.start, cursor.after, cursor.before, cursor.order
+
+    async def _list_get_event(self, event: UUID) -> bm.Event:
+        found = await self._get_event(event)
+
+        if not found:
+            raise e.EventNotFoundError(event)
+
+        if found.type != bm.EventType.live:
+            raise e.BadEventTypeError(found.type)
+
+        return found
+
+    async def _list_start(
+        self, event: UUID, candidates: AsyncIterator[int], size: int | None
+    ) -> tuple[bm.Event, array[int]]:
+        # The listing doesn't need the event, so it runs while the event loads
+        first = asyncio.create_task(self._list_take(candidates, size))
 
-        if not event:
-            raise e.EventNotFoundError(request.event)
+        try:
+            found = await self._list_get_event(event)
+            return found, await first
+        finally:
+            first.cancel()
+            await asyncio.gather(first, return_exceptions=True)
 
-        if event.type != bm.EventType.live:
-            raise e.BadEventTypeError(event.type)
+    async def list(self, request: m.ListRequest) -> m.ListResponse:
+        """List recordings."""
+        last, after, before, order = self._list_resume(request)
+        indexed = self._index.ready
+        unchecked = set[int]()
 
-        prefix = self._make_prefix(event.id)
+        count: int | None = None
+        needed = (
+            (request.offset or 0) + request.limit if request.limit is not None else None
+        )
 
-        objects = await self._list_get_objects(prefix)
-        recordings = self._list_map_objects(objects)
-        recordings = await self._list_filter_recordings(
-            recordings, event, request.after, request.before
+        # Without a count, the first batch is the one that confirming takes first
+        size = (
+            None
+            if request.count != m.ListCount.NONE or needed is None
+            else max(needed, self.LIST_BATCH_SIZE)
         )
-        recordings = self._list_sort_recordings(recordings, request.order)
 
-        count = len(recordings)
+        async with aclosing(
+            self._list_get_candidates(
+                request.event, after, before, last, order, unchecked, indexed=indexed
+            )
+        ) as candidates:
+            event, starts = await self._list_start(request.event, candidates, size)
+
+            if request.count == m.ListCount.EXACT:
+                starts = await self._list_filter_starts(starts, event, unchecked)
+                count = len(starts)
+            elif request.count == m.ListCount.ESTIMATED:
+                count = len(starts)
+                starts = await self._list_confirm_starts(
+                    self._list_iterate(starts), event, needed, unchecked
+                )
+            else:
+                async with aclosing(self._list_iterate(starts, candidates)) as rest:
+                    starts = await self._list_confirm_starts(
+                        rest, event, needed, unchecked
+                    )
+
+        if request.count == m.ListCount.EXACT:
+            more = needed is not None and len(starts) > needed
+        else:
+            # Without an exact count, a full page means there may be more recordings
+            more = needed is not None and len(starts) >= needed
+
+        # Only the recordings on the page are unpacked
+        recordings = [
+            m.Recording(event=event.id, start=microparse(start))
+            for start in self._list_pick_starts(starts, request.limit, request.offset)
+        ]
 
-        recordings = self._list_pick_recordings(
-            recordings, request.limit, request.offset
+        cursor = (
+            m.ListCursor(
+                event=event.id,
+                start=recordings[-1].start,
+                after=after,
+                before=before,
+                order=order,
+            )
+            if more and recordings
+            else None
         )
 
         return m.ListResponse(
@@ -276,8 +576,81 @@ class RecordingsService:
             limit=request.limit,
             offset=request.offset,
             recordings=recordings,
+            next=cursor,
         )
 
+    async def _download_get_details(
+        self, key: str, event: UUID, start: datetime
+    ) -> em.ObjectDetails:
+        details = await self._get_object(key)
+
+        if details is None:
+            raise e.RecordingNotFoundError(event, start)
+
+        return details
+
+    def _download_check_ifrange(
+        self, ifrange: str | datetime, details: em.ObjectDetails
+    ) -> bool:
+        if isinstance(ifrange, datetime):
+            return ifrange == details.modified
+
+        return ifrange == details.tag
+
+    async def _download_resolve_range(
+        self,
+        key: str,
+        event: UUID,
+        start: datetime,
+        request: m.DownloadRequest,
+    ) -> tuple[int, int | None]:
+        byterange = request.range
+
+        if byterange is None:
+            return 0, None
+
+        details = None
+
+        # If-Range is checked before opening the data, so it is only opened once
+        if request.ifrange is not None:
+            details = await self._download_get_details(key, event, start)
+
+            if not self._download_check_ifrange(request.ifrange, details):
+                return 0, None
+
+        if byterange.start is not None:
+            if byterange.end is None:
+                return byterange.start, None
+
+            return byterange.start, byterange.end - byterange.start + 1
+
+        # Suffix ranges need the size of the object to compute the offset
+        if details is None:
+            details = await self._download_get_details(key, event, start)
+
+        resolved = byterange.resolve(details.size)
+
+        if resolved is None:
+            raise e.RangeNotSatisfiableError(event, start, details.size)
+
+        return resolved
+
+    async def _download_open(
+        self, key: str, event: UUID, start: datetime, offset: int, length: int | None
+    ) -> em.DownloadResponse:
+        download_request = em.DownloadRequest(name=key, offset=offset, length=length)
+
+        with (
+            self._handle_errors(),
+            self._handle_not_found(event, start),
+            suppress(ee.InvalidRangeError),
+        ):
+            return await self._emerald.download(download_request)
+
+        # The size is reported, so the client can correct the range
+        details = await self._download_get_details(key, event, start)
+        raise e.RangeNotSatisfiableError(event, start, details.size)
+
     async def download(self, request: m.DownloadRequest) -> m.DownloadResponse:
         """Download a recording."""
         instance = await self._get_instance(request.event, request.start)
@@ -293,13 +666,13 @@ class RecordingsService:
 
         key = self._make_key(instance.event.id, instance.start)
 
-        download_request = em.DownloadRequest(name=key)
+        offset, length = await self._download_resolve_range(
+            key, instance.event.id, instance.start, request
+        )
 
-        with (
-            self._handle_errors(),
-            self._handle_not_found(instance.event.id, instance.start),
-        ):
-            download_response = await self._emerald.download(download_request)
+        download_response = await self._download_open(
+            key, instance.event.id, instance.start, offset, length
+        )
 
         try:
             content_type = self._parse_content_type(download_response.content.type)
@@ -313,6 +686,7 @@ class RecordingsService:
                     size=download_response.content.size,
                     tag=download_response.content.tag,
                     modified=download_response.content.modified,
+                    range=download_response.content.range,
                     data=download_response.content.data,
                 )
             )
@@ -348,6 +722,10 @@ class RecordingsService:
         with self._handle_errors():
             await self._emerald.upload(upload_request)
 
+        if self._index.enabled:
+            with self._index_handle_errors(instance.event.id, instance.start):
+                await self._index_save(instance.event.id, instance.start)
+
         return m.UploadResponse()
 
     async def delete(self, request: m.DeleteRequest) -> m.DeleteResponse:
@@ -384,4 +762,116 @@ class RecordingsService:
         ):
             await self._emerald.delete(delete_request)
 
+        if self._index.enabled:
+            index_delete_request = im.DeleteRequest(
+                event=instance.event.id, start=instance.start
+            )
+
+            with (
+                self._index_handle_errors(instance.event.id, instance.start),
+                self._handle_errors(),
+            ):
+                await self._index.delete(index_delete_request)
+
         return m.DeleteResponse()
+
+    async def _reindex_get_entries(self) -> AsyncGenerator[im.Entry]:
+        list_request = em.ListRequest(recursive=True, details=True)
+
+        with self._handle_errors():
+            list_response = await self._emerald.list(list_request)
+
+        async def get(
+            event: UUID, start: datetime, details: em.ObjectDetails | None
+        ) -> im.Entry | None:
+            # Objects are only checked one by one when the listing lacks details
+            if details is None:
+                details = await self._get_object(
+                    self._make_key(event, start), limited=True
+                )
+
+            return self._index_make_entry(event, start, details)
+
+        async with aclosing(list_response.objects) as objects:
+            while True:
+                page = list[em.ObjectListing]()
+
+                # The bucket is scanned page by page, so memory and stats stay bounded
+                with self._handle_errors():
+                    async for obj in objects:
+                        page.append(obj)
+
+                        if len(page) >= self.LIST_PAGE_SIZE:
+                            break
+
+                entries = await asyncio.gather(
+                    *[
+                        get(event, start, obj.details)
+                        for obj in page
+                        if (parsed := self._parse_key(obj.name))
+                        for event, start in [parsed]
+                    ]
+                )
+
+                for entry in entries:
+                    if entry is not None:
+                        yield entry
+
+                if len(page) < self.LIST_PAGE_SIZE:
+                    return
+
+    async def reindex(self) -> None:
+        """Rebuild the index of recordings from the emerald database."""
+        since = datetime.now(UTC)
+
+        async with aclosing(self._reindex_get_entries()) as entries:
+            replace_request = im.ReplaceRequest(entries=entries, since=since)
+
+            with self._handle_errors():
+                await self._index.replace(replace_request)
+
+    async def _watch_apply(self, event: em.ObjectEvent) -> None:
+        parsed = self._parse_key(event.name)
+
+        if parsed is None:
+            return
+
+        recording, start = parsed
+
+        match event.type:
+            case em.ObjectEventType.CREATED:
+                await self._index_save(recording, start)
+            case em.ObjectEventType.REMOVED:
+                index_delete_request = im.DeleteRequest(event=recording, start=start)
+
+                with self._handle_errors():
+                    await self._index.delete(index_delete_request)
+
+    async def _watch_once(self) -> None:
+        listen_request = em.ListenRequest()
+
+        with self._handle_errors():
+            listen_response = await self._emerald.listen(listen_request)
+
+        async with aclosing(listen_response.events) as events:
+            # Listening starts before the scan, so no change is missed in between
+            await self.reindex()
+
+            with self._handle_errors():
+                async for event in events:
+                    await self._watch_apply(event)
+
+    async def watch(self, retry: float) -> None:
+        """Keep the index current with changes notified by the emerald database."""
+        while True:
+            try:
+                await self._watch_once()
+            except e.ServiceError:
+                logger.warning("Lost notifications of changes", exc_info=True)
+            except Exception:
+                # Unexpected failures must not stop the index from being kept current
+                logger.exception("Failed to apply notifications of changes")
+
+            # Changes might be missed until the index is scanned again
+            self._index.invalidate(rescan=False)
+            await asyncio.sleep(retry)
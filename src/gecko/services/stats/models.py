@@ -0,0 +1,148 @@
+from gecko.models.base import datamodel
+
+
+@datamodel
+class PoolStats:
+    """Connection pool statistics."""
+
+    size: int
+    """Maximum number of connections."""
+
+    inuse: int
+    """Number of connections in use."""
+
+    idle: int
+    """Number of idle connections kept open."""
+
+    waited: int
+    """Number of requests that had to wait for a free connection."""
+
+
+@datamodel
+class ExecutorStats:
+    """Worker threads statistics."""
+
+    size: int
+    """Maximum number of threads."""
+
+    active: int
+    """Number of threads running a task."""
+
+    queued: int
+    """Number of tasks waiting for a free thread."""
+
+    tasks: int
+    """Number of tasks started so far."""
+
+    wait: float
+    """Total time in seconds that started tasks spent waiting for a free thread."""
+
+
+@datamodel
+class LimiterStats:
+    """Adaptive concurrency limiter statistics."""
+
+    limit: float
+    """Current limit of concurrent requests."""
+
+    active: int
+    """Number of requests running."""
+
+    queued: int
+    """Number of requests waiting for a free slot."""
+
+    tasks: int
+    """Number of requests started so far."""
+
+    wait: float
+    """Total time in seconds that requests spent waiting for a free slot."""
+
+    decreases: int
+    """Number of times the limit was decreased after slow or failed requests."""
+
+
+@datamodel
+class EmeraldStats:
+    """Statistics of the emerald database."""
+
+    pool: PoolStats
+    """Statistics of the connection pool."""
+
+    executors: dict[str, ExecutorStats]
+    """Statistics of the worker threads by purpose."""
+
+    limiter: LimiterStats | None
+    """Statistics of the metadata requests limiter, if there is one."""
+
+
+@datamodel
+class CacheStats:
+    """Cache of responses statistics."""
+
+    entries: int
+    """Number of cached responses."""
+
+    size: int
+    """Total size of cached responses in bytes."""
+
+    hits: int
+    """Number of requests answered from the cache."""
+
+    misses: int
+    """Number of requests not answered from the cache."""
+
+    evictions: int
+    """Number of responses evicted to make room for others."""
+
+    revalidations: int
+    """Number of expired responses confirmed as unchanged."""
+
+
+@datamodel
+class ResilienceStats:
+    """Resilience of requests statistics."""
+
+    breaker: str
+    """State of the circuit breaker."""
+
+    rejected: int
+    """Number of requests rejected while the circuit was open."""
+
+    retries: int
+    """Number of retried requests."""
+
+    hedges: int
+    """Number of hedged requests sent after a slow response."""
+
+    budget: float
+    """Number of retries and hedges currently allowed by the budget."""
+
+
+@datamodel
+class BeaverStats:
+    """Statistics of the beaver service."""
+
+    coalesced: int
+    """Number of requests that joined an identical request in flight."""
+
+    cache: CacheStats
+    """Statistics of the cache of responses."""
+
+    resilience: ResilienceStats
+    """Statistics of the resilience of requests."""
+
+
+@datamodel
+class GetRequest:
+    """Request to get statistics."""
+
+
+@datamodel
+class GetResponse:
+    """Response for getting statistics."""
+
+    beaver: BeaverStats
+    """Statistics of the beaver service."""
+
+    emerald: EmeraldStats
+    """Statistics of the emerald database."""
@@ -0,0 +1,97 @@
+from collections.abc import Generator
+from contextlib import contextmanager
+
+from gecko.services.apis.beaver import errors as be
+from gecko.services.apis.beaver import models as bm
+from gecko.services.apis.beaver.service import BeaverService
+from gecko.services.data.emerald import errors as ee
+from gecko.services.data.emerald import models as em
+from gecko.services.data.emerald.service import EmeraldService
+from gecko.services.stats import errors as e
+from gecko.services.stats import models as m
+
+
+class StatsService:
+    """Service for runtime statistics."""
+
+    def __init__(self, beaver: BeaverService, emerald: EmeraldService) -> None:
+        self._beaver = beaver
+        self._emerald = emerald
+
+    @contextmanager
+    def _handle_errors(self) -> Generator[None]:
+        try:
+            yield
+        except (be.ServiceError, ee.ServiceError) as ex:
+            raise e.ServiceError from ex
+
+    async def _get_beaver(self) -> m.BeaverStats:
+        stats_request = bm.StatsRequest()
+
+        with self._handle_errors():
+            stats_response = await self._beaver.stats(stats_request)
+
+        return m.BeaverStats(
+            coalesced=stats_response.coalesced,
+            cache=m.CacheStats(
+                entries=stats_response.cache.entries,
+                size=stats_response.cache.size,
+                hits=stats_response.cache.hits,
+                misses=stats_response.cache.misses,
+                evictions=stats_response.cache.evictions,
+                revalidations=stats_response.cache.revalidations,
+            ),
+            resilience=m.ResilienceStats(
+                breaker=stats_response.resilience.breaker,
+                rejected=stats_response.resilience.rejected,
+                retries=stats_response.resilience.retries,
+                hedges=stats_response.resilience.hedges,
+                budget=stats_response.resilience.budget,
+            ),
+        )
+
+    def _map_limiter(self, stats: em.LimiterStats | None) -> m.LimiterStats | None:
+        if stats is None:
+            return None
+
+        return m.LimiterStats(
+            limit=stats.limit,
+            active=stats.active,
+            queued=stats.queued,
+            tasks=stats.tasks,
+            wait=stats.wait,
+            decreases=stats.decreases,
+        )
+
+    async def _get_emerald(self) -> m.EmeraldStats:
+        stats_request = em.StatsRequest()
+
+        with self._handle_errors():
+            stats_response = await self._emerald.stats(stats_request)
+
+        return m.EmeraldStats(
+            pool=m.PoolStats(
+                size=stats_response.pool.size,
+                inuse=stats_response.pool.inuse,
+                idle=stats_response.pool.idle,
+                waited=stats_response.pool.waited,
+            ),
+            executors={
+                name: m.ExecutorStats(
+                    size=executor.size,
+                    active=executor.active,
+                    queued=executor.queued,
+                    tasks=executor.tasks,
+                    wait=executor.wait,
+                )
+                for name, executor in stats_response.executors.items()
+            },
+            limiter=self._map_limiter(stats_response.limiter),
+        )
+
+    async def get(self, request: m.GetRequest) -> m.GetResponse:
+        """Get statistics."""
+        beaver = await self._get_beaver()
+        emerald = await self._get_emerald()
+
+        return m.GetResponse(beaver=beaver, emerald=emerald)
@@ -3,6 +3,7 @@ from litestar.datastructures import State as LitestarState
 from gecko.config.models import Config
 from gecko.services.apis.beaver.service import BeaverService
 from gecko.services.data.emerald.service import EmeraldService
+from gecko.services.data.index.service import IndexService
 
 
 class State(LitestarState):
@@ -16,3 +17,6 @@ class State(LitestarState):
 
     emerald: EmeraldService
     """Service for emerald database."""
+
+    index: IndexService
+    """Service for the local index of recordings."""
@@ -1,32 +1,128 @@
 import asyncio
+import threading
+import weakref
+from collections import deque
 from collections.abc import AsyncGenerator as BaseAsyncGenerator
 from collections.abc import Generator as BaseGenerator
+from concurrent.futures import Executor
 from types import TracebackType
 from typing import Any, overload, override
 
 
-class Generator[YieldType, SendType](BaseAsyncGenerator[YieldType, SendType]):
-    """Async generator that wraps a synchronous generator."""
+class _Sentinel:
+    pass
 
-    def __init__(self, generator: BaseGenerator[YieldType, SendType]) -> None:
+
+class _Failure:
+    def __init__(self, exception: BaseException) -> None:
+        self.exception = exception
+
+
+class _Producer[YieldType]:
+    """Part of a prefetching generator that is used by the worker thread.
+
+    The thread doesn't reference the generator, so it can be collected when abandoned.
+    """
+
+    def __init__(self, generator: BaseGenerator[YieldType], readahead: int) -> None:
+        self.generator = generator
+        self.queue: asyncio.Queue[YieldType | _Sentinel | _Failure] = asyncio.Queue()
+        self.slots = threading.Semaphore(readahead)
+        self.stopped = threading.Event()
+        self.started = False
+
+    def run(self, loop: asyncio.AbstractEventLoop) -> None:
+        def put(item: YieldType | _Sentinel | _Failure) -> None:
+            loop.call_soon_threadsafe(self.queue.put_nowait, item)
+
+        try:
+            while True:
+                # Blocks when the consumer is readahead items behind
+                self.slots.acquire()
+
+                if self.stopped.is_set():
+                    return
+
+                try:
+                    item = next(self.generator)
+                except StopIteration:
+                    put(_Sentinel())
+                    return
+                except BaseException as ex:
+                    put(_Failure(ex))
+                    return
+
+                put(item)
+        finally:
+            self.generator.close()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.slots.release()
+
+    def abandon(self) -> None:
+        # Without a running worker nothing else would close the generator
+        if not self.started:
+            self.generator.close()
+
+        self.stop()
+
+
+class PrefetchingGenerator[YieldType](BaseAsyncGenerator[YieldType]):
+    """Async generator that reads ahead from a synchronous generator in a worker thread."""
+
+    def __init__(
+        self,
+        generator: BaseGenerator[YieldType],
+        readahead: int = 1,
+        executor: Executor | None = None,
+    ) -> None:
         self.generator = generator
+        self.readahead = readahead
+        self.executor = executor
+        self._state = _Producer(generator, readahead)
+        self._producer: asyncio.Future[None] | None = None
+        self._finished = False
+
+        # Consumers can drop the generator without closing it, like on disconnects
+        self._finalizer = weakref.finalize(self, self._state.abandon)
+
+    def _start(self) -> asyncio.Future[None]:
+        if self._producer is None:
+            loop = asyncio.get_running_loop()
+            self._state.started = True
+            self._producer = loop.run_in_executor(self.executor, self._state.run, loop)
+
+        return self._producer
+
+    async def _stop(self) -> None:
+        self._finished = True
+        self._finalizer.detach()
+        self._state.stop()
+
+        if self._producer is None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.executor, self.generator.close)
+        else:
+            await self._producer
 
     @override
-    async def asend(self, value: SendType, /) -> YieldType:
-        class Sentinel:
-            pass
+    async def asend(self, value: None, /) -> YieldType:
+        if self._finished:
+            raise StopAsyncIteration
 
-        def wrap() -> YieldType | Sentinel:
-            try:
-                return self.generator.send(value)
-            except StopIteration:
-                return Sentinel()
+        self._start()
+        item = await self._state.queue.get()
 
-        item = await asyncio.to_thread(wrap)
+        if isinstance(item, _Sentinel):
+            self._finished = True
+            raise StopAsyncIteration
 
-        if isinstance(item, Sentinel):
-            raise StopAsyncIteration from None
+        if isinstance(item, _Failure):
+            self._finished = True
+            raise item.exception
 
+        self._state.slots.release()
         return item
 
     @overload
@@ -43,18 +139,83 @@ class Generator[YieldType, SendType](BaseAsyncGenerator[YieldType, SendType]):
     ) -> YieldType: ...
     @override
     async def athrow(self, *args: Any, **kwargs: Any) -> YieldType:
-        class Sentinel:
-            pass
+        await self._stop()
+        raise StopAsyncIteration
 
-        def wrap() -> YieldType | Sentinel:
-            try:
-                return self.generator.throw(*args, **kwargs)
-            except (GeneratorExit, StopIteration):
-                return Sentinel()
 
-        item = await asyncio.to_thread(wrap)
+class BatchingGenerator[YieldType](BaseAsyncGenerator[YieldType]):
+    """Async generator that takes items from a synchronous generator in batches."""
 
-        if isinstance(item, Sentinel):
-            raise StopAsyncIteration from None
+    def __init__(
+        self,
+        generator: BaseGenerator[YieldType],
+        size: int,
+        executor: Executor | None = None,
+    ) -> None:
+        self.generator = generator
+        self.size = size
+        self.executor = executor
+        self._batch: deque[YieldType] = deque()
+        self._failure: _Failure | None = None
+        self._finished = False
+        self._taking: asyncio.Future[None] | None = None
 
-        return item
+    def _take(self) -> None:
+        # Items taken before a failure are still delivered, the failure comes after
+        try:
+            for _ in range(self.size):
+                self._batch.append(next(self.generator))
+        except StopIteration:
+            self._finished = True
+        except Exception as ex:
+            self._failure = _Failure(ex)
+            self._finished = True
+
+    @override
+    async def asend(self, value: None, /) -> YieldType:
+        if not self._batch and not self._finished:
+            if self._taking is None:
+                loop = asyncio.get_running_loop()
+                self._taking = loop.run_in_executor(self.executor, self._take)
+
+            # A cancelled consumer can't stop the worker thread, so the batch
+            # keeps running and is awaited by whoever uses the generator next
+            await asyncio.shield(self._taking)
+            self._taking = None
+
+        if self._batch:
+            return self._batch.popleft()
+
+        if self._failure is not None:
+            failure, self._failure = self._failure, None
+            raise failure.exception
+
+        raise StopAsyncIteration
+
+    @overload
+    async def athrow(
+        self,
+        typ: type[BaseException],
+        val: BaseException | object = None,
+        tb: TracebackType | None = None,
+        /,
+    ) -> YieldType: ...
+    @overload
+    async def athrow(
+        self, typ: BaseException, val: None = None, tb: TracebackType | None = None, /
+    ) -> YieldType: ...
+    @override
+    async def athrow(self, *args: Any, **kwargs: Any) -> YieldType:
+        self._finished = True
+
+        # The generator can't be closed while a batch is being taken from it
+        if self._taking is not None:
+            await asyncio.wait({self._taking})
+            self._taking = None
+
+        self._batch.clear()
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.generator.close)
+
+        raise StopAsyncIteration
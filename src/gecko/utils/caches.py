@@ -0,0 +1,69 @@
+import time
+from collections import OrderedDict
+
+
+class _Item[V]:
+    def __init__(self, value: V, expires: float, size: int) -> None:
+        self.value = value
+        self.expires = expires
+        self.size = size
+
+
+class TTLCache[K, V]:
+    """Least recently used cache with entries that expire after a time to live.
+
+    Expired entries are kept until they are evicted, so they can be revalidated.
+    """
+
+    def __init__(self, entries: int, size: int) -> None:
+        self.entries = entries
+        self.limit = size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items: OrderedDict[K, _Item[V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: K) -> V | None:
+        """Get a value that has not expired yet."""
+        item = self._items.get(key)
+
+        if item is None or item.expires <= time.monotonic():
+            self.misses += 1
+            return None
+
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item.value
+
+    def peek(self, key: K) -> V | None:
+        """Get a value even if it has expired, without counting a hit or a miss."""
+        item = self._items.get(key)
+        return item.value if item is not None else None
+
+    def put(self, key: K, value: V, ttl: float, size: int) -> None:
+        """Put a value that expires after the time to live in seconds.
+
+        A value that can't be stored leaves the previous one in place.
+        """
+        if ttl <= 0 or size > self.limit:
+            return
+
+        self.remove(key)
+        self._items[key] = _Item(value, time.monotonic() + ttl, size)
+        self.size += size
+
+        while len(self._items) > self.entries or self.size > self.limit:
+            _, evicted = self._items.popitem(last=False)
+            self.size -= evicted.size
+            self.evictions += 1
+
+    def remove(self, key: K) -> None:
+        """Remove a value if it is present."""
+        item = self._items.pop(key, None)
+
+        if item is not None:
+            self.size -= item.size
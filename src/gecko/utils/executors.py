@@ -0,0 +1,53 @@
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import override
+
+
+class InstrumentedExecutor(ThreadPoolExecutor):
+    """Thread pool executor that counts queued and running tasks."""
+
+    def __init__(self, workers: int, name: str) -> None:
+        super().__init__(max_workers=workers, thread_name_prefix=name)
+        self.size = workers
+        self.queued = 0
+        self.active = 0
+        self.tasks = 0
+        self.wait = 0.0
+        self._lock = threading.Lock()
+
+    def _enter(self, submitted: float) -> None:
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+            self.tasks += 1
+            self.wait += time.monotonic() - submitted
+
+    def _exit(self) -> None:
+        with self._lock:
+            self.active -= 1
+
+    @override
+    def submit[**P, T](
+        self, fn: Callable[P, T], /, *args: P.args, **kwargs: P.kwargs
+    ) -> Future[T]:
+        submitted = time.monotonic()
+
+        def run() -> T:
+            self._enter(submitted)
+
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._exit()
+
+        with self._lock:
+            self.queued += 1
+
+        try:
+            return super().submit(run)
+        except:
+            with self._lock:
+                self.queued -= 1
+            raise
@@ -0,0 +1,111 @@
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+
+class AdaptiveLimiter:
+    """Concurrency limiter that adapts its limit to latency and failures (AIMD).
+
+    The limit grows by about one for every limit calls that finish in time
+    and shrinks by a constant factor when a call is too slow or fails.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        latency: float,
+        backoff: float,
+        ignored: tuple[type[BaseException], ...] = (),
+    ) -> None:
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.latency = latency
+        self.backoff = backoff
+        self.ignored = ignored
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.active = 0
+        self.queued = 0
+        self.tasks = 0
+        self.wait = 0.0
+        self.decreases = 0
+        self._decreased = 0.0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    def _wake(self) -> None:
+        while self._waiters and self.active < math.floor(self.limit):
+            waiter = self._waiters.popleft()
+
+            if not waiter.done():
+                # The slot is taken on behalf of the waiter, so no one can jump ahead
+                self.active += 1
+                waiter.set_result(None)
+
+    async def _enter(self) -> None:
+        if not self._waiters and self.active < math.floor(self.limit):
+            self.active += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        submitted = time.monotonic()
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # The slot might have been handed over just before the cancellation
+            if waiter.done() and not waiter.cancelled():
+                self.active -= 1
+                self._wake()
+            raise
+        finally:
+            self.queued -= 1
+            self.wait += time.monotonic() - submitted
+
+    def _exit(self) -> None:
+        self.active -= 1
+        self._wake()
+
+    def _increase(self) -> None:
+        self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def _decrease(self, started: float) -> None:
+        # Calls that started before the last decrease saw the old limit
+        if started < self._decreased:
+            return
+
+        self.limit = max(self.minimum, self.limit * self.backoff)
+        self.decreases += 1
+        self._decreased = time.monotonic()
+
+    def _observe(self, started: float) -> None:
+        if time.monotonic() - started > self.latency:
+            self._decrease(started)
+        else:
+            self._increase()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncGenerator[None]:
+        """Wait for a free slot and hold it while the block runs."""
+        await self._enter()
+
+        self.tasks += 1
+        started = time.monotonic()
+
+        try:
+            yield
+        except self.ignored:
+            self._observe(started)
+            raise
+        except Exception:
+            self._decrease(started)
+            raise
+        else:
+            self._observe(started)
+        finally:
+            self._exit()
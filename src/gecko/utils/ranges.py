@@ -0,0 +1,189 @@
+import re
+from typing import Any
+
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import CoreSchema, core_schema
+
+from gecko.models.base import datamodel
+
+
+class ByteRangeValidationError(ValueError):
+    """Raised when a byte range is invalid."""
+
+    def __init__(self, value: str | None = None) -> None:
+        super().__init__(f"Invalid byte range{f': {value}' if value else ''}.")
+
+
+class ContentRangeValidationError(ValueError):
+    """Raised when a content range is invalid."""
+
+    def __init__(self, value: str | None = None) -> None:
+        super().__init__(f"Invalid content range{f': {value}' if value else ''}.")
+
+
+@datamodel
+class ByteRange:
+    """Range of bytes requested with the Range header."""
+
+    start: int | None
+    """Position of the first byte or None for a suffix range."""
+
+    end: int | None
+    """Position of the last byte (or length of a suffix range) or None if open."""
+
+    def resolve(self, size: int) -> tuple[int, int] | None:
+        """Return the offset and length of the range in content of the given size."""
+        if self.start is None:
+            if not self.end or not size:
+                return None
+
+            offset = max(size - self.end, 0)
+            return offset, size - offset
+
+        if self.start >= size:
+            return None
+
+        end = size - 1 if self.end is None else min(self.end, size - 1)
+        return self.start, end - self.start + 1
+
+    @staticmethod
+    def parse(value: Any) -> "ByteRange":
+        """Parse a byte range."""
+        parser = ByteRangeParser()
+        return parser.parse(value)
+
+
+class ByteRangeParser:
+    """Parser for byte ranges."""
+
+    class PATTERNS:
+        FULL = re.compile(
+            r"^\s*bytes\s*=\s*(?:(?P<start>\d+)\s*-\s*(?P<end>\d+)?|-\s*(?P<suffix>\d+))\s*$"
+        )
+
+    def parse(self, value: Any) -> ByteRange:
+        """Parse a byte range."""
+        try:
+            value = str(value)
+        except Exception as e:
+            raise ByteRangeValidationError from e
+
+        if not (fullmatch := self.PATTERNS.FULL.fullmatch(value)):
+            raise ByteRangeValidationError(value)
+
+        if fullmatch["suffix"] is not None:
+            return ByteRange(start=None, end=int(fullmatch["suffix"]))
+
+        start = int(fullmatch["start"])
+        end = int(fullmatch["end"]) if fullmatch["end"] is not None else None
+
+        if end is not None and end < start:
+            raise ByteRangeValidationError(value)
+
+        return ByteRange(start=start, end=end)
+
+    def __call__(self, value: Any) -> ByteRange:
+        """Parse a byte range."""
+        return self.parse(value)
+
+
+@datamodel
+class ContentRange:
+    """Range of bytes sent with the Content-Range header."""
+
+    start: int
+    """Position of the first byte."""
+
+    end: int
+    """Position of the last byte."""
+
+    size: int
+    """Size of the complete content in bytes."""
+
+    @property
+    def length(self) -> int:
+        """Return the number of bytes in the range."""
+        return self.end - self.start + 1
+
+    @staticmethod
+    def __get_pydantic_core_schema__(
+        source_type: Any, handler: GetCoreSchemaHandler
+    ) -> CoreSchema:
+        string_validation_schema = core_schema.no_info_after_validator_function(
+            ContentRange.parse, handler(str)
+        )
+
+        instance_validation_schema = core_schema.is_instance_schema(ContentRange)
+
+        serialization_schema = core_schema.plain_serializer_function_ser_schema(
+            ContentRange.serialize
+        )
+
+        return core_schema.json_or_python_schema(
+            json_schema=string_validation_schema,
+            python_schema=core_schema.union_schema(
+                [instance_validation_schema, string_validation_schema]
+            ),
+            serialization=serialization_schema,
+        )
+
+    def __str__(self) -> str:
+        """Return the content range as a string."""
+        return self.serialize()
+
+    @staticmethod
+    def parse(value: Any) -> "ContentRange":
+        """Parse a content range."""
+        parser = ContentRangeParser()
+        return parser.parse(value)
+
+    def serialize(self) -> str:
+        """Serialize the content range."""
+        serializer = ContentRangeSerializer()
+        return serializer.serialize(self)
+
+
+class ContentRangeParser:
+    """Parser for content ranges."""
+
+    class PATTERNS:
+        FULL = re.compile(
+            r"^\s*bytes\s+(?P<start>\d+)\s*-\s*(?P<end>\d+)\s*/\s*(?P<size>\d+)\s*$"
+        )
+
+    def parse(self, value: Any) -> ContentRange:
+        """Parse a content range."""
+        try:
+            value = str(value)
+        except Exception as e:
+            raise ContentRangeValidationError from e
+
+        if not (fullmatch := self.PATTERNS.FULL.fullmatch(value)):
+            raise ContentRangeValidationError(value)
+
+        start, end, size = (
+            int(fullmatch["start"]),
+            int(fullmatch["end"]),
+            int(fullmatch["size"]),
+        )
+
+        if not start <= end < size:
+            raise ContentRangeValidationError(value)
+
+        return ContentRange(start=start, end=end, size=size)
+
+    def __call__(self, value: Any) -> ContentRange:
+        """Parse a content range."""
+        return self.parse(value)
+
+
+class ContentRangeSerializer:
+    """Serializer for content ranges."""
+
+    def serialize(self, value: ContentRange) -> str:
+        """Serialize a content range."""
+        return f"bytes {value.start}-{value.end}/{value.size}"
+
+    def __call__(self, value: ContentRange) -> str:
+        """Serialize a content range."""
+        return self.serialize(value)
@@ -1,23 +1,87 @@
-from collections.abc import Iterator
+from collections import deque
+from collections.abc import Buffer, Iterator
 
 
 class ReadableIterator:
-    """Iterator wrapper providing a read method."""
+    """Iterator wrapper providing read methods."""
 
     def __init__(self, iterator: Iterator[bytes]) -> None:
         self._iterator = iterator
-        self._buffer = b""
+        self._chunks: deque[memoryview] = deque()
+        self._size = 0
 
-    def read(self, size: int | None = -1) -> bytes:
-        """Read bytes from the iterator."""
-        if size is None or size < 0:
-            return b"".join(self._iterator)
-
-        while len(self._buffer) < size:
+    def _fill(self, size: int) -> None:
+        while self._size < size:
             try:
-                self._buffer += next(self._iterator)
+                chunk = next(self._iterator)
             except StopIteration:
                 break
 
-        data, self._buffer = self._buffer[:size], self._buffer[size:]
-        return data
+            if chunk:
+                self._chunks.append(memoryview(chunk))
+                self._size += len(chunk)
+
+    def _take(self, size: int) -> list[memoryview]:
+        views = []
+
+        while size > 0 and self._chunks:
+            chunk = self._chunks[0]
+
+            if len(chunk) <= size:
+                views.append(self._chunks.popleft())
+            else:
+                # Only the view is split, the underlying chunk is not copied
+                views.append(chunk[:size])
+                self._chunks[0] = chunk[size:]
+
+            size -= len(views[-1])
+            self._size -= len(views[-1])
+
+        return views
+
+    def readable(self) -> bool:
+        """Return whether the object supports reading."""
+        return True
+
+    def _drain(self) -> int:
+        for chunk in self._iterator:
+            if chunk:
+                self._chunks.append(memoryview(chunk))
+                self._size += len(chunk)
+
+        return self._size
+
+    def read(self, size: int | None = -1) -> bytes:
+        """Read bytes from the iterator.
+
+        Without a size, the rest of the iterator is read into memory at once.
+        """
+        if size is None or size < 0:
+            size = self._drain()
+
+        self._fill(size)
+        views = self._take(size)
+
+        # A whole chunk can be returned as is, without copying
+        if (
+            len(views) == 1
+            and isinstance(chunk := views[0].obj, bytes)
+            and len(chunk) == len(views[0])
+        ):
+            return chunk
+
+        return b"".join(views)
+
+    def readinto(self, buffer: Buffer) -> int:
+        """Read bytes from the iterator into a preallocated buffer."""
+        target = memoryview(buffer).cast("B")
+
+        self._fill(len(target))
+
+        written = 0
+
+        for view in self._take(len(target)):
+            target[written : written + len(view)] = view
+            written += len(view)
+
+        return written
@@ -0,0 +1,121 @@
+import math
+import time
+from collections import deque
+from enum import StrEnum
+
+
+class CircuitState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """Circuit breaker that fails fast after consecutive failures.
+
+    Once open, a single probe is let through every cooldown,
+    and the circuit closes again when a probe succeeds.
+    """
+
+    def __init__(self, threshold: int | None, cooldown: float) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.rejected = 0
+        self._opened: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state of the circuit."""
+        if self._opened is None:
+            return CircuitState.CLOSED
+
+        return CircuitState.HALF_OPEN if self._probing else CircuitState.OPEN
+
+    def allow(self) -> bool:
+        """Check whether a call can be made now."""
+        if self._opened is None:
+            return True
+
+        now = time.monotonic()
+
+        if now - self._opened >= self.cooldown:
+            # Other calls keep failing fast until the probe succeeds
+            self._opened = now
+            self._probing = True
+            return True
+
+        self.rejected += 1
+        return False
+
+    def success(self) -> None:
+        """Record a successful call."""
+        self.failures = 0
+        self._opened = None
+        self._probing = False
+
+    def failure(self) -> None:
+        """Record a failed call."""
+        self.failures += 1
+
+        if self._probing or (
+            self.threshold is not None and self.failures >= self.threshold
+        ):
+            self._opened = time.monotonic()
+            self._probing = False
+
+
+class RetryBudget:
+    """Budget that allows retries for only a fraction of calls.
+
+    Every call deposits a part of a token and every retry withdraws a whole one,
+    so retries can't multiply the load when all calls fail.
+    """
+
+    def __init__(self, ratio: float, reserve: int) -> None:
+        self.ratio = ratio
+        self.reserve = reserve
+        self.balance = float(reserve)
+
+    def deposit(self) -> None:
+        """Record a call."""
+        self.balance = min(self.reserve, self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take a token for a retry if there is one."""
+        if self.balance < 1:
+            return False
+
+        self.balance -= 1
+        return True
+
+
+class LatencyTracker:
+    """Tracker of latency percentiles over a window of recent calls."""
+
+    def __init__(self, window: int, minimum: int) -> None:
+        self.minimum = minimum
+        self._samples: deque[float] = deque(maxlen=window)
+        self._sorted: list[float] = []
+        self._added = 0
+
+    def add(self, latency: float) -> None:
+        """Record the latency of a call in seconds."""
+        self._samples.append(latency)
+        self._added += 1
+
+    def percentile(self, percentile: float) -> float | None:
+        """Get a percentile of recent latencies, if there are enough samples."""
+        if len(self._samples) < self.minimum:
+            return None
+
+        # Sorting is only repeated after a part of the window has changed
+        if self._added * 16 >= len(self._samples) or not self._sorted:
+            self._sorted = sorted(self._samples)
+            self._added = 0
+
+        index = math.ceil(percentile / 100 * len(self._sorted)) - 1
+        return self._sorted[min(max(index, 0), len(self._sorted) - 1)]
@@ -1,35 +1,116 @@
 import asyncio
 from collections.abc import AsyncIterator as BaseAsyncIterator
 from collections.abc import Iterator as BaseIterator
-from typing import override
+from contextlib import suppress
+from typing import Self, override
 
 
-class Iterator[T](BaseIterator[T]):
-    """Iterator that wraps an async iterator."""
+class IteratorClosedError(Exception):
+    """Raised in the consuming thread when the iterator is closed on the loop."""
+
+    def __init__(self) -> None:
+        super().__init__("Iterator was closed.")
+
+
+class _Sentinel:
+    pass
+
+
+class _Failure:
+    def __init__(self, exception: BaseException) -> None:
+        self.exception = exception
+
+
+class BatchingIterator(BaseIterator[bytes]):
+    """Iterator that collects chunks of an async iterator into batches on the loop."""
 
     def __init__(
         self,
-        iterator: BaseAsyncIterator[T],
+        iterator: BaseAsyncIterator[bytes],
+        size: int,
+        buffers: int = 1,
         loop: asyncio.AbstractEventLoop | None = None,
     ) -> None:
         self.iterator = iterator
+        self.size = size
+        self.buffers = buffers
         self.loop = loop if loop is not None else asyncio.get_running_loop()
+        self._queue: asyncio.Queue[bytes | _Sentinel | _Failure] = asyncio.Queue(
+            buffers
+        )
+        self._pump: asyncio.Task[None] | None = None
+        self._finished = False
 
-    @override
-    def __next__(self) -> T:
-        class Sentinel:
-            pass
+    async def _fill(self) -> None:
+        # Views of the chunks are collected and joined once per batch
+        views: list[memoryview] = []
+        buffered = 0
+
+        try:
+            async for chunk in self.iterator:
+                view = memoryview(chunk)
+
+                while buffered + len(view) >= self.size:
+                    taken = self.size - buffered
+                    views.append(view[:taken])
+                    view = view[taken:]
+
+                    # Blocks when the consuming thread is buffers batches behind
+                    await self._queue.put(b"".join(views))
+                    views.clear()
+                    buffered = 0
+
+                if view:
+                    views.append(view)
+                    buffered += len(view)
 
-        async def wrap() -> T | Sentinel:
-            try:
-                return await anext(self.iterator)
-            except StopAsyncIteration:
-                return Sentinel()
+            if views:
+                await self._queue.put(b"".join(views))
 
-        future = asyncio.run_coroutine_threadsafe(wrap(), self.loop)
+            await self._queue.put(_Sentinel())
+        except Exception as ex:
+            await self._queue.put(_Failure(ex))
+
+    def start(self) -> None:
+        """Start collecting batches on the loop."""
+        if self._pump is None:
+            self._pump = self.loop.create_task(self._fill())
+
+    async def aclose(self) -> None:
+        """Stop collecting batches and make the consuming thread fail."""
+        if self._pump is not None:
+            self._pump.cancel()
+
+            with suppress(asyncio.CancelledError):
+                await self._pump
+
+        # Make room for the failure so the consuming thread wakes up immediately
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+        self._queue.put_nowait(_Failure(IteratorClosedError()))
+
+    async def __aenter__(self) -> Self:
+        self.start()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.aclose()
+
+    @override
+    def __next__(self) -> bytes:
+        if self._finished:
+            raise StopIteration
+
+        future = asyncio.run_coroutine_threadsafe(self._queue.get(), self.loop)
         item = future.result()
 
-        if isinstance(item, Sentinel):
-            raise StopIteration from None
+        if isinstance(item, _Sentinel):
+            self._finished = True
+            raise StopIteration
+
+        if isinstance(item, _Failure):
+            self._finished = True
+            raise item.exception
 
         return item
@@ -99,3 +99,16 @@ def httpstringify(dt: datetime) -> str:
 def httpparse(value: str) -> datetime:
     """Parse an HTTP date string to a datetime."""
     return TypeAdapter(HTTPDatetime).validate_python(value)
+
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def microstamp(dt: datetime) -> int:
+    """Convert a naive datetime to microseconds since the epoch."""
+    return (dt - EPOCH) // timedelta(microseconds=1)
+
+
+def microparse(value: int) -> datetime:
+    """Convert microseconds since the epoch to a naive datetime."""
+    return EPOCH + timedelta(microseconds=value)
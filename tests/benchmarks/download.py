@@ -0,0 +1,67 @@
+import asyncio
+import statistics
+import time
+from typing import Annotated
+
+import typer
+from httpx import AsyncClient, Limits
+
+cli = typer.Typer()
+
+
+async def _measure(client: AsyncClient, path: str) -> float:
+    start = time.perf_counter()
+
+    async with client.stream("GET", path) as response:
+        response.raise_for_status()
+        async for _ in response.aiter_raw():
+            pass
+
+    return time.perf_counter() - start
+
+
+async def _run(
+    url: str, path: str, requests: int, concurrency: int
+) -> tuple[list[float], float]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def measure(client: AsyncClient) -> float:
+        async with semaphore:
+            return await _measure(client, path)
+
+    limits = Limits(max_connections=concurrency)
+
+    async with AsyncClient(base_url=url, limits=limits, timeout=None) as client:
+        await _measure(client, path)
+
+        start = time.perf_counter()
+        samples = await asyncio.gather(*[measure(client) for _ in range(requests)])
+        return samples, time.perf_counter() - start
+
+
+def _percentile(samples: list[float], percentile: int) -> float:
+    return statistics.quantiles(samples, n=100, method="inclusive")[percentile - 1]
+
+
+@cli.command()
+def main(
+    event: Annotated[str, typer.Argument(help="Identifier of the event.")],
+    start: Annotated[str, typer.Argument(help="Start datetime of the instance.")],
+    url: Annotated[str, typer.Option(help="URL of the service.")] = (
+        "http://localhost:10700"
+    ),
+    requests: Annotated[int, typer.Option(help="Number of requests.")] = 1000,
+    concurrency: Annotated[int, typer.Option(help="Concurrent requests.")] = 10,
+) -> None:
+    """Measure latency and throughput of GET /recordings/{event}/{start}."""
+    path = f"/recordings/{event}/{start}"
+    samples, elapsed = asyncio.run(_run(url, path, requests, concurrency))
+
+    typer.echo(f"requests: {len(samples)}")
+    typer.echo(f"throughput: {len(samples) / elapsed:.1f} requests/s")
+    typer.echo(f"p50: {_percentile(samples, 50) * 1000:.2f} ms")
+    typer.echo(f"p99: {_percentile(samples, 99) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    cli()
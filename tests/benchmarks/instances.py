@@ -0,0 +1,81 @@
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Annotated, Any
+from uuid import uuid4
+
+import typer
+
+from gecko.services.apis.beaver import models as m
+from gecko.services.apis.beaver.service import BeaverInstancesService
+
+cli = typer.Typer()
+
+
+def _response(count: int, *, include: bool) -> bytes:
+    event = {"id": str(uuid4()), "type": "live", "timezone": "Europe/Warsaw"}
+    start = datetime(2000, 1, 1)
+
+    instances = [
+        {
+            "start": (start + timedelta(days=7 * i)).isoformat(),
+            "duration": "PT1H",
+            "event": event if include else None,
+        }
+        for i in range(count)
+    ]
+
+    return json.dumps({"instances": instances}).encode()
+
+
+def _measure(
+    function: Callable[[bytes], Any], content: bytes, repeats: int
+) -> tuple[float, int]:
+    function(content)
+
+    start = time.perf_counter()
+
+    for _ in range(repeats):
+        function(content)
+
+    elapsed = (time.perf_counter() - start) / repeats
+
+    tracemalloc.start()
+
+    try:
+        function(content)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return elapsed, peak
+
+
+@cli.command()
+def main(
+    count: Annotated[int, typer.Option(help="Number of instances.")] = 10000,
+    repeats: Annotated[int, typer.Option(help="Number of measured decodes.")] = 20,
+) -> None:
+    """Measure decoding of instance lists in full and as starts only."""
+    cases: list[tuple[str, Callable[[bytes], Any], bytes]] = [
+        ("full", m.InstanceList.model_validate_json, _response(count, include=True)),
+        (
+            "starts",
+            BeaverInstancesService.STARTS.validate_json,
+            _response(count, include=False),
+        ),
+    ]
+
+    for name, function, content in cases:
+        elapsed, peak = _measure(function, content, repeats)
+
+        typer.echo(
+            f"{name}: {count} instances in {elapsed * 1000:.1f} ms, "
+            f"peak memory {peak / 1024**2:.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    cli()
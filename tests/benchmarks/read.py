@@ -0,0 +1,63 @@
+import time
+from collections.abc import Iterator
+from typing import Annotated
+
+import typer
+
+from gecko.utils.read import ReadableIterator
+
+cli = typer.Typer()
+
+
+def _chunks(size: int, chunk: int) -> Iterator[bytes]:
+    data = bytes(chunk)
+
+    for _ in range(size // chunk):
+        yield data
+
+    if size % chunk:
+        yield data[: size % chunk]
+
+
+def _read(size: int, chunk: int, part: int) -> int:
+    reader = ReadableIterator(_chunks(size, chunk))
+    total = 0
+
+    while data := reader.read(part):
+        total += len(data)
+
+    return total
+
+
+def _readinto(size: int, chunk: int, part: int) -> int:
+    reader = ReadableIterator(_chunks(size, chunk))
+    buffer = bytearray(part)
+    total = 0
+
+    while read := reader.readinto(buffer):
+        total += read
+
+    return total
+
+
+@cli.command()
+def main(
+    size: Annotated[int, typer.Option(help="Size of the stream in bytes.")] = 2
+    * 1024**3,
+    chunk: Annotated[int, typer.Option(help="Size of incoming chunks.")] = 64 * 1024,
+    part: Annotated[int, typer.Option(help="Size of reads.")] = 5 * 1024**2,
+) -> None:
+    """Measure throughput of streaming an upload through ReadableIterator."""
+    for name, function in [("read", _read), ("readinto", _readinto)]:
+        start = time.perf_counter()
+        total = function(size, chunk, part)
+        elapsed = time.perf_counter() - start
+
+        typer.echo(
+            f"{name}: {total} bytes in {elapsed:.2f} s "
+            f"({total / elapsed / 1024**3:.2f} GiB/s)"
+        )
+
+
+if __name__ == "__main__":
+    cli()
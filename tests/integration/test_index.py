@@ -0,0 +1,217 @@
+import asyncio
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from datetime import datetime, timedelta
+from io import BytesIO
+from pathlib import Path
+from typing import Any, cast
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from minio import Minio
+
+from gecko.config.models import Config, IndexConfig
+from gecko.services.data.emerald import errors as ee
+from gecko.services.data.emerald import models as em
+from gecko.services.data.emerald.service import EmeraldService
+from gecko.services.data.index import models as im
+from gecko.services.data.index.service import IndexService
+from gecko.services.entities.recordings.service import RecordingsService
+from gecko.utils.time import isostringify
+from tests.utils.containers import AsyncDockerContainer
+from tests.utils.waiting.conditions import CallableCondition
+from tests.utils.waiting.strategies import TimeoutStrategy
+from tests.utils.waiting.waiter import Waiter
+
+RETRY = 0.1
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def emerald_service(
+    config: Config, emerald: AsyncDockerContainer
+) -> AsyncGenerator[EmeraldService]:
+    """Build emerald service."""
+    service = EmeraldService(config=config.emerald)
+    await service.open()
+
+    try:
+        yield service
+    finally:
+        await service.close()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def index(tmp_path: Path) -> AsyncGenerator[IndexService]:
+    """Build index service with an empty database."""
+    service = IndexService(
+        config=IndexConfig(enabled=True, path=str(tmp_path / "index.sqlite3"))
+    )
+    await service.open()
+
+    try:
+        yield service
+    finally:
+        await service.close()
+
+
+@pytest.fixture
+def recordings(
+    config: Config, emerald_service: EmeraldService, index: IndexService
+) -> RecordingsService:
+    """Build recordings service."""
+    # The index is maintained without the beaver service
+    return RecordingsService(
+        config=config.recordings,
+        beaver=cast("Any", None),
+        emerald=emerald_service,
+        index=index,
+    )
+
+
+class Recording:
+    """Recording stored directly in the emerald database."""
+
+    def __init__(self, client: Minio, bucket: str) -> None:
+        self.event = uuid4()
+        self.start = datetime(2000, 1, 1) + timedelta(seconds=uuid4().int % 86400)
+        self._client = client
+        self._bucket = bucket
+
+    @property
+    def key(self) -> str:
+        """Key of the recording object."""
+        return f"{self.event}/{isostringify(self.start)}"
+
+    async def put(self) -> None:
+        """Store the recording object."""
+        await asyncio.to_thread(
+            self._client.put_object,
+            self._bucket,
+            self.key,
+            BytesIO(b"data"),
+            length=4,
+            content_type="audio/ogg",
+        )
+
+    async def remove(self) -> None:
+        """Remove the recording object."""
+        await asyncio.to_thread(self._client.remove_object, self._bucket, self.key)
+
+
+@pytest.fixture
+def recording(emerald_client: Minio, config: Config) -> Recording:
+    """Build a recording with a unique event."""
+    return Recording(emerald_client, config.emerald.s3.bucket)
+
+
+async def _indexed(index: IndexService, recording: Recording) -> bool:
+    list_request = im.ListRequest(event=recording.event)
+    list_response = await index.list(list_request)
+    return any(entry.start == recording.start for entry in list_response.entries)
+
+
+async def _removed(index: IndexService, recording: Recording) -> bool:
+    return not await _indexed(index, recording)
+
+
+async def _ready(index: IndexService) -> bool:
+    return index.ready
+
+
+async def _wait(check: Callable[[], Awaitable[bool]]) -> None:
+    async def _check() -> None:
+        if not await check():
+            raise AssertionError
+
+    waiter = Waiter(
+        condition=CallableCondition(_check),
+        strategy=TimeoutStrategy(30, interval=RETRY),
+    )
+
+    await waiter.wait()
+
+
+async def _stop(task: asyncio.Task[None]) -> None:
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_reindex(
+    recordings: RecordingsService, index: IndexService, recording: Recording
+) -> None:
+    """Test if reindexing fills the index with stored recordings."""
+    await recording.put()
+
+    try:
+        assert not index.ready
+
+        await recordings.reindex()
+
+        assert index.ready
+        assert await _indexed(index, recording)
+    finally:
+        await recording.remove()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_watch_applies_notifications(
+    recordings: RecordingsService, index: IndexService, recording: Recording
+) -> None:
+    """Test if created and removed recordings are applied to the index."""
+    task = asyncio.create_task(recordings.watch(RETRY))
+
+    try:
+        await _wait(lambda: _ready(index))
+
+        await recording.put()
+        await _wait(lambda: _indexed(index, recording))
+
+        await recording.remove()
+        await _wait(lambda: _removed(index, recording))
+    finally:
+        await _stop(task)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_watch_rescans_on_reconnect(
+    monkeypatch: pytest.MonkeyPatch,
+    recordings: RecordingsService,
+    emerald_service: EmeraldService,
+    index: IndexService,
+    recording: Recording,
+) -> None:
+    """Test if changes missed while disconnected are found by a new scan."""
+    dropped = asyncio.Event()
+    listen = emerald_service.listen
+
+    async def disconnected() -> AsyncGenerator[em.ObjectEvent]:
+        await dropped.wait()
+        raise ee.ServiceError
+        yield
+
+    async def flaky(request: em.ListenRequest) -> em.ListenResponse:
+        # The first stream misses all notifications and fails when dropped
+        if not dropped.is_set():
+            return em.ListenResponse(events=disconnected())
+
+        return await listen(request)
+
+    monkeypatch.setattr(emerald_service, "listen", flaky)
+
+    task = asyncio.create_task(recordings.watch(RETRY))
+
+    try:
+        await _wait(lambda: _ready(index))
+
+        await recording.put()
+
+        assert not await _indexed(index, recording)
+
+        dropped.set()
+        await _wait(lambda: _indexed(index, recording))
+    finally:
+        await _stop(task)
+        await recording.remove()
@@ -0,0 +1,97 @@
+from datetime import datetime
+from typing import Any, cast
+from uuid import uuid4
+
+import pytest
+
+from gecko.api.routes.recordings import errors as e
+from gecko.api.routes.recordings import models as m
+from gecko.api.routes.recordings.service import Service
+from gecko.services.entities.recordings import models as rm
+
+EVENT = uuid4()
+
+
+def _service() -> Service:
+    # Cursors are handled before the recordings service is used
+    return Service(recordings=cast("Any", None))
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        rm.ListCursor(
+            event=EVENT,
+            start=datetime(2000, 1, 1, 12, 30, 15, 123456),
+            after=None,
+            before=None,
+            order=rm.ListOrder.ASCENDING,
+        ),
+        rm.ListCursor(
+            event=EVENT,
+            start=datetime(2000, 1, 2),
+            after=datetime(2000, 1, 1),
+            before=datetime(2000, 2, 1),
+            order=rm.ListOrder.DESCENDING,
+        ),
+    ],
+)
+def test_cursor_round_trip(cursor: rm.ListCursor) -> None:
+    """Test if a decoded cursor is the same as the encoded one."""
+    service = _service()
+
+    value = service._encode_cursor(cursor)  # noqa: SLF001
+
+    assert "=" not in value
+    assert service._decode_cursor(value, EVENT) == cursor  # noqa: SLF001
+
+
+@pytest.mark.parametrize("value", ["", "!", "e30", "bm90IGpzb24"])
+def test_cursor_rejects_malformed(value: str) -> None:
+    """Test if a cursor that can't be decoded is rejected."""
+    with pytest.raises(e.InvalidCursorError):
+        _service()._decode_cursor(value, EVENT)  # noqa: SLF001
+
+
+def test_cursor_rejects_other_event() -> None:
+    """Test if a cursor from a listing of another event is rejected."""
+    service = _service()
+    cursor = rm.ListCursor(
+        event=uuid4(),
+        start=datetime(2000, 1, 1),
+        after=None,
+        before=None,
+        order=rm.ListOrder.ASCENDING,
+    )
+
+    value = service._encode_cursor(cursor)  # noqa: SLF001
+
+    with pytest.raises(e.InvalidCursorError):
+        service._decode_cursor(value, EVENT)  # noqa: SLF001
+
+
+@pytest.mark.asyncio
+async def test_list_rejects_other_event() -> None:
+    """Test if listing with a cursor of another event fails as a bad request."""
+    service = _service()
+    cursor = rm.ListCursor(
+        event=EVENT,
+        start=datetime(2000, 1, 1),
+        after=None,
+        before=None,
+        order=rm.ListOrder.ASCENDING,
+    )
+
+    request = m.ListRequest(
+        event=uuid4(),
+        after=None,
+        before=None,
+        limit=None,
+        offset=None,
+        order=None,
+        count=None,
+        cursor=service._encode_cursor(cursor),  # noqa: SLF001
+    )
+
+    with pytest.raises(e.ValidationError):
+        await service.list(request)
@@ -0,0 +1,202 @@
+from collections.abc import AsyncGenerator
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+import pytest
+import pytest_asyncio
+from litestar import Litestar
+from litestar.status_codes import (
+    HTTP_200_OK,
+    HTTP_206_PARTIAL_CONTENT,
+    HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+)
+from litestar.testing import AsyncTestClient
+
+from gecko.api.plugins.pydantic import PydanticPlugin
+from gecko.api.routes.recordings.router import router
+from gecko.config.models import Config, IndexConfig
+from gecko.services.apis.beaver import models as bm
+from gecko.services.data.emerald import errors as ee
+from gecko.services.data.emerald import models as em
+from gecko.services.data.index.service import IndexService
+from gecko.state import State
+from gecko.utils.ranges import ContentRange
+from gecko.utils.time import httpstringify, isostringify
+
+EVENT = uuid4()
+
+START = datetime(2000, 1, 1)
+
+DATA = b"0123456789"
+
+TAG = '"tag"'
+
+MODIFIED = datetime(2000, 1, 2, tzinfo=UTC)
+
+PATH = f"/recordings/{EVENT}/{isostringify(START)}"
+
+
+class Instances:
+    """Stand-in for the instances of the beaver service."""
+
+    async def get(self, request: bm.InstancesGetRequest) -> bm.InstancesGetResponse:
+        """Return a live instance."""
+        return bm.InstancesGetResponse(
+            instance=bm.Instance(
+                start=request.start,
+                duration=timedelta(hours=1),
+                event=bm.Event(
+                    id=request.event_id,
+                    type=bm.EventType.live,
+                    timezone=ZoneInfo("UTC"),
+                ),
+            )
+        )
+
+
+class Emerald:
+    """Stand-in for the emerald database that stores a single object."""
+
+    def __init__(self) -> None:
+        self.downloads: list[em.DownloadRequest] = []
+
+    async def get(self, request: em.GetRequest) -> em.GetResponse:
+        """Return the details of the object."""
+        return em.GetResponse(
+            object=em.ObjectDetails(
+                name=request.name,
+                type="audio/ogg",
+                size=len(DATA),
+                tag=TAG,
+                modified=MODIFIED,
+            )
+        )
+
+    async def download(self, request: em.DownloadRequest) -> em.DownloadResponse:
+        """Return the requested part of the object."""
+        self.downloads.append(request)
+
+        if request.offset >= len(DATA):
+            raise ee.InvalidRangeError(request.name)
+
+        end = (
+            len(DATA)
+            if request.length is None
+            else min(request.offset + request.length, len(DATA))
+        )
+        ranged = request.offset > 0 or request.length is not None
+
+        async def data() -> AsyncGenerator[bytes]:
+            yield DATA[request.offset : end]
+
+        return em.DownloadResponse(
+            content=em.DownloadContent(
+                type="audio/ogg",
+                size=end - request.offset,
+                tag=TAG,
+                modified=MODIFIED,
+                range=ContentRange(start=request.offset, end=end - 1, size=len(DATA))
+                if ranged
+                else None,
+                data=data(),
+            )
+        )
+
+
+@pytest.fixture
+def emerald() -> Emerald:
+    """Build emerald database with a single object."""
+    return Emerald()
+
+
+@pytest_asyncio.fixture
+async def client(emerald: Emerald) -> AsyncGenerator[AsyncTestClient]:
+    """Build a client of the recordings endpoint."""
+    app = Litestar(
+        route_handlers=[router],
+        plugins=[PydanticPlugin()],
+        state=State(
+            {
+                "beaver": SimpleNamespace(instances=Instances()),
+                "config": Config(),
+                "emerald": emerald,
+                "index": IndexService(IndexConfig()),
+            }
+        ),
+    )
+
+    async with AsyncTestClient(app) as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_download_suffix_range(client: AsyncTestClient, emerald: Emerald) -> None:
+    """Test if a suffix range is resolved against the size of the recording."""
+    response = await client.get(PATH, headers={"Range": "bytes=-4"})
+
+    assert response.status_code == HTTP_206_PARTIAL_CONTENT
+    assert response.headers["Content-Range"] == "bytes 6-9/10"
+    assert response.headers["Accept-Ranges"] == "bytes"
+    assert response.content == b"6789"
+    assert emerald.downloads[-1].offset == 6  # noqa: PLR2004
+    assert emerald.downloads[-1].length == 4  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_download_range(client: AsyncTestClient) -> None:
+    """Test if a range is downloaded with a partial content response."""
+    response = await client.get(PATH, headers={"Range": "bytes=2-4"})
+
+    assert response.status_code == HTTP_206_PARTIAL_CONTENT
+    assert response.headers["Content-Range"] == "bytes 2-4/10"
+    assert response.headers["Content-Length"] == "3"
+    assert response.headers["Accept-Ranges"] == "bytes"
+    assert response.content == b"234"
+
+
+@pytest.mark.asyncio
+async def test_download_range_beyond_end(client: AsyncTestClient) -> None:
+    """Test if a range starting beyond the end is not satisfiable."""
+    response = await client.get(PATH, headers={"Range": "bytes=20-"})
+
+    assert response.status_code == HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+    assert response.headers["Content-Range"] == "bytes */10"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "ifrange",
+    [TAG, httpstringify(MODIFIED)],
+    ids=["tag", "modified"],
+)
+async def test_download_ifrange_matching(client: AsyncTestClient, ifrange: str) -> None:
+    """Test if a range is downloaded when If-Range matches the recording."""
+    response = await client.get(
+        PATH, headers={"Range": "bytes=2-4", "If-Range": ifrange}
+    )
+
+    assert response.status_code == HTTP_206_PARTIAL_CONTENT
+    assert response.headers["Content-Range"] == "bytes 2-4/10"
+    assert response.content == b"234"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "ifrange",
+    ['"other"', httpstringify(MODIFIED + timedelta(seconds=1))],
+    ids=["tag", "modified"],
+)
+async def test_download_ifrange_not_matching(
+    client: AsyncTestClient, ifrange: str
+) -> None:
+    """Test if the whole recording is downloaded when If-Range does not match."""
+    response = await client.get(
+        PATH, headers={"Range": "bytes=2-4", "If-Range": ifrange}
+    )
+
+    assert response.status_code == HTTP_200_OK
+    assert "Content-Range" not in response.headers
+    assert response.headers["Accept-Ranges"] == "bytes"
+    assert response.content == DATA
@@ -0,0 +1,494 @@
+import asyncio
+from collections.abc import Callable, Coroutine
+from datetime import datetime
+from http import HTTPMethod
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient, MockTransport, Request, Response
+
+from gecko.config.models import BeaverCacheConfig, BeaverHTTPConfig
+from gecko.services.apis.beaver import errors as e
+from gecko.services.apis.beaver import models as m
+from gecko.services.apis.beaver.service import (
+    BeaverClient,
+    BeaverEventsService,
+    BeaverInstancesService,
+)
+from gecko.utils import caches
+from gecko.utils.time import isostringify
+from tests.utils.clock import FakeClock
+
+type Handler = Callable[[Request], Coroutine[None, None, Response]]
+
+EVENT = uuid4()
+
+TTL = 10.0
+
+MISSING = 1.0
+
+SLOW = 5.0
+
+FAST = 0.01
+
+USUAL = 0.1
+
+FINISHED = 100.0
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Replace the clock of the cache."""
+    clock = FakeClock()
+    monkeypatch.setattr(caches, "time", clock)
+    return clock
+
+
+def _raw(response: Response) -> Response:
+    return response
+
+
+async def _open(
+    monkeypatch: pytest.MonkeyPatch,
+    handler: Handler,
+    http: dict[str, Any] | None = None,
+    cache: dict[str, Any] | None = None,
+) -> BeaverClient:
+    client = BeaverClient(
+        BeaverHTTPConfig.model_validate({"retries": {"backoff": 0}, **(http or {})}),
+        BeaverCacheConfig.model_validate(
+            {"ttl": {"missing": MISSING}, **(cache or {})}
+        ),
+    )
+    monkeypatch.setattr(
+        client,
+        "_build_client",
+        lambda: AsyncClient(base_url="http://beaver", transport=MockTransport(handler)),
+    )
+    await client.open()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_fetch_caches_missing_briefly(
+    monkeypatch: pytest.MonkeyPatch, clock: FakeClock
+) -> None:
+    """Test if missing resources are cached for the shorter time to live."""
+    requests: list[Request] = []
+
+    async def handler(request: Request) -> Response:
+        requests.append(request)
+        return Response(404)
+
+    client = await _open(monkeypatch, handler)
+
+    try:
+        await client.fetch("/events/a", ttl=TTL, parse=_raw)
+        await client.fetch("/events/a", ttl=TTL, parse=_raw)
+
+        assert len(requests) == 1
+
+        clock.advance(MISSING)
+        response = await client.fetch("/events/a", ttl=TTL, parse=_raw)
+    finally:
+        await client.close()
+
+    assert response.status_code == 404  # noqa: PLR2004
+    assert len(requests) == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_fetch_skips_failures(
+    monkeypatch: pytest.MonkeyPatch, clock: FakeClock
+) -> None:
+    """Test if failed responses are not cached."""
+    requests: list[Request] = []
+
+    async def handler(request: Request) -> Response:
+        requests.append(request)
+        return Response(500)
+
+    client = await _open(monkeypatch, handler, http={"retries": {"attempts": 0}})
+
+    try:
+        await client.fetch("/events/a", ttl=TTL, parse=_raw)
+        await client.fetch("/events/a", ttl=TTL, parse=_raw)
+    finally:
+        await client.close()
+
+    assert len(requests) == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_fetch_revalidates_expired(
+    monkeypatch: pytest.MonkeyPatch, clock: FakeClock
+) -> None:
+    """Test if an expired response is revalidated with its ETag and reused."""
+    requests: list[Request] = []
+
+    async def handler(request: Request) -> Response:
+        requests.append(request)
+
+        if request.headers.get("If-None-Match") == '"tag"':
+            return Response(304)
+
+        return Response(200, headers={"ETag": '"tag"'}, content=b"event")
+
+    client = await _open(monkeypatch, handler, cache={"revalidate": True})
+
+    try:
+        await client.fetch("/events/a", ttl=TTL, parse=_raw)
+
+        clock.advance(TTL)
+        response = await client.fetch("/events/a", ttl=TTL, parse=_raw)
+
+        # The revalidated response is cached for another time to live
+        await client.fetch("/events/a", ttl=TTL, parse=_raw)
+    finally:
+        await client.close()
+
+    assert response.status_code == 200  # noqa: PLR2004
+    assert response.content == b"event"
+    assert [request.headers.get("If-None-Match") for request in requests] == [
+        None,
+        '"tag"',
+    ]
+    assert client.revalidations == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_keeps_expired_after_failure(
+    monkeypatch: pytest.MonkeyPatch, clock: FakeClock
+) -> None:
+    """Test if an expired response can still be revalidated after a failed attempt."""
+    requests: list[Request] = []
+
+    async def handler(request: Request) -> Response:
+        requests.append(request)
+
+        if len(requests) == 2:  # noqa: PLR2004
+            return Response(500)
+
+        if request.headers.get("If-None-Match") == '"tag"':
+            return Response(304)
+
+        return Response(200, headers={"ETag": '"tag"'}, content=b"event")
+
+    client = await _open(
+        monkeypatch,
+        handler,
+        http={"retries": {"attempts": 0}},
+        cache={"revalidate": True},
+    )
+
+    try:
+        await client.fetch("/events/a", ttl=TTL, parse=_raw)
+
+        clock.advance(TTL)
+        failed = await client.fetch("/events/a", ttl=TTL, parse=_raw)
+        response = await client.fetch("/events/a", ttl=TTL, parse=_raw)
+    finally:
+        await client.close()
+
+    assert failed.status_code == 500  # noqa: PLR2004
+    assert response.content == b"event"
+    assert [request.headers.get("If-None-Match") for request in requests] == [
+        None,
+        '"tag"',
+        '"tag"',
+    ]
+    assert client.revalidations == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("start", "ttl"),
+    [(datetime(2000, 1, 1), FINISHED), (datetime(3000, 1, 1), TTL)],
+    ids=["finished", "upcoming"],
+)
+async def test_get_instance_caches_finished_longer(
+    monkeypatch: pytest.MonkeyPatch, clock: FakeClock, start: datetime, ttl: float
+) -> None:
+    """Test if instances that are over are cached for the finished time to live."""
+    requests: list[Request] = []
+    content = {
+        "start": isostringify(start),
+        "duration": "PT1H",
+        "event": {"id": str(EVENT), "type": "live", "timezone": "Europe/Warsaw"},
+    }
+
+    async def handler(request: Request) -> Response:
+        requests.append(request)
+        return Response(200, json=content)
+
+    client = await _open(
+        monkeypatch, handler, cache={"ttl": {"instances": TTL, "finished": FINISHED}}
+    )
+    instances = BeaverInstancesService(client)
+    request = m.InstancesGetRequest(
+        event_id=EVENT, start=start, include={"event": True}
+    )
+
+    try:
+        await instances.get(request)
+
+        clock.advance(ttl - 1)
+        await instances.get(request)
+
+        assert len(requests) == 1
+
+        clock.advance(1)
+        await instances.get(request)
+    finally:
+        await client.close()
+
+    assert len(requests) == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_fetch_coalesces_identical(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if identical requests made at the same time share a single call."""
+    requests: list[Request] = []
+
+    async def handler(request: Request) -> Response:
+        requests.append(request)
+        await asyncio.sleep(FAST)
+        return Response(200, content=b"event")
+
+    client = await _open(monkeypatch, handler)
+
+    try:
+        responses = await asyncio.gather(
+            *[client.fetch("/events/a", ttl=TTL, parse=_raw) for _ in range(3)]
+        )
+    finally:
+        await client.close()
+
+    assert len(requests) == 1
+    assert {response.content for response in responses} == {b"event"}
+    assert client.coalesced == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_get_event_shares_parsed_result(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if identical requests made at the same time share the parsed event."""
+    requests: list[Request] = []
+    content = {"id": str(EVENT), "type": "live", "timezone": "Europe/Warsaw"}
+
+    async def handler(request: Request) -> Response:
+        requests.append(request)
+        await asyncio.sleep(FAST)
+        return Response(200, json=content)
+
+    client = await _open(monkeypatch, handler)
+    events = BeaverEventsService(client)
+
+    try:
+        responses = await asyncio.gather(
+            *[events.get(m.EventsGetRequest(id=EVENT)) for _ in range(3)]
+        )
+    finally:
+        await client.close()
+
+    assert len(requests) == 1
+    assert all(response is responses[0] for response in responses)
+    assert responses[0].event.id == EVENT
+    assert client.coalesced == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_request_retries_within_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if retries stop when the retry budget is used up."""
+    requests: list[Request] = []
+
+    async def handler(request: Request) -> Response:
+        requests.append(request)
+        return Response(503)
+
+    client = await _open(
+        monkeypatch,
+        handler,
+        http={
+            "retries": {"attempts": 5, "backoff": 0, "budget": 0, "reserve": 2},
+            "breaker": {"threshold": None},
+        },
+    )
+
+    try:
+        first = await client.request(HTTPMethod.GET, "/events/a")
+        second = await client.request(HTTPMethod.GET, "/events/a")
+    finally:
+        await client.close()
+
+    assert first.status_code == second.status_code == 503  # noqa: PLR2004
+    assert len(requests) == 4  # noqa: PLR2004
+    assert client.retries == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_request_skips_retries_of_unsafe(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test if requests with side effects are never retried."""
+    requests: list[Request] = []
+
+    async def handler(request: Request) -> Response:
+        requests.append(request)
+        return Response(503)
+
+    client = await _open(monkeypatch, handler)
+
+    try:
+        await client.request(HTTPMethod.POST, "/events")
+    finally:
+        await client.close()
+
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_request_fails_fast_when_open(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if requests fail fast after consecutive failures."""
+    requests: list[Request] = []
+
+    async def handler(request: Request) -> Response:
+        requests.append(request)
+        return Response(500)
+
+    client = await _open(
+        monkeypatch,
+        handler,
+        http={"retries": {"attempts": 0}, "breaker": {"threshold": 2}},
+    )
+
+    try:
+        await client.request(HTTPMethod.GET, "/events/a")
+        await client.request(HTTPMethod.GET, "/events/a")
+
+        with pytest.raises(e.CircuitOpenError):
+            await client.request(HTTPMethod.GET, "/events/a")
+    finally:
+        await client.close()
+
+    assert len(requests) == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_request_fails_after_deadline(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if a request that takes longer than the deadline fails."""
+
+    async def handler(request: Request) -> Response:
+        await asyncio.sleep(SLOW)
+        return Response(200)
+
+    client = await _open(monkeypatch, handler, http={"deadline": FAST})
+
+    try:
+        with pytest.raises(e.DeadlineExceededError):
+            await client.request(HTTPMethod.GET, "/events/a")
+    finally:
+        await client.close()
+
+    assert client.breaker.failures == 1
+
+
+def _hedged(delays: list[float]) -> tuple[Handler, list[Request]]:
+    requests: list[Request] = []
+
+    async def handler(request: Request) -> Response:
+        delay = delays[len(requests)]
+        requests.append(request)
+        await asyncio.sleep(delay)
+        return Response(200, content=str(delay).encode())
+
+    return handler, requests
+
+
+def _hedging(client: BeaverClient) -> None:
+    # The usual latency is known before any request is hedged
+    for _ in range(client.config.hedging.minimum):
+        client.latencies.add(USUAL)
+
+
+@pytest.mark.asyncio
+async def test_request_hedges_slow(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if a second request is sent when the first one is slower than usual."""
+    handler, requests = _hedged([SLOW, 0])
+
+    client = await _open(
+        monkeypatch, handler, http={"hedging": {"enabled": True, "minimum": 10}}
+    )
+    _hedging(client)
+
+    try:
+        async with asyncio.timeout(SLOW / 2):
+            response = await client.request(HTTPMethod.GET, "/events/a")
+    finally:
+        await client.close()
+
+    assert response.content == b"0"
+    assert len(requests) == 2  # noqa: PLR2004
+    assert client.hedges == 1
+
+
+@pytest.mark.asyncio
+async def test_request_skips_hedging_fast(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if no second request is sent when the first one is fast enough."""
+    handler, requests = _hedged([0, 0])
+
+    client = await _open(
+        monkeypatch, handler, http={"hedging": {"enabled": True, "minimum": 10}}
+    )
+    _hedging(client)
+
+    try:
+        await client.request(HTTPMethod.GET, "/events/a")
+    finally:
+        await client.close()
+
+    assert len(requests) == 1
+    assert client.hedges == 0
+
+
+@pytest.mark.asyncio
+async def test_request_skips_hedging_unsafe(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if requests with side effects are never hedged."""
+    handler, requests = _hedged([USUAL * 2, 0])
+
+    client = await _open(
+        monkeypatch, handler, http={"hedging": {"enabled": True, "minimum": 10}}
+    )
+    _hedging(client)
+
+    try:
+        await client.request(HTTPMethod.POST, "/events")
+    finally:
+        await client.close()
+
+    assert len(requests) == 1
+    assert client.hedges == 0
+
+
+@pytest.mark.asyncio
+async def test_request_hedging_spends_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if no second request is sent without a token in the retry budget."""
+    handler, requests = _hedged([USUAL * 2, 0])
+
+    client = await _open(
+        monkeypatch,
+        handler,
+        http={
+            "hedging": {"enabled": True, "minimum": 10},
+            "retries": {"budget": 0, "reserve": 0},
+        },
+    )
+    _hedging(client)
+
+    try:
+        await client.request(HTTPMethod.GET, "/events/a")
+    finally:
+        await client.close()
+
+    assert len(requests) == 1
+    assert client.hedges == 0
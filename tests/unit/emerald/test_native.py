@@ -0,0 +1,427 @@
+import asyncio
+from collections.abc import AsyncGenerator, Callable, Coroutine
+from typing import Any
+
+import pytest
+from httpx import MockTransport, Request, Response
+
+from gecko.config.models import EmeraldS3Config
+from gecko.services.data.emerald import errors as e
+from gecko.services.data.emerald import models as m
+from gecko.services.data.emerald.engines.native.engine import NativeEngine
+from gecko.utils.ranges import ContentRange
+from gecko.utils.time import httpparse
+
+type Handler = Callable[[Request], Coroutine[None, None, Response]]
+
+MODIFIED = "Sat, 01 Jan 2000 00:00:00 GMT"
+
+NAMESPACE = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+SIZE = 10
+
+DATA = bytes(range(256)) * 40
+
+CONCURRENCY = 4
+
+
+def _error(status: int, code: str) -> Response:
+    content = f"<Error><Code>{code}</Code><Message>Error.</Message></Error>"
+    return Response(status, content=content.encode())
+
+
+def _listing(keys: list[str], token: str | None = None) -> Response:
+    contents = "".join(
+        f"<Contents><Key>{key}</Key>"
+        "<LastModified>2000-01-01T00:00:00.000Z</LastModified>"
+        f"<ETag>&quot;{key}-tag&quot;</ETag><Size>{SIZE}</Size>"
+        "<UserMetadata><content-type>audio/ogg</content-type></UserMetadata>"
+        "</Contents>"
+        for key in keys
+    )
+    truncated = (
+        f"<IsTruncated>true</IsTruncated>"
+        f"<NextContinuationToken>{token}</NextContinuationToken>"
+        if token is not None
+        else "<IsTruncated>false</IsTruncated>"
+    )
+    content = f'<ListBucketResult xmlns="{NAMESPACE}">{truncated}{contents}</ListBucketResult>'
+    return Response(200, content=content.encode())
+
+
+async def _open(
+    monkeypatch: pytest.MonkeyPatch, handler: Handler, **config: Any
+) -> NativeEngine:
+    engine = NativeEngine(
+        EmeraldS3Config.model_validate({"retries": {"attempts": 0}, **config})
+    )
+    monkeypatch.setattr(engine, "_build_transport", lambda: MockTransport(handler))
+    await engine.open()
+    return engine
+
+
+async def _collect(data: AsyncGenerator[Any]) -> list[Any]:
+    return [item async for item in data]
+
+
+@pytest.mark.asyncio
+async def test_list_follows_pages(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if listing follows continuation tokens and parses details."""
+    requests: list[Request] = []
+
+    async def handler(request: Request) -> Response:
+        requests.append(request)
+
+        if "continuation-token" not in request.url.params:
+            return _listing(["a/1", "a/2"], token="next")
+
+        return _listing(["a/3", "a/4"])
+
+    engine = await _open(monkeypatch, handler)
+
+    try:
+        response = await engine.list(
+            m.ListRequest(prefix="a/", stop="a/4", details=True)
+        )
+        listings = await _collect(response.objects)
+    finally:
+        await engine.close()
+
+    assert [listing.name for listing in listings] == ["a/1", "a/2", "a/3"]
+    assert requests[0].url.params["prefix"] == "a/"
+    assert requests[0].url.params["metadata"] == "true"
+    assert requests[1].url.params["continuation-token"] == "next"
+
+    details = listings[0].details
+    assert details is not None
+    assert details.type == "audio/ogg"
+    assert details.size == SIZE
+    assert details.tag == '"a/1-tag"'
+    assert details.modified == httpparse(MODIFIED)
+
+
+@pytest.mark.asyncio
+async def test_list_fails_on_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if listing maps error responses."""
+
+    async def handler(request: Request) -> Response:
+        return _error(403, "AccessDenied")
+
+    engine = await _open(monkeypatch, handler)
+
+    try:
+        response = await engine.list(m.ListRequest())
+
+        with pytest.raises(e.RequestFailedError, match="AccessDenied"):
+            await _collect(response.objects)
+    finally:
+        await engine.close()
+
+
+@pytest.mark.asyncio
+async def test_get_normalizes_tag(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if getting an object returns the quoted ETag and modification time."""
+
+    async def handler(request: Request) -> Response:
+        headers = {
+            "Content-Type": "audio/ogg",
+            "Content-Length": "10",
+            "ETag": "tag",
+            "Last-Modified": MODIFIED,
+        }
+        return Response(200, headers=headers)
+
+    engine = await _open(monkeypatch, handler)
+
+    try:
+        response = await engine.get(m.GetRequest(name="a"))
+    finally:
+        await engine.close()
+
+    assert response.object.tag == '"tag"'
+    assert response.object.modified == httpparse(MODIFIED)
+
+
+@pytest.mark.asyncio
+async def test_get_requires_modified(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if getting an object without modification time fails."""
+
+    async def handler(request: Request) -> Response:
+        return Response(200, headers={"ETag": '"tag"'})
+
+    engine = await _open(monkeypatch, handler)
+
+    try:
+        with pytest.raises(e.InvalidResponseError):
+            await engine.get(m.GetRequest(name="a"))
+    finally:
+        await engine.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("response", "error"),
+    [
+        (Response(404), e.NotFoundError),
+        (_error(404, "NoSuchKey"), e.NotFoundError),
+        (_error(416, "InvalidRange"), e.InvalidRangeError),
+        (_error(403, "AccessDenied"), e.RequestFailedError),
+    ],
+)
+async def test_download_maps_errors(
+    monkeypatch: pytest.MonkeyPatch, response: Response, error: type[Exception]
+) -> None:
+    """Test if download errors are mapped from error codes and statuses."""
+
+    async def handler(request: Request) -> Response:
+        return response
+
+    engine = await _open(monkeypatch, handler)
+
+    try:
+        with pytest.raises(error):
+            await engine.download(m.DownloadRequest(name="a", offset=5))
+    finally:
+        await engine.close()
+
+
+@pytest.mark.asyncio
+async def test_copy_fails_on_error_in_body(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if copying fails when an error is returned with a successful status."""
+
+    async def handler(request: Request) -> Response:
+        return _error(200, "InternalError")
+
+    engine = await _open(monkeypatch, handler)
+
+    try:
+        with pytest.raises(e.RequestFailedError, match="InternalError"):
+            await engine.copy(m.CopyRequest(source="a", destination="b"))
+    finally:
+        await engine.close()
+
+
+def _ranged(
+    data: bytes, delays: Callable[[int], float]
+) -> tuple[Handler, list[int], list[str | None]]:
+    active = [0, 0]
+    matches: list[str | None] = []
+
+    async def handler(request: Request) -> Response:
+        value = request.headers["Range"].removeprefix("bytes=")
+        start, end = (int(part) for part in value.split("-"))
+        end = min(end, len(data) - 1)
+
+        matches.append(request.headers.get("If-Match"))
+        active[0] += 1
+        active[1] = max(active)
+
+        try:
+            await asyncio.sleep(delays(start))
+        finally:
+            active[0] -= 1
+
+        headers = {
+            "Content-Type": "audio/ogg",
+            "Content-Range": f"bytes {start}-{end}/{len(data)}",
+            "ETag": '"tag"',
+            "Last-Modified": MODIFIED,
+        }
+        return Response(206, headers=headers, content=data[start : end + 1])
+
+    return handler, active, matches
+
+
+@pytest.mark.asyncio
+async def test_download_parallel_keeps_order(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test if parts downloaded in parallel are streamed in order."""
+    # Later parts finish first, so they have to be reordered
+    handler, active, matches = _ranged(
+        DATA, lambda start: 0.01 - start / len(DATA) / 100
+    )
+
+    engine = await _open(
+        monkeypatch, handler, download={"concurrency": CONCURRENCY, "buffers": 4}
+    )
+
+    try:
+        response = await engine.download(m.DownloadRequest(name="a", chunk=1000))
+        content = b"".join(await _collect(response.content.data))
+    finally:
+        await engine.close()
+
+    assert content == DATA
+    assert response.content.size == len(DATA)
+    assert response.content.range is None
+    assert 1 < active[1] <= CONCURRENCY
+
+    # All parts after the first one must come from the same version of the object
+    assert matches[0] is None
+    assert set(matches[1:]) == {'"tag"'}
+
+
+@pytest.mark.asyncio
+async def test_download_parallel_range(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if a range downloaded in parallel has the right data and bounds."""
+    offset, length = 1500, 5000
+    handler, _, _ = _ranged(DATA, lambda start: 0)
+
+    engine = await _open(
+        monkeypatch, handler, download={"concurrency": CONCURRENCY, "buffers": 2}
+    )
+
+    try:
+        response = await engine.download(
+            m.DownloadRequest(name="a", offset=offset, length=length, chunk=1000)
+        )
+        content = b"".join(await _collect(response.content.data))
+    finally:
+        await engine.close()
+
+    assert content == DATA[offset : offset + length]
+    assert response.content.size == length
+    assert response.content.range == ContentRange(
+        start=offset, end=offset + length - 1, size=len(DATA)
+    )
+
+
+def _multipart(fail: int) -> tuple[Handler, list[Request]]:
+    requests: list[Request] = []
+
+    async def handler(request: Request) -> Response:
+        requests.append(request)
+        params = request.url.params
+
+        if request.method == "POST" and "uploads" in params:
+            content = (
+                "<InitiateMultipartUploadResult><UploadId>upload</UploadId>"
+                "</InitiateMultipartUploadResult>"
+            )
+            return Response(200, content=content.encode())
+
+        if request.method == "PUT" and params.get("partNumber") == str(fail):
+            return _error(403, "AccessDenied")
+
+        if request.method == "PUT":
+            return Response(200, headers={"ETag": f'"{params["partNumber"]}"'})
+
+        if request.method == "POST":
+            content = "<CompleteMultipartUploadResult></CompleteMultipartUploadResult>"
+            return Response(200, content=content.encode())
+
+        return Response(204)
+
+    return handler, requests
+
+
+async def _chunks(count: int, error: Exception | None = None) -> AsyncGenerator[bytes]:
+    for _ in range(count):
+        yield b"12345"
+
+    if error is not None:
+        raise error
+
+
+def _aborted(requests: list[Request]) -> bool:
+    return any(
+        request.method == "DELETE" and request.url.params.get("uploadId") == "upload"
+        for request in requests
+    )
+
+
+def _completed(requests: list[Request]) -> bool:
+    return any(
+        request.method == "POST" and "uploadId" in request.url.params
+        for request in requests
+    )
+
+
+@pytest.mark.asyncio
+async def test_upload_aborts_on_failed_part(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if a multipart upload is aborted when a part fails."""
+    handler, requests = _multipart(fail=2)
+    engine = await _open(monkeypatch, handler)
+
+    try:
+        with pytest.raises(e.RequestFailedError):
+            await engine.upload(
+                m.UploadRequest(
+                    name="a",
+                    content=m.UploadContent(type="audio/ogg", data=_chunks(4)),
+                    chunk=5,
+                )
+            )
+    finally:
+        await engine.close()
+
+    assert _aborted(requests)
+    assert not _completed(requests)
+
+
+@pytest.mark.asyncio
+async def test_upload_aborts_on_failed_data(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if a multipart upload is aborted when reading the data fails."""
+    handler, requests = _multipart(fail=0)
+    engine = await _open(monkeypatch, handler)
+
+    try:
+        with pytest.raises(ConnectionError):
+            await engine.upload(
+                m.UploadRequest(
+                    name="a",
+                    content=m.UploadContent(
+                        type="audio/ogg", data=_chunks(3, ConnectionError())
+                    ),
+                    chunk=5,
+                )
+            )
+    finally:
+        await engine.close()
+
+    assert _aborted(requests)
+    assert not _completed(requests)
+
+
+@pytest.mark.asyncio
+async def test_upload_completes_parts_in_order(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test if a multipart upload is completed with tags of all parts in order."""
+    handler, requests = _multipart(fail=0)
+    engine = await _open(monkeypatch, handler)
+
+    try:
+        await engine.upload(
+            m.UploadRequest(
+                name="a",
+                content=m.UploadContent(type="audio/ogg", data=_chunks(3)),
+                chunk=5,
+            )
+        )
+    finally:
+        await engine.close()
+
+    complete = next(
+        request
+        for request in requests
+        if request.method == "POST" and "uploadId" in request.url.params
+    )
+    content = complete.content.decode()
+    assert content.index('"1"') < content.index('"2"') < content.index('"3"')
+    assert not _aborted(requests)
+
+
+@pytest.mark.asyncio
+async def test_parts_split_and_join_chunks() -> None:
+    """Test if chunks of uploaded data are collected into parts of the exact size."""
+
+    async def data() -> AsyncGenerator[bytes]:
+        for chunk in (b"ab", b"cdefghij", b"", b"k", b"lmn"):
+            yield chunk
+
+    engine = NativeEngine(EmeraldS3Config())
+    parts = await _collect(engine._parts(data(), 4))  # noqa: SLF001
+
+    assert parts == [b"abcd", b"efgh", b"ijkl", b"mn"]
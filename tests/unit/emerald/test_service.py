@@ -0,0 +1,85 @@
+import asyncio
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from gecko.config.models import EmeraldConfig, EmeraldLimiterConfig
+from gecko.services.data.emerald import models as m
+from gecko.services.data.emerald.service import EmeraldService
+
+TIMEOUT = 5
+
+
+class Engine:
+    """Stand-in for an engine with stats that wait until released."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.active = 0
+
+    async def get(self, request: m.GetRequest) -> m.GetResponse:
+        """Return details of any object once released."""
+        self.active += 1
+
+        try:
+            await self.release.wait()
+        finally:
+            self.active -= 1
+
+        return m.GetResponse(
+            object=m.ObjectDetails(
+                name=request.name,
+                type="audio/ogg",
+                size=0,
+                tag='"tag"',
+                modified=datetime.now(UTC),
+            )
+        )
+
+
+def _service(monkeypatch: pytest.MonkeyPatch, engine: Engine) -> EmeraldService:
+    config = EmeraldConfig(
+        limiter=EmeraldLimiterConfig(initial=1, minimum=1, maximum=1)
+    )
+    service = EmeraldService(config)
+    monkeypatch.setattr(service, "_engine", engine)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_get_limits_only_fan_out(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test if only requests made for listings wait for the limiter."""
+    engine = Engine()
+    service = _service(monkeypatch, engine)
+
+    limited = [
+        asyncio.create_task(service.get(m.GetRequest(name=name, limited=True)))
+        for name in ["a", "b"]
+    ]
+    single = asyncio.create_task(service.get(m.GetRequest(name="c")))
+    await asyncio.sleep(0.01)
+
+    # One limited request waits, while the single one runs next to the other
+    assert engine.active == 2  # noqa: PLR2004
+
+    engine.release.set()
+    await asyncio.wait_for(asyncio.gather(*limited, single), TIMEOUT)
+
+
+@pytest.mark.parametrize(
+    "limits",
+    [
+        {"minimum": 5, "initial": 2},
+        {"initial": 200, "maximum": 100},
+        {"minimum": 10, "maximum": 5},
+        {"minimum": 0},
+        {"initial": 0},
+        {"maximum": 0},
+    ],
+)
+def test_limiter_config_rejects_bad_bounds(limits: dict[str, Any]) -> None:
+    """Test if limits that can't be ordered or are not positive are rejected."""
+    with pytest.raises(ValidationError):
+        EmeraldLimiterConfig.model_validate(limits)
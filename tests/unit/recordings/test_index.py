@@ -0,0 +1,335 @@
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator, Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, cast
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+import pytest
+import pytest_asyncio
+
+from gecko.api.lifespans import IndexLifespan
+from gecko.config.models import Config, IndexConfig, RecordingsConfig
+from gecko.services.apis.beaver import models as bm
+from gecko.services.data.emerald import errors as ee
+from gecko.services.data.emerald import models as em
+from gecko.services.data.index import models as im
+from gecko.services.data.index.service import IndexService
+from gecko.services.entities.recordings import models as m
+from gecko.services.entities.recordings.service import RecordingsService
+from gecko.utils.mime import MimeType
+from gecko.utils.time import isostringify
+from tests.utils.waiting.conditions import CallableCondition
+from tests.utils.waiting.strategies import TimeoutStrategy
+from tests.utils.waiting.waiter import Waiter
+
+EVENT = uuid4()
+
+START = datetime(2000, 1, 1)
+
+TIMEOUT = 5
+
+
+class Emerald:
+    """Stand-in for the emerald database that stores objects in memory."""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, em.ObjectDetails] = {}
+        self.streams: list[Callable[[], AsyncGenerator[em.ObjectEvent]]] = []
+        self.listens = 0
+        self.details = True
+        self.failures = 0
+        self.active = 0
+        self.peak = 0
+
+    async def upload(self, request: em.UploadRequest) -> em.UploadResponse:
+        """Store the details of an uploaded object."""
+        size = sum([len(chunk) async for chunk in request.content.data])
+        self.objects[request.name] = em.ObjectDetails(
+            name=request.name,
+            type=request.content.type,
+            size=size,
+            tag='"tag"',
+            modified=datetime.now(UTC),
+        )
+        return em.UploadResponse()
+
+    async def get(self, request: em.GetRequest) -> em.GetResponse:
+        """Return the details of a stored object."""
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+
+        try:
+            await asyncio.sleep(0)
+        finally:
+            self.active -= 1
+
+        if request.name not in self.objects:
+            raise ee.NotFoundError(request.name)
+
+        return em.GetResponse(object=self.objects[request.name])
+
+    async def delete(self, request: em.DeleteRequest) -> em.DeleteResponse:
+        """Remove a stored object."""
+        del self.objects[request.name]
+        return em.DeleteResponse()
+
+    async def list(self, request: em.ListRequest) -> em.ListResponse:
+        """List stored objects, failing as many times as prepared."""
+        if self.failures > 0:
+            self.failures -= 1
+            raise ee.ServiceError
+
+        async def objects() -> AsyncGenerator[em.ObjectListing]:
+            for name, details in sorted(self.objects.items()):
+                yield em.ObjectListing(
+                    name=name, details=details if self.details else None
+                )
+
+        return em.ListResponse(objects=objects())
+
+    async def listen(self, request: em.ListenRequest) -> em.ListenResponse:
+        """Start the next prepared stream of notifications, or one without any."""
+        self.listens += 1
+        stream = self.streams.pop(0) if self.streams else _silent
+        return em.ListenResponse(events=stream())
+
+
+async def _silent() -> AsyncGenerator[em.ObjectEvent]:
+    await asyncio.Event().wait()
+    yield em.ObjectEvent(type=em.ObjectEventType.CREATED, name="")
+
+
+async def _until(check: Callable[[], bool]) -> None:
+    async def _check() -> None:
+        if not check():
+            raise AssertionError
+
+    waiter = Waiter(
+        condition=CallableCondition(_check),
+        strategy=TimeoutStrategy(TIMEOUT, interval=0.01),
+    )
+
+    await waiter.wait()
+
+
+async def _data() -> AsyncIterator[bytes]:
+    yield b"data"
+
+
+def _store(emerald: Emerald, count: int) -> list[datetime]:
+    starts = [START + timedelta(hours=index) for index in range(count)]
+
+    for start in starts:
+        name = f"{EVENT}/{isostringify(start)}"
+        emerald.objects[name] = em.ObjectDetails(
+            name=name,
+            type="audio/ogg",
+            size=4,
+            tag='"tag"',
+            modified=datetime.now(UTC),
+        )
+
+    return starts
+
+
+async def _indexed(index: IndexService) -> list[datetime]:
+    list_response = await index.list(im.ListRequest(event=EVENT))
+    return [entry.start for entry in list_response.entries]
+
+
+def _service(
+    monkeypatch: pytest.MonkeyPatch, emerald: Emerald, index: IndexService
+) -> RecordingsService:
+    service = RecordingsService(
+        config=RecordingsConfig(),
+        beaver=cast("Any", None),
+        emerald=cast("Any", emerald),
+        index=index,
+    )
+
+    async def get_instance(event: object, start: datetime) -> bm.Instance:
+        return bm.Instance(
+            start=start,
+            duration=timedelta(hours=1),
+            event=bm.Event(id=EVENT, type=bm.EventType.live, timezone=ZoneInfo("UTC")),
+        )
+
+    monkeypatch.setattr(service, "_get_instance", get_instance)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_failed_index_update_invalidates_index(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test if uploads and deletes succeed and invalidate the index when updating it fails."""
+    emerald = Emerald()
+
+    # The index is never opened, so every update of it fails
+    index = IndexService(IndexConfig(enabled=True))
+    service = _service(monkeypatch, emerald, index)
+
+    waiter = asyncio.create_task(index.invalidated())
+
+    await service.upload(
+        m.UploadRequest(
+            event=EVENT,
+            start=START,
+            content=m.UploadContent(type=MimeType.parse("audio/ogg"), data=_data()),
+        )
+    )
+
+    assert len(emerald.objects) == 1
+    assert not index.ready
+    await asyncio.wait_for(waiter, TIMEOUT)
+
+    waiter = asyncio.create_task(index.invalidated())
+
+    await service.delete(m.DeleteRequest(event=EVENT, start=START))
+
+    assert not emerald.objects
+    await asyncio.wait_for(waiter, TIMEOUT)
+
+
+@pytest_asyncio.fixture
+async def index(tmp_path: Path) -> AsyncGenerator[IndexService]:
+    """Build an open index with an empty database."""
+    index = IndexService(
+        IndexConfig(enabled=True, path=str(tmp_path / "index.sqlite3"))
+    )
+    await index.open()
+
+    try:
+        yield index
+    finally:
+        await index.close()
+
+
+@pytest.mark.asyncio
+async def test_watch_survives_unexpected_failures(
+    monkeypatch: pytest.MonkeyPatch, index: IndexService
+) -> None:
+    """Test if watching goes on after a failure that is not a service error."""
+    emerald = Emerald()
+
+    async def malformed() -> AsyncGenerator[em.ObjectEvent]:
+        raise ValueError
+        yield
+
+    emerald.streams.append(malformed)
+    service = _service(monkeypatch, emerald, index)
+
+    task = asyncio.create_task(service.watch(0))
+
+    try:
+        await _until(lambda: emerald.listens > 1 and index.ready)
+
+        assert not task.done()
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_watch_invalidates_index_when_stream_drops(
+    monkeypatch: pytest.MonkeyPatch, index: IndexService
+) -> None:
+    """Test if the index is not used while waiting to follow notifications again."""
+    emerald = Emerald()
+    dropped = asyncio.Event()
+
+    async def dropping() -> AsyncGenerator[em.ObjectEvent]:
+        await dropped.wait()
+        raise ee.ServiceError
+        yield
+
+    emerald.streams.append(dropping)
+    service = _service(monkeypatch, emerald, index)
+
+    task = asyncio.create_task(service.watch(TIMEOUT * 10))
+
+    try:
+        await _until(lambda: index.ready)
+
+        dropped.set()
+        await _until(lambda: not index.ready)
+
+        assert emerald.listens == 1
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_reindex_bounds_stats(
+    monkeypatch: pytest.MonkeyPatch, index: IndexService
+) -> None:
+    """Test if a scan without details in the listing stats one page at a time."""
+    emerald = Emerald()
+    emerald.details = False
+    starts = _store(emerald, 10)
+    service = _service(monkeypatch, emerald, index)
+    monkeypatch.setattr(service, "LIST_PAGE_SIZE", 3)
+
+    await service.reindex()
+
+    assert index.ready
+    assert await _indexed(index) == starts
+    assert emerald.peak <= 3  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_reindex_keeps_entries_deleted_during_scan_out(
+    monkeypatch: pytest.MonkeyPatch, index: IndexService
+) -> None:
+    """Test if entries deleted while a scan runs don't come back with it."""
+    emerald = Emerald()
+    starts = _store(emerald, 5)
+    service = _service(monkeypatch, emerald, index)
+    monkeypatch.setattr(index, "BATCH_SIZE", 2)
+
+    listed = emerald.list
+
+    async def list_and_delete(request: em.ListRequest) -> em.ListResponse:
+        list_response = await listed(request)
+
+        async def objects() -> AsyncGenerator[em.ObjectListing]:
+            async for obj in list_response.objects:
+                yield obj
+
+                # The first entry is deleted after its batch was already stored
+                if obj.name.endswith(isostringify(starts[3])):
+                    await index.delete(im.DeleteRequest(event=EVENT, start=starts[0]))
+
+        return em.ListResponse(objects=objects())
+
+    monkeypatch.setattr(emerald, "list", list_and_delete)
+
+    await service.reindex()
+
+    assert await _indexed(index) == starts[1:]
+
+
+@pytest.mark.asyncio
+async def test_startup_scan_is_retried(index: IndexService) -> None:
+    """Test if a failed scan at startup is retried until it succeeds."""
+    emerald = Emerald()
+    emerald.failures = 2
+    starts = _store(emerald, 1)
+
+    state = SimpleNamespace(
+        beaver=None,
+        emerald=emerald,
+        index=index,
+        config=Config(index=IndexConfig(enabled=True, retry=0)),
+    )
+    lifespan = IndexLifespan(cast("Any", SimpleNamespace(state=state)))
+
+    await asyncio.wait_for(lifespan._reindex(), TIMEOUT)  # noqa: SLF001
+
+    assert emerald.failures == 0
+    assert index.ready
+    assert await _indexed(index) == starts
@@ -0,0 +1,449 @@
+import asyncio
+from array import array
+from collections.abc import AsyncGenerator
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any, cast
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+import pytest
+import pytest_asyncio
+
+from gecko.config.models import IndexConfig, RecordingsConfig
+from gecko.services.apis.beaver import models as bm
+from gecko.services.data.emerald import errors as ee
+from gecko.services.data.emerald import models as em
+from gecko.services.data.index.service import IndexService
+from gecko.services.entities.recordings import models as m
+from gecko.services.entities.recordings.service import RecordingsService
+from gecko.utils.time import isostringify, microparse, microstamp
+
+EVENT = uuid4()
+
+START = datetime(2000, 1, 1)
+
+COUNT = 10
+
+# Recordings without an instance or with an unsupported content type are skipped
+ORPHAN = 3
+
+UNSUPPORTED = 5
+
+VALID = [index for index in range(COUNT) if index not in (ORPHAN, UNSUPPORTED)]
+
+LIMIT = 3
+
+
+def _start(index: int) -> datetime:
+    return START + timedelta(hours=index)
+
+
+def _key(start: datetime) -> str:
+    return f"{EVENT}/{isostringify(start)}"
+
+
+class Emerald:
+    """Stand-in for the emerald database that stores objects in memory."""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, em.ObjectDetails] = {}
+        self.lists: list[em.ListRequest] = []
+        self.gets: list[em.GetRequest] = []
+        self.listed = 0
+        self.details = True
+
+    def store(self, start: datetime, content_type: str = "audio/ogg") -> None:
+        """Store a recording object."""
+        name = _key(start)
+        self.objects[name] = em.ObjectDetails(
+            name=name,
+            type=content_type,
+            size=4,
+            tag='"tag"',
+            modified=datetime.now(UTC),
+        )
+
+    async def get(self, request: em.GetRequest) -> em.GetResponse:
+        """Return the details of a stored object."""
+        self.gets.append(request)
+
+        if request.name not in self.objects:
+            raise ee.NotFoundError(request.name)
+
+        return em.GetResponse(object=self.objects[request.name])
+
+    async def list(self, request: em.ListRequest) -> em.ListResponse:
+        """List stored objects in the order of their keys."""
+        self.lists.append(request)
+
+        async def objects() -> AsyncGenerator[em.ObjectListing]:
+            for name, details in sorted(self.objects.items()):
+                if request.prefix is not None and not name.startswith(request.prefix):
+                    continue
+
+                if request.start_after is not None and name <= request.start_after:
+                    continue
+
+                if request.stop is not None and name >= request.stop:
+                    return
+
+                self.listed += 1
+                yield em.ObjectListing(
+                    name=name, details=details if self.details else None
+                )
+
+        return em.ListResponse(objects=objects())
+
+
+class Events:
+    """Stand-in for the events of the beaver service."""
+
+    async def get(self, request: bm.EventsGetRequest) -> bm.EventsGetResponse:
+        """Return a live event."""
+        return bm.EventsGetResponse(
+            event=bm.Event(
+                id=request.id, type=bm.EventType.live, timezone=ZoneInfo("UTC")
+            )
+        )
+
+
+class Instances:
+    """Stand-in for the instances of the beaver service."""
+
+    def __init__(self) -> None:
+        self.existing: list[datetime] = []
+        self.windows: list[tuple[datetime, datetime]] = []
+        self.active = 0
+        self.peak = 0
+
+    async def starts(
+        self, request: bm.InstancesStartsRequest
+    ) -> bm.InstancesStartsResponse:
+        """Return the starts of instances in the requested period."""
+        self.windows.append((request.start, request.end))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+
+        try:
+            await asyncio.sleep(0)
+        finally:
+            self.active -= 1
+
+        return bm.InstancesStartsResponse(
+            starts=[
+                start
+                for start in self.existing
+                if request.start <= start.replace(tzinfo=UTC) < request.end
+            ]
+        )
+
+
+class Beaver:
+    """Stand-in for the beaver service."""
+
+    def __init__(self) -> None:
+        self.events = Events()
+        self.instances = Instances()
+
+
+@pytest.fixture
+def emerald() -> Emerald:
+    """Build emerald database with recordings of an event."""
+    emerald = Emerald()
+
+    for index in range(COUNT):
+        content_type = "text/plain" if index == UNSUPPORTED else "audio/ogg"
+        emerald.store(_start(index), content_type)
+
+    return emerald
+
+
+@pytest.fixture
+def beaver() -> Beaver:
+    """Build beaver service with instances for all but one recording."""
+    beaver = Beaver()
+    beaver.instances.existing = [
+        _start(index) for index in range(COUNT) if index != ORPHAN
+    ]
+    return beaver
+
+
+def _service(
+    emerald: Emerald,
+    beaver: Beaver,
+    index: IndexService | None = None,
+    config: RecordingsConfig | None = None,
+) -> RecordingsService:
+    return RecordingsService(
+        config=config or RecordingsConfig(),
+        beaver=cast("Any", beaver),
+        emerald=cast("Any", emerald),
+        index=index or IndexService(IndexConfig()),
+    )
+
+
+@pytest_asyncio.fixture(params=["emerald", "index"])
+async def service(
+    request: pytest.FixtureRequest, tmp_path: Path, emerald: Emerald, beaver: Beaver
+) -> AsyncGenerator[RecordingsService]:
+    """Build recordings service listing from emerald or from the local index."""
+    indexed = request.param == "index"
+    index = IndexService(
+        IndexConfig(enabled=indexed, path=str(tmp_path / "index.sqlite3"))
+    )
+    service = _service(emerald, beaver, index)
+
+    if not indexed:
+        yield service
+        return
+
+    await index.open()
+
+    try:
+        await service.reindex()
+        emerald.lists.clear()
+        emerald.gets.clear()
+        yield service
+    finally:
+        await index.close()
+
+
+def _request(**fields: Any) -> m.ListRequest:
+    return m.ListRequest(
+        **{
+            "event": EVENT,
+            "after": None,
+            "before": None,
+            "limit": None,
+            "offset": None,
+            "order": None,
+            "count": m.ListCount.EXACT,
+            "cursor": None,
+            **fields,
+        }
+    )
+
+
+def _indices(response: m.ListResponse) -> list[int]:
+    return [
+        (recording.start - START) // timedelta(hours=1)
+        for recording in response.recordings
+    ]
+
+
+async def _pages(
+    service: RecordingsService, request: m.ListRequest
+) -> list[m.ListResponse]:
+    pages = [await service.list(request)]
+
+    while (cursor := pages[-1].next) is not None:
+        pages.append(await service.list(replace(request, cursor=cursor)))
+
+    return pages
+
+
+# Pages of three valid recordings with the count and whether a next page is linked
+PAGES = {
+    (m.ListCount.EXACT, m.ListOrder.ASCENDING): [
+        ([0, 1, 2], 8, True),
+        ([4, 6, 7], 5, True),
+        ([8, 9], 2, False),
+    ],
+    # Estimates include recordings that are only rejected by their instances
+    (m.ListCount.ESTIMATED, m.ListOrder.ASCENDING): [
+        ([0, 1, 2], 9, True),
+        ([4, 6, 7], 6, True),
+        ([8, 9], 2, False),
+    ],
+    (m.ListCount.NONE, m.ListOrder.ASCENDING): [
+        ([0, 1, 2], None, True),
+        ([4, 6, 7], None, True),
+        ([8, 9], None, False),
+    ],
+    (m.ListCount.EXACT, m.ListOrder.DESCENDING): [
+        ([9, 8, 7], 8, True),
+        ([6, 4, 2], 5, True),
+        ([1, 0], 2, False),
+    ],
+    (m.ListCount.ESTIMATED, m.ListOrder.DESCENDING): [
+        ([9, 8, 7], 9, True),
+        ([6, 4, 2], 6, True),
+        ([1, 0], 2, False),
+    ],
+    (m.ListCount.NONE, m.ListOrder.DESCENDING): [
+        ([9, 8, 7], None, True),
+        ([6, 4, 2], None, True),
+        ([1, 0], None, False),
+    ],
+}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("count", "order"), list(PAGES))
+async def test_list_pages(
+    service: RecordingsService, count: m.ListCount, order: m.ListOrder
+) -> None:
+    """Test if pages resumed from cursors cover all valid recordings once."""
+    pages = await _pages(service, _request(limit=LIMIT, count=count, order=order))
+
+    assert [
+        (_indices(page), page.count, page.next is not None) for page in pages
+    ] == PAGES[count, order]
+
+    for page in pages[:-1]:
+        assert page.next is not None
+        assert page.next.start == page.recordings[-1].start
+        assert page.next.order == order
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("count", "pages"),
+    [
+        (m.ListCount.EXACT, [[0, 1, 2, 4], [6, 7, 8, 9]]),
+        # Without an exact count, a full page can't tell if more recordings follow
+        (m.ListCount.NONE, [[0, 1, 2, 4], [6, 7, 8, 9], []]),
+    ],
+)
+async def test_list_full_last_page(
+    service: RecordingsService, count: m.ListCount, pages: list[list[int]]
+) -> None:
+    """Test if a full last page links to a next page only when it is not counted."""
+    listed = await _pages(service, _request(limit=len(VALID) // 2, count=count))
+
+    assert [_indices(page) for page in listed] == pages
+
+
+@pytest.mark.asyncio
+async def test_list_bounds(service: RecordingsService) -> None:
+    """Test if recordings from after up to before are listed."""
+    response = await service.list(_request(after=_start(2), before=_start(8)))
+
+    assert _indices(response) == [2, 4, 6, 7]
+    assert response.count == 4  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_list_offset(service: RecordingsService) -> None:
+    """Test if the offset skips recordings in the requested order."""
+    response = await service.list(
+        _request(limit=2, offset=1, order=m.ListOrder.DESCENDING)
+    )
+
+    assert _indices(response) == [8, 7]
+    assert response.count == len(VALID)
+    assert response.next is not None
+    assert response.next.start == _start(7)
+
+
+@pytest.mark.asyncio
+async def test_list_scans_key_range(emerald: Emerald, beaver: Beaver) -> None:
+    """Test if only the keys between the bounds or after the cursor are scanned."""
+    service = _service(emerald, beaver)
+
+    await service.list(_request(after=_start(2), before=_start(8)))
+
+    # The key of after is a proper prefix away, so that recording is kept
+    request = emerald.lists[-1]
+    assert request.prefix == f"{EVENT}/"
+    assert request.start_after == _key(_start(2))[:-1]
+    assert request.stop == _key(_start(8))
+
+    cursor = m.ListCursor(
+        event=EVENT,
+        start=_start(4),
+        after=_start(2),
+        before=_start(8),
+        order=m.ListOrder.ASCENDING,
+    )
+    response = await service.list(_request(cursor=cursor))
+
+    # The last recording of the previous page is skipped
+    request = emerald.lists[-1]
+    assert request.start_after == _key(_start(4))
+    assert request.stop == _key(_start(8))
+    assert _indices(response) == [6, 7]
+
+
+@pytest.mark.asyncio
+async def test_list_without_count_stops_early(
+    monkeypatch: pytest.MonkeyPatch, emerald: Emerald, beaver: Beaver
+) -> None:
+    """Test if listing without a count stops scanning once the page is confirmed."""
+    service = _service(emerald, beaver)
+    monkeypatch.setattr(service, "LIST_BATCH_SIZE", 1)
+
+    response = await service.list(_request(limit=LIMIT, count=m.ListCount.NONE))
+
+    assert _indices(response) == [0, 1, 2]
+    assert emerald.listed == LIMIT
+
+    emerald.listed = 0
+    await service.list(_request(limit=LIMIT, count=m.ListCount.EXACT))
+
+    assert emerald.listed == COUNT
+
+
+@pytest.mark.asyncio
+async def test_list_checks_content_types_without_details(
+    emerald: Emerald, beaver: Beaver
+) -> None:
+    """Test if content types missing from the listing are checked with stats."""
+    emerald.details = False
+    service = _service(emerald, beaver)
+
+    response = await service.list(_request(before=_start(6)))
+
+    assert _indices(response) == [0, 1, 2, 4]
+    assert sorted(request.name for request in emerald.gets) == [
+        _key(_start(index)) for index in range(6)
+    ]
+    assert all(request.limited for request in emerald.gets)
+
+
+@pytest.mark.asyncio
+async def test_list_fetches_aligned_windows(emerald: Emerald, beaver: Beaver) -> None:
+    """Test if instances are fetched only for aligned windows with recordings."""
+    days = 28
+    emerald.objects.clear()
+    starts = [START, START + timedelta(days=1), START + timedelta(days=90)]
+
+    for start in starts:
+        emerald.store(start)
+
+    beaver.instances.existing = starts
+    config = RecordingsConfig.model_validate(
+        {"windows": {"days": days, "concurrency": 1}}
+    )
+    service = _service(emerald, beaver, config=config)
+
+    response = await service.list(_request())
+
+    assert [recording.start for recording in response.recordings] == starts
+
+    size = timedelta(days=days)
+    epoch = datetime(1970, 1, 1, tzinfo=UTC)
+    windows = sorted(beaver.instances.windows)
+
+    # The first two recordings share a window, the last one needs another
+    assert len(windows) == 2  # noqa: PLR2004
+    assert beaver.instances.peak == 1
+
+    # Each window is checked against the last recording it should contain
+    for (after, before), start in zip(windows, starts[1:], strict=True):
+        assert (after - epoch) % size == timedelta(0)
+        assert before - after == size
+        assert after <= start.replace(tzinfo=UTC) < before
+
+
+def test_list_picks_views_of_packed_starts(emerald: Emerald, beaver: Beaver) -> None:
+    """Test if the page is a view of the packed starts instead of a copy."""
+    service = _service(emerald, beaver)
+    starts = array("q", (microstamp(_start(index)) for index in range(COUNT)))
+
+    view = service._list_pick_starts(starts, LIMIT, 2)  # noqa: SLF001
+
+    assert view.obj is starts
+    assert [microparse(start) for start in view] == [_start(2), _start(3), _start(4)]
@@ -0,0 +1,207 @@
+import asyncio
+import gc
+import threading
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from gecko.utils.asyncify import BatchingGenerator, PrefetchingGenerator
+
+TIMEOUT = 5
+
+
+class Connection:
+    """Stand-in for a connection that a generator reads from."""
+
+    def __init__(self) -> None:
+        self.released = threading.Event()
+
+    def read(self, count: int) -> Generator[int]:
+        """Read items and release the connection when done."""
+        try:
+            yield from range(count)
+        finally:
+            self.released.set()
+
+
+async def _released(connection: Connection) -> bool:
+    return await asyncio.to_thread(connection.released.wait, TIMEOUT)
+
+
+async def _free(executor: ThreadPoolExecutor) -> bool:
+    loop = asyncio.get_running_loop()
+
+    try:
+        await asyncio.wait_for(loop.run_in_executor(executor, lambda: None), TIMEOUT)
+    except TimeoutError:
+        return False
+
+    return True
+
+
+@pytest.mark.asyncio
+async def test_prefetching_yields_all_items() -> None:
+    """Test if all items are yielded in order and the generator is closed."""
+    connection = Connection()
+    generator = PrefetchingGenerator(connection.read(100), readahead=4)
+
+    items = [item async for item in generator]
+
+    assert items == list(range(100))
+    assert await _released(connection)
+
+
+@pytest.mark.asyncio
+async def test_prefetching_raises_failures() -> None:
+    """Test if a failure of the synchronous generator is raised to the consumer."""
+
+    def fail() -> Generator[int]:
+        yield 1
+        raise ValueError
+
+    generator = PrefetchingGenerator(fail())
+
+    assert await anext(generator) == 1
+
+    with pytest.raises(ValueError):  # noqa: PT011
+        await anext(generator)
+
+
+@pytest.mark.asyncio
+async def test_prefetching_closed_midstream() -> None:
+    """Test if closing the generator mid-stream releases the thread and connection."""
+    connection = Connection()
+    executor = ThreadPoolExecutor(1)
+
+    try:
+        generator = PrefetchingGenerator(
+            connection.read(100), readahead=2, executor=executor
+        )
+
+        assert await anext(generator) == 0
+
+        await generator.aclose()
+
+        assert await _released(connection)
+        assert await _free(executor)
+    finally:
+        executor.shutdown(wait=False)
+
+
+@pytest.mark.asyncio
+async def test_prefetching_dropped_midstream() -> None:
+    """Test if dropping the generator mid-stream releases the thread and connection."""
+    connections = [Connection(), Connection()]
+    executor = ThreadPoolExecutor(2)
+
+    try:
+        for connection in connections:
+            generator = PrefetchingGenerator(
+                connection.read(100), readahead=2, executor=executor
+            )
+
+            # The consumer is cancelled while waiting, like on a client disconnect
+            assert await anext(generator) == 0
+            task = asyncio.create_task(anext(generator))
+            await asyncio.sleep(0)
+            task.cancel()
+
+            del generator, task
+
+        gc.collect()
+
+        for connection in connections:
+            assert await _released(connection)
+
+        assert await _free(executor)
+    finally:
+        executor.shutdown(wait=False)
+
+
+@pytest.mark.asyncio
+async def test_prefetching_dropped_before_start() -> None:
+    """Test if dropping a generator that was never read releases the connection."""
+    connection = Connection()
+    generator = PrefetchingGenerator(connection.read(100))
+
+    # The generator has to be started to run the code before the first yield
+    next(generator.generator)
+
+    del generator
+    gc.collect()
+
+    assert await _released(connection)
+
+
+class Listing:
+    """Stand-in for a listing that blocks while an item is being taken."""
+
+    def __init__(self) -> None:
+        self.taking = threading.Event()
+        self.resume = threading.Event()
+        self.released = threading.Event()
+
+    def read(self, count: int) -> Generator[int]:
+        """Read items, blocking before the last one until resumed."""
+        try:
+            yield from range(count - 1)
+            self.taking.set()
+            self.resume.wait(TIMEOUT)
+            yield count - 1
+        finally:
+            self.released.set()
+
+
+@pytest.mark.asyncio
+async def test_batching_yields_all_items() -> None:
+    """Test if all items are yielded in order across batches."""
+    connection = Connection()
+    generator = BatchingGenerator(connection.read(10), size=3)
+
+    items = [item async for item in generator]
+
+    assert items == list(range(10))
+
+
+@pytest.mark.asyncio
+async def test_batching_raises_failures_after_items() -> None:
+    """Test if items taken before a failure are delivered before it is raised."""
+
+    def fail() -> Generator[int]:
+        yield 1
+        yield 2
+        raise ValueError
+
+    generator = BatchingGenerator(fail(), size=10)
+
+    assert await anext(generator) == 1
+    assert await anext(generator) == 2  # noqa: PLR2004
+
+    with pytest.raises(ValueError):  # noqa: PT011
+        await anext(generator)
+
+
+@pytest.mark.asyncio
+async def test_batching_closes_after_cancelled_batch() -> None:
+    """Test if closing waits for a batch whose consumer was cancelled."""
+    listing = Listing()
+    generator = BatchingGenerator(listing.read(10), size=100)
+
+    # The consumer is cancelled while the worker thread is taking the batch
+    task = asyncio.create_task(anext(generator))
+    assert await asyncio.to_thread(listing.taking.wait, TIMEOUT)
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    closing = asyncio.create_task(generator.aclose())
+    await asyncio.sleep(0.01)
+
+    assert not closing.done()
+
+    listing.resume.set()
+    await asyncio.wait_for(closing, TIMEOUT)
+
+    assert listing.released.is_set()
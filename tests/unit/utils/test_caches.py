@@ -0,0 +1,89 @@
+import pytest
+
+from gecko.utils import caches
+from gecko.utils.caches import TTLCache
+from tests.utils.clock import FakeClock
+
+TTL = 10.0
+
+ENTRIES = 2
+
+SIZE = 10
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Replace the clock of the cache."""
+    clock = FakeClock()
+    monkeypatch.setattr(caches, "time", clock)
+    return clock
+
+
+def test_cache_expires(clock: FakeClock) -> None:
+    """Test if values are returned until they expire."""
+    cache = TTLCache[str, str](ENTRIES, SIZE)
+    cache.put("a", "value", TTL, 1)
+
+    clock.advance(TTL - 1)
+    assert cache.get("a") == "value"
+
+    clock.advance(1)
+    assert cache.get("a") is None
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_cache_keeps_expired_for_revalidation(clock: FakeClock) -> None:
+    """Test if expired values can still be peeked at until evicted."""
+    cache = TTLCache[str, str](ENTRIES, SIZE)
+    cache.put("a", "value", TTL, 1)
+
+    clock.advance(TTL * 2)
+
+    assert cache.get("a") is None
+    assert cache.peek("a") == "value"
+    assert len(cache) == 1
+
+
+def test_cache_skips_values_without_ttl(clock: FakeClock) -> None:
+    """Test if values that should not be cached leave the previous value in place."""
+    cache = TTLCache[str, str](ENTRIES, SIZE)
+    cache.put("a", "old", TTL, 1)
+
+    clock.advance(TTL)
+    cache.put("a", "new", 0, 1)
+    cache.put("a", "large", TTL, SIZE + 1)
+
+    assert cache.peek("a") == "old"
+    assert cache.size == 1
+
+
+def test_cache_evicts_least_recently_used(clock: FakeClock) -> None:
+    """Test if the least recently used value is evicted over the entry limit."""
+    cache = TTLCache[str, str](ENTRIES, SIZE)
+    cache.put("a", "a", TTL, 1)
+    cache.put("b", "b", TTL, 1)
+
+    assert cache.get("a") == "a"
+
+    cache.put("c", "c", TTL, 1)
+
+    assert cache.peek("b") is None
+    assert cache.peek("a") == "a"
+    assert cache.peek("c") == "c"
+    assert cache.evictions == 1
+
+
+def test_cache_evicts_over_size(clock: FakeClock) -> None:
+    """Test if values are evicted over the size limit and too large ones skipped."""
+    cache = TTLCache[str, str](ENTRIES, SIZE)
+    cache.put("a", "a", TTL, SIZE // 2)
+    cache.put("b", "b", TTL, SIZE // 2 + 1)
+
+    assert cache.peek("a") is None
+    assert cache.size == SIZE // 2 + 1
+
+    cache.put("c", "c", TTL, SIZE + 1)
+
+    assert cache.peek("c") is None
+    assert cache.peek("b") == "b"
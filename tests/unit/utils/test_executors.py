@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from gecko.utils import executors
+from gecko.utils.executors import InstrumentedExecutor
+from tests.utils.clock import FakeClock
+
+TIMEOUT = 5
+
+WAIT = 3.0
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Replace the clock of the executors."""
+    clock = FakeClock()
+    monkeypatch.setattr(executors, "time", clock)
+    return clock
+
+
+def test_executor_counts_tasks(clock: FakeClock) -> None:
+    """Test if running and queued tasks, started tasks and waiting are counted."""
+    executor = InstrumentedExecutor(1, "test")
+    running = threading.Event()
+    release = threading.Event()
+
+    def block() -> None:
+        running.set()
+        release.wait(TIMEOUT)
+
+    try:
+        first = executor.submit(block)
+        assert running.wait(TIMEOUT)
+
+        # The second task waits for the only worker thread
+        second = executor.submit(lambda: None)
+
+        assert executor.active == 1
+        assert executor.queued == 1
+        assert executor.tasks == 1
+
+        clock.advance(WAIT)
+        release.set()
+        first.result(TIMEOUT)
+        second.result(TIMEOUT)
+
+        assert executor.active == 0
+        assert executor.queued == 0
+        assert executor.tasks == 2  # noqa: PLR2004
+        assert executor.wait == WAIT
+    finally:
+        executor.shutdown(wait=False)
+
+
+@pytest.mark.usefixtures("clock")
+def test_executor_counts_failed_tasks() -> None:
+    """Test if a failing task is no longer counted as running."""
+    executor = InstrumentedExecutor(1, "test")
+
+    def fail() -> None:
+        raise ValueError
+
+    try:
+        future = executor.submit(fail)
+
+        with pytest.raises(ValueError):  # noqa: PT011
+            future.result(TIMEOUT)
+
+        assert executor.active == 0
+        assert executor.queued == 0
+        assert executor.tasks == 1
+    finally:
+        executor.shutdown(wait=False)
+
+
+def test_executor_uncounts_rejected_tasks() -> None:
+    """Test if a task rejected by a shut down executor is not counted as queued."""
+    executor = InstrumentedExecutor(1, "test")
+    executor.shutdown()
+
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: None)
+
+    assert executor.queued == 0
+    assert executor.tasks == 0
@@ -0,0 +1,155 @@
+import asyncio
+
+import pytest
+
+from gecko.utils import limiters
+from gecko.utils.limiters import AdaptiveLimiter
+from tests.utils.clock import FakeClock
+
+LATENCY = 1.0
+
+BACKOFF = 0.5
+
+INITIAL = 4
+
+MINIMUM = 1
+
+MAXIMUM = 8
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Replace the clock of the limiter."""
+    clock = FakeClock()
+    monkeypatch.setattr(limiters, "time", clock)
+    return clock
+
+
+def _limiter(
+    initial: int = INITIAL, ignored: tuple[type[BaseException], ...] = ()
+) -> AdaptiveLimiter:
+    return AdaptiveLimiter(
+        initial=initial,
+        minimum=MINIMUM,
+        maximum=MAXIMUM,
+        latency=LATENCY,
+        backoff=BACKOFF,
+        ignored=ignored,
+    )
+
+
+@pytest.mark.asyncio
+async def test_limiter_increases_additively(clock: FakeClock) -> None:
+    """Test if the limit grows by about one after limit calls that are fast."""
+    limiter = _limiter()
+
+    for _ in range(INITIAL):
+        async with limiter.acquire():
+            clock.advance(LATENCY / 2)
+
+    assert INITIAL + 0.75 < limiter.limit < INITIAL + 1
+    assert limiter.decreases == 0
+    assert limiter.tasks == INITIAL
+
+
+@pytest.mark.asyncio
+async def test_limiter_increase_stops_at_maximum(clock: FakeClock) -> None:
+    """Test if the limit never grows over the maximum."""
+    limiter = _limiter(initial=MAXIMUM)
+
+    async with limiter.acquire():
+        pass
+
+    assert limiter.limit == MAXIMUM
+
+
+@pytest.mark.asyncio
+async def test_limiter_decreases_on_slow_call(clock: FakeClock) -> None:
+    """Test if the limit shrinks by the backoff factor when a call is slow."""
+    limiter = _limiter()
+
+    async with limiter.acquire():
+        clock.advance(LATENCY * 2)
+
+    assert limiter.limit == INITIAL * BACKOFF
+    assert limiter.decreases == 1
+
+
+@pytest.mark.asyncio
+async def test_limiter_decreases_on_failure(clock: FakeClock) -> None:
+    """Test if the limit shrinks when a call fails, even if it was fast."""
+    limiter = _limiter()
+
+    with pytest.raises(ConnectionError):
+        async with limiter.acquire():
+            raise ConnectionError
+
+    assert limiter.limit == INITIAL * BACKOFF
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_observes_ignored_failures(clock: FakeClock) -> None:
+    """Test if ignored failures only count by their latency."""
+    limiter = _limiter(ignored=(LookupError,))
+
+    with pytest.raises(KeyError):
+        async with limiter.acquire():
+            raise KeyError
+
+    assert limiter.limit > INITIAL
+    assert limiter.decreases == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_decreases_once_per_window(clock: FakeClock) -> None:
+    """Test if calls that started before a decrease don't decrease again."""
+    limiter = _limiter()
+
+    async with limiter.acquire(), limiter.acquire():
+        clock.advance(LATENCY * 2)
+
+    assert limiter.limit == INITIAL * BACKOFF
+    assert limiter.decreases == 1
+
+    async with limiter.acquire():
+        clock.advance(LATENCY * 2)
+
+    assert limiter.limit == MINIMUM
+    assert limiter.decreases == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_limiter_decrease_stops_at_minimum(clock: FakeClock) -> None:
+    """Test if the limit never shrinks under the minimum."""
+    limiter = _limiter(initial=MINIMUM)
+
+    with pytest.raises(ConnectionError):
+        async with limiter.acquire():
+            raise ConnectionError
+
+    assert limiter.limit == MINIMUM
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_over_limit(clock: FakeClock) -> None:
+    """Test if calls over the limit wait until a slot is free."""
+    limiter = _limiter(initial=MINIMUM)
+    entered = asyncio.Event()
+
+    async def wait() -> None:
+        async with limiter.acquire():
+            entered.set()
+
+    async with limiter.acquire():
+        task = asyncio.create_task(wait())
+        await asyncio.sleep(0)
+
+        assert limiter.queued == 1
+        assert not entered.is_set()
+
+    await task
+
+    assert entered.is_set()
+    assert limiter.queued == 0
+    assert limiter.active == 0
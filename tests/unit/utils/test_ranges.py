@@ -0,0 +1,86 @@
+import pytest
+
+from gecko.utils.ranges import (
+    ByteRange,
+    ByteRangeValidationError,
+    ContentRange,
+    ContentRangeValidationError,
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("bytes=0-99", ByteRange(start=0, end=99)),
+        ("bytes=100-", ByteRange(start=100, end=None)),
+        ("bytes=-50", ByteRange(start=None, end=50)),
+        (" bytes = 5 - 5 ", ByteRange(start=5, end=5)),
+    ],
+)
+def test_byte_range_parse(value: str, expected: ByteRange) -> None:
+    """Test if valid byte ranges are parsed."""
+    assert ByteRange.parse(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "",
+        "bytes=",
+        "bytes=-",
+        "bytes=10-5",
+        "bytes=a-b",
+        "bytes=0-1,5-6",
+        "items=0-1",
+    ],
+)
+def test_byte_range_parse_invalid(value: str) -> None:
+    """Test if invalid byte ranges are rejected."""
+    with pytest.raises(ByteRangeValidationError):
+        ByteRange.parse(value)
+
+
+@pytest.mark.parametrize(
+    ("byterange", "size", "expected"),
+    [
+        (ByteRange(start=0, end=99), 1000, (0, 100)),
+        (ByteRange(start=100, end=None), 1000, (100, 900)),
+        (ByteRange(start=900, end=2000), 1000, (900, 100)),
+        (ByteRange(start=None, end=50), 1000, (950, 50)),
+        (ByteRange(start=None, end=2000), 1000, (0, 1000)),
+        (ByteRange(start=1000, end=None), 1000, None),
+        (ByteRange(start=None, end=0), 1000, None),
+        (ByteRange(start=None, end=50), 0, None),
+        (ByteRange(start=0, end=None), 0, None),
+    ],
+)
+def test_byte_range_resolve(
+    byterange: ByteRange, size: int, expected: tuple[int, int] | None
+) -> None:
+    """Test if byte ranges are resolved to offsets and lengths within the content."""
+    assert byterange.resolve(size) == expected
+
+
+def test_content_range_round_trip() -> None:
+    """Test if content ranges are serialized and parsed back."""
+    value = ContentRange(start=10, end=19, size=100)
+
+    assert str(value) == "bytes 10-19/100"
+    assert ContentRange.parse(str(value)) == value
+    assert value.length == value.end - value.start + 1
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "bytes 10-19",
+        "bytes */100",
+        "bytes 20-10/100",
+        "bytes 0-100/100",
+        "items 0-1/2",
+    ],
+)
+def test_content_range_parse_invalid(value: str) -> None:
+    """Test if invalid content ranges are rejected."""
+    with pytest.raises(ContentRangeValidationError):
+        ContentRange.parse(value)
@@ -0,0 +1,54 @@
+from gecko.utils.read import ReadableIterator
+
+CHUNKS = [b"abc", b"", b"defg", b"hi"]
+
+
+def _reader() -> ReadableIterator:
+    return ReadableIterator(iter(CHUNKS))
+
+
+def test_read_across_chunks() -> None:
+    """Test if reads are split and joined across chunk boundaries."""
+    reader = _reader()
+
+    assert reader.read(2) == b"ab"
+    assert reader.read(4) == b"cdef"
+    assert reader.read(10) == b"ghi"
+
+
+def test_read_whole_chunk_without_copy() -> None:
+    """Test if a read matching a single chunk returns the chunk itself."""
+    reader = _reader()
+
+    assert reader.read(3) is CHUNKS[0]
+    assert reader.read(4) is CHUNKS[2]
+
+
+def test_read_rest() -> None:
+    """Test if reading without a size returns the rest of the iterator."""
+    reader = _reader()
+
+    assert reader.read(1) == b"a"
+    assert reader.read() == b"bcdefghi"
+    assert reader.read(None) == b""
+
+
+def test_readinto_short_buffer() -> None:
+    """Test if reading into a buffer fills only the buffer and keeps the rest."""
+    reader = _reader()
+    buffer = bytearray(5)
+
+    assert reader.readinto(buffer) == 5  # noqa: PLR2004
+    assert buffer == b"abcde"
+    assert reader.read() == b"fghi"
+
+
+def test_read_at_end() -> None:
+    """Test if reads at the end of the iterator return nothing."""
+    reader = _reader()
+    buffer = bytearray(5)
+
+    assert reader.read(100) == b"abcdefghi"
+    assert reader.read(1) == b""
+    assert reader.read() == b""
+    assert reader.readinto(buffer) == 0
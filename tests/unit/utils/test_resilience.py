@@ -0,0 +1,139 @@
+import pytest
+
+from gecko.utils import resilience
+from gecko.utils.resilience import CircuitBreaker, CircuitState, RetryBudget
+from tests.utils.clock import FakeClock
+
+THRESHOLD = 3
+
+COOLDOWN = 10.0
+
+RATIO = 0.25
+
+RESERVE = 2
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Replace the clock of the circuit breaker."""
+    clock = FakeClock()
+    monkeypatch.setattr(resilience, "time", clock)
+    return clock
+
+
+def _open(breaker: CircuitBreaker) -> None:
+    for _ in range(THRESHOLD):
+        assert breaker.allow()
+        breaker.failure()
+
+
+def test_breaker_opens_after_threshold(clock: FakeClock) -> None:
+    """Test if the circuit opens after consecutive failures and fails fast."""
+    breaker = CircuitBreaker(THRESHOLD, COOLDOWN)
+
+    breaker.failure()
+    breaker.success()
+    assert breaker.state == CircuitState.CLOSED
+
+    _open(breaker)
+
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+
+
+def test_breaker_probes_after_cooldown(clock: FakeClock) -> None:
+    """Test if a single probe is let through after the cooldown."""
+    breaker = CircuitBreaker(THRESHOLD, COOLDOWN)
+    _open(breaker)
+
+    clock.advance(COOLDOWN - 1)
+    assert not breaker.allow()
+
+    clock.advance(1)
+    assert breaker.allow()
+    assert breaker.state == CircuitState.HALF_OPEN
+
+    # Other calls fail fast while the probe is running
+    assert not breaker.allow()
+
+
+def test_breaker_closes_on_probe_success(clock: FakeClock) -> None:
+    """Test if the circuit closes when the probe succeeds."""
+    breaker = CircuitBreaker(THRESHOLD, COOLDOWN)
+    _open(breaker)
+
+    clock.advance(COOLDOWN)
+    assert breaker.allow()
+
+    breaker.success()
+
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow()
+    assert breaker.failures == 0
+
+
+def test_breaker_reopens_on_probe_failure(clock: FakeClock) -> None:
+    """Test if the circuit opens again for a full cooldown when the probe fails."""
+    breaker = CircuitBreaker(THRESHOLD, COOLDOWN)
+    _open(breaker)
+
+    clock.advance(COOLDOWN)
+    assert breaker.allow()
+
+    breaker.failure()
+
+    assert breaker.state == CircuitState.OPEN
+
+    clock.advance(COOLDOWN - 1)
+    assert not breaker.allow()
+
+    clock.advance(1)
+    assert breaker.allow()
+
+
+def test_breaker_without_threshold_stays_closed(clock: FakeClock) -> None:
+    """Test if the circuit never opens without a threshold."""
+    breaker = CircuitBreaker(None, COOLDOWN)
+
+    for _ in range(THRESHOLD * 10):
+        breaker.failure()
+
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow()
+
+
+def test_budget_spends_reserve() -> None:
+    """Test if retries are allowed until the reserve is used up."""
+    budget = RetryBudget(RATIO, RESERVE)
+
+    assert all(budget.withdraw() for _ in range(RESERVE))
+    assert not budget.withdraw()
+
+
+def test_budget_refills_by_ratio() -> None:
+    """Test if every call deposits a part of a retry."""
+    budget = RetryBudget(RATIO, RESERVE)
+
+    while budget.withdraw():
+        pass
+
+    for _ in range(int(1 / RATIO) - 1):
+        budget.deposit()
+
+    assert not budget.withdraw()
+
+    budget.deposit()
+
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+
+def test_budget_caps_at_reserve() -> None:
+    """Test if tokens can't be saved up over the reserve."""
+    budget = RetryBudget(RATIO, RESERVE)
+
+    for _ in range(100):
+        budget.deposit()
+
+    assert budget.balance == RESERVE
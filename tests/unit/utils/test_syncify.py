@@ -0,0 +1,110 @@
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+
+from gecko.utils.syncify import BatchingIterator, IteratorClosedError
+from tests.utils.waiting.conditions import CallableCondition
+from tests.utils.waiting.strategies import TimeoutStrategy
+from tests.utils.waiting.waiter import Waiter
+
+TIMEOUT = 5
+
+SIZE = 4
+
+
+class Stream:
+    """Stand-in for a request body that counts the chunks it produced."""
+
+    def __init__(self, chunks: list[bytes], error: Exception | None = None) -> None:
+        self.chunks = chunks
+        self.error = error
+        self.produced = 0
+
+    async def read(self) -> AsyncGenerator[bytes]:
+        """Produce the chunks and fail at the end if an error is given."""
+        for chunk in self.chunks:
+            self.produced += 1
+            yield chunk
+
+        if self.error is not None:
+            raise self.error
+
+
+async def _produced(stream: Stream, count: int) -> None:
+    async def _check() -> None:
+        if stream.produced < count:
+            raise AssertionError
+
+    waiter = Waiter(
+        condition=CallableCondition(_check),
+        strategy=TimeoutStrategy(TIMEOUT, interval=0.01),
+    )
+
+    await waiter.wait()
+
+
+@pytest.mark.asyncio
+async def test_batching_splits_and_joins_chunks() -> None:
+    """Test if chunks are collected into batches of the exact size."""
+    stream = Stream([b"ab", b"cdefghij", b"", b"k", b"lmn"])
+
+    async with BatchingIterator(stream.read(), size=SIZE) as iterator:
+        batches = await asyncio.to_thread(list, iterator)
+
+    assert batches == [b"abcd", b"efgh", b"ijkl", b"mn"]
+
+
+@pytest.mark.asyncio
+async def test_batching_applies_backpressure() -> None:
+    """Test if the stream is not read further while the thread is behind."""
+    stream = Stream([b"x" * SIZE] * 10)
+
+    async with BatchingIterator(stream.read(), size=SIZE, buffers=1) as iterator:
+        # One batch is queued and the next one waits for room
+        await _produced(stream, 2)
+        await asyncio.sleep(0.01)
+
+        assert stream.produced == 2  # noqa: PLR2004
+
+        assert await asyncio.to_thread(next, iterator) == b"x" * SIZE
+        await _produced(stream, 3)
+
+        batches = await asyncio.to_thread(list, iterator)
+
+    assert len(batches) == 9  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_batching_raises_stream_failures_in_thread() -> None:
+    """Test if a failure of the stream is raised after the full batches before it."""
+    stream = Stream([b"abcdef"], error=ValueError())
+
+    async with BatchingIterator(stream.read(), size=SIZE) as iterator:
+        assert await asyncio.to_thread(next, iterator) == b"abcd"
+
+        with pytest.raises(ValueError):  # noqa: PT011
+            await asyncio.to_thread(next, iterator)
+
+
+@pytest.mark.asyncio
+async def test_batching_closed_while_thread_waits() -> None:
+    """Test if closing the iterator makes a waiting thread fail."""
+    blocked = asyncio.Event()
+
+    async def stall() -> AsyncGenerator[bytes]:
+        await blocked.wait()
+        yield b""
+
+    iterator = BatchingIterator(stall(), size=SIZE)
+    iterator.start()
+
+    reading = asyncio.create_task(asyncio.to_thread(next, iterator))
+    await asyncio.sleep(0.01)
+
+    assert not reading.done()
+
+    await iterator.aclose()
+
+    with pytest.raises(IteratorClosedError):
+        await asyncio.wait_for(reading, TIMEOUT)